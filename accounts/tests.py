@@ -1,13 +1,14 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from main.models import Club
+import json
+
+from main.models import Club, Player
 from .models import Profile
 from .views import _is_superuser_check
 # Impor semua form untuk diuji secara langsung
 from .forms import (
     UserUpdateForm,
-    ProfileUpdateForm,
     SuperUserEditForm,
     SuperUserCreateForm,
     PasswordChangeCustomForm,
@@ -216,4 +217,22 @@ class AccountsViewsTests(TestCase):
         self.client.login(username='testuser', password='password123')
         delete_url = reverse('accounts:delete_user', kwargs={'pk': self.other_user.pk})
         response = self.client.post(delete_url)
-        self.assertEqual(response.status_code, 403)
\ No newline at end of file
+        self.assertEqual(response.status_code, 403)
+
+    #  TES API ADMIN (STREAMING) 
+
+    def test_admin_get_players_streaming(self):
+        Player.objects.create(nama_pemain="Pemain Stream", current_club=self.regular_club, position="CM", market_value=10)
+        self.client.login(username='superuser', password='password123')
+        response = self.client.get(reverse('accounts:admin_get_players'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertTrue(data["status"])
+        self.assertEqual(data["data"][0]["nama_pemain"], "Pemain Stream")
+        self.assertEqual(data["data"][0]["club_name"], "Test Club")
+
+    def test_admin_get_players_forbidden_for_fan(self):
+        self.client.login(username='testuser', password='password123')
+        response = self.client.get(reverse('accounts:admin_get_players'))
+        self.assertEqual(response.status_code, 403)
@@ -21,6 +21,8 @@ from .forms import (
 from django.core.exceptions import PermissionDenied
 from django.contrib import messages
 from main.models import Club, Player
+from main.conditional import roster_condition
+from main.streaming import StreamingJsonResponse, iter_values
 from django.shortcuts import get_object_or_404
 from .models import CustomUser, Profile
 from django.db.models import Q
@@ -663,6 +665,7 @@ def admin_delete_user(request, pk):
 
 # --- MANAGE CLUBS (CRUD) ---
 @csrf_exempt
+@roster_condition
 def admin_get_clubs(request):
     clubs = list(
         Club.objects.exclude(name__iexact="admin").values(
@@ -702,21 +705,21 @@ def admin_get_players(request):
     if not _is_superuser_check(request.user):
         return JsonResponse({"status": False, "message": "Forbidden"}, status=403)
 
-    players = []
-    # Ambil semua player, select_related club biar query efisien
-    for p in Player.objects.select_related("current_club").all():
-        players.append(
-            {
-                "id": str(p.id),  # UUID harus di-convert ke string
-                "nama_pemain": p.nama_pemain,
-                "position": p.position,
-                "club_name": p.current_club.name,
-                "thumbnail": p.thumbnail,
-                "market_value": p.market_value,
-            }
-        )
+    # Ambil semua player lewat .values() (join ke club) dan stream per batch
+    players = iter_values(
+        Player.objects.order_by("pk"),
+        ("id", "nama_pemain", "position", "current_club__name", "thumbnail", "market_value"),
+        transform=lambda p: {
+            "id": str(p["id"]),  # UUID harus di-convert ke string
+            "nama_pemain": p["nama_pemain"],
+            "position": p["position"],
+            "club_name": p["current_club__name"],
+            "thumbnail": p["thumbnail"],
+            "market_value": p["market_value"],
+        },
+    )
 
-    return JsonResponse({"status": True, "data": players})
+    return StreamingJsonResponse(players, envelope={"status": True})
 
 
 @csrf_exempt
@@ -0,0 +1,156 @@
+# benchmarks/deployment.py
+"""
+Bandingkan deployment sync (WSGI, N worker sync seperti gunicorn) dan async
+(ASGI, satu event loop seperti uvicorn) ketika sebagian client lambat
+membaca response. Client lambat memegang satu worker sync selama membaca;
+di ASGI hanya memegang satu task.
+
+Keduanya dijalankan in-process: WSGI lewat Client di thread pool berukuran
+`workers`, ASGI lewat AsyncClient di satu event loop dengan
+ThreadSensitiveContext per request seperti ASGIHandler.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from .runner import ENDPOINTS, clients_for, percentile
+
+MODES = ("wsgi", "asgi")
+# Endpoint JSON yang diukur latency-nya (dari daftar benchmark utama)
+FAST_ENDPOINTS = ("get_rumors_json", "list_pemain_dijual_json", "show_replies_json_flutter")
+# Client lambat membaca export streaming ini per chunk
+SLOW_ROUTE = "player_transaction:show_json"
+
+
+def _read_sync(client, url, delay):
+    response = client.get(url)
+    if response.streaming:
+        for _ in response.streaming_content:
+            time.sleep(delay)
+    elif delay:
+        time.sleep(delay)
+    return response.status_code
+
+
+async def _read_async(client, url, delay):
+    async with ThreadSensitiveContext():
+        response = await client.get(url)
+        if response.streaming and response.is_async:
+            async for _ in response.streaming_content:
+                await asyncio.sleep(delay)
+        elif response.streaming:
+            for _ in response.streaming_content:
+                await asyncio.sleep(delay)
+        elif delay:
+            await asyncio.sleep(delay)
+    return response.status_code
+
+
+def _wsgi_caller(cookies, workers):
+    """Setiap thread worker punya Client sendiri (cookie session sama)."""
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wsgi-worker")
+    local = threading.local()
+
+    def handle(role, url, delay):
+        if not hasattr(local, "clients"):
+            local.clients = {}
+            for name, jar in cookies.items():
+                local.clients[name] = Client()
+                local.clients[name].cookies.update(jar)
+        return _read_sync(local.clients[role], url, delay)
+
+    async def call(role, url, delay):
+        return await asyncio.get_running_loop().run_in_executor(pool, handle, role, url, delay)
+
+    return call, pool.shutdown
+
+
+def _asgi_caller(cookies):
+    clients = {}
+    for name, jar in cookies.items():
+        clients[name] = AsyncClient()
+        clients[name].cookies.update(jar)
+
+    async def call(role, url, delay):
+        return await _read_async(clients[role], url, delay)
+
+    return call, lambda: None
+
+
+async def _load(call, fast_urls, slow_url, fast_clients, slow_clients, duration, delay):
+    latencies = []
+    statuses = Counter()
+    slow_done = 0
+    deadline = time.perf_counter() + duration
+
+    async def fast(offset):
+        n = offset
+        while time.perf_counter() < deadline:
+            role, url = fast_urls[n % len(fast_urls)]
+            n += 1
+            start = time.perf_counter()
+            statuses[await call(role, url, 0)] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async def slow():
+        nonlocal slow_done
+        while time.perf_counter() < deadline:
+            await call(None, slow_url, delay)
+            slow_done += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[slow() for _ in range(slow_clients)],
+        *[fast(i) for i in range(fast_clients)],
+    )
+    elapsed = time.perf_counter() - start
+    return latencies, statuses, slow_done, elapsed
+
+
+def run_deployment_load(context, mode, workers=4, fast_clients=16, slow_clients=8,
+                        duration=5.0, delay=0.2):
+    """
+    Jalankan `fast_clients` client yang terus meminta FAST_ENDPOINTS dan
+    `slow_clients` client yang membaca SLOW_ROUTE dengan jeda `delay` detik
+    per chunk, selama `duration` detik. `workers` hanya berlaku untuk wsgi.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode harus salah satu dari {MODES}.")
+
+    cookies = {role: client.cookies for role, client in clients_for(context).items()}
+    fast_urls = [(e.role, e.url(context)) for e in ENDPOINTS if e.name in FAST_ENDPOINTS]
+    slow_url = reverse(SLOW_ROUTE)
+
+    if mode == "wsgi":
+        call, close = _wsgi_caller(cookies, workers)
+    else:
+        call, close = _asgi_caller(cookies)
+    try:
+        latencies, statuses, slow_done, elapsed = asyncio.run(
+            _load(call, fast_urls, slow_url, fast_clients, slow_clients, duration, delay)
+        )
+    finally:
+        close()
+
+    return {
+        "mode": mode,
+        "workers": workers if mode == "wsgi" else None,
+        "fast_clients": fast_clients,
+        "slow_clients": slow_clients,
+        "requests": len(latencies),
+        "status": dict(statuses),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5), 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95), 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99), 3) if latencies else None,
+        "max_ms": round(max(latencies), 3) if latencies else None,
+        "slow_requests": slow_done,
+        "elapsed_s": round(elapsed, 3),
+    }
@@ -0,0 +1,62 @@
+import json
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from benchmarks.deployment import MODES, run_deployment_load
+from benchmarks.seed import SCALES, seed_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Bandingkan deployment WSGI (worker sync) dan ASGI (event loop) dengan client lambat: "
+        "throughput dan p50/p95/p99 endpoint JSON panas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--mode", choices=MODES, nargs="+", default=list(MODES))
+        parser.add_argument("--workers", type=int, default=4, help="Jumlah worker sync (WSGI).")
+        parser.add_argument("--fast-clients", type=int, default=16)
+        parser.add_argument("--slow-clients", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=10, help="Lama tiap mode (detik).")
+        parser.add_argument("--delay", type=float, default=0.2, help="Jeda client lambat per chunk (detik).")
+        parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON.")
+
+    def handle(self, *args, **options):
+        # Database sementara (seperti test runner) agar data asli tidak tersentuh
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            cache.clear()
+            context = seed_data(seed=options["seed"], scale=options["scale"])
+            with override_settings(REQUEST_METRICS_ENABLED=False):
+                results = [
+                    run_deployment_load(
+                        context, mode, workers=options["workers"],
+                        fast_clients=options["fast_clients"], slow_clients=options["slow_clients"],
+                        duration=options["duration"], delay=options["delay"],
+                    )
+                    for mode in options["mode"]
+                ]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'mode':<6} {'request':>8} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'max ms':>9} {'lambat':>7}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<6} {result['requests']:>8} {result['throughput_rps']:>8.1f} "
+                f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                f"{result['max_ms']:>9.2f} {result['slow_requests']:>7}"
+            )
@@ -0,0 +1,123 @@
+import json
+import platform
+import subprocess
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from benchmarks.runner import ENDPOINTS, compare, run
+from benchmarks.seed import SCALES, seed_data
+
+RESULTS_DIR = Path(settings.BASE_DIR) / "benchmarks" / "results"
+SIZE_OPTIONS = list(SCALES["small"])
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark endpoint panas di database sementara yang diisi data buatan: "
+        "latency p50/p95 dan jumlah query per endpoint, disimpan sebagai JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+        parser.add_argument("--seed", type=int, default=42)
+        sizes = parser.add_argument_group("ukuran data (override --scale)")
+        for name in SIZE_OPTIONS:
+            sizes.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int)
+        parser.add_argument("--repeat", type=int, default=30, help="Request terukur per endpoint.")
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--only", nargs="+", choices=[endpoint.name for endpoint in ENDPOINTS], help="Endpoint yang diukur."
+        )
+        parser.add_argument("--output", help="File hasil JSON (default benchmarks/results/<waktu>-<commit>.json).")
+        parser.add_argument("--compare", help="File hasil sebelumnya untuk dibandingkan.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"], encoding="utf-8") as f:
+                    baseline = json.load(f)["endpoints"]
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Tidak bisa membaca {options['compare']}: {e}")
+
+        endpoints = [e for e in ENDPOINTS if not options["only"] or e.name in options["only"]]
+        overrides = {name: options[name] for name in SIZE_OPTIONS}
+
+        # Database sementara (seperti test runner) agar data asli tidak tersentuh
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            cache.clear()
+            start = time.perf_counter()
+            context = seed_data(seed=options["seed"], scale=options["scale"], **overrides)
+            seed_seconds = time.perf_counter() - start
+            self.stdout.write(f"Seed {options['scale']}: {context['sizes']} ({seed_seconds:.1f} s)")
+
+            # Middleware instrumentasi dimatikan: query dihitung sendiri oleh runner
+            with override_settings(REQUEST_METRICS_ENABLED=False):
+                results = run(context, endpoints, repeat=options["repeat"], warmup=options["warmup"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": timezone.now().isoformat(),
+                "scale": options["scale"],
+                "seed": options["seed"],
+                "sizes": context["sizes"],
+                "repeat": options["repeat"],
+                "database": connection.vendor,
+                "python": platform.python_version(),
+            },
+            "endpoints": results,
+        }
+        self._print(results)
+        if baseline is not None:
+            self._print_compare(compare(baseline, results))
+
+        output = Path(options["output"]) if options["output"] else RESULTS_DIR / (
+            f"{timezone.now():%Y%m%d-%H%M%S}-{report['meta']['commit'] or 'nogit'}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"Hasil disimpan ke {output}"))
+
+    def _print(self, results):
+        self.stdout.write(
+            f"{'endpoint':<28} {'status':>8} {'p50 ms':>9} {'p95 ms':>9} {'query':>6} {'dup':>5} {'bytes':>9}"
+        )
+        for name, result in results.items():
+            status = ",".join(str(code) for code in result["status"])
+            self.stdout.write(
+                f"{name:<28} {status:>8} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['queries']:>6} {result['duplicate_queries']:>5} {result['bytes']:>9}"
+            )
+
+    def _print_compare(self, rows):
+        self.stdout.write("\nDibanding baseline:")
+        for row in rows:
+            change = f"{row['p95_change']:+.1f}%" if row["p95_change"] is not None else "-"
+            self.stdout.write(
+                f"{row['endpoint']:<28} p95 {row['p95_before']:.2f} -> {row['p95_after']:.2f} ms ({change}), "
+                f"query {row['queries_before']} -> {row['queries_after']}"
+            )
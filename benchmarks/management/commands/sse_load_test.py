@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from benchmarks.sse import run_sse_load
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test push channel SSE: N subscriber idle di satu worker (ASGI, satu event loop), "
+        "lalu ukur sebaran event ke semuanya."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subscribers", type=int, default=1000)
+        parser.add_argument("--events", type=int, default=5)
+        parser.add_argument("--timeout", type=float, default=120, help="Batas waktu total (detik).")
+        parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON.")
+
+    def handle(self, *args, **options):
+        # Database sementara (seperti test runner) untuk user dan session
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            user = get_user_model().objects.create_user(username="sse_load", password="sse_load")
+            client = Client()
+            client.force_login(user)
+            with override_settings(REQUEST_METRICS_ENABLED=False):
+                result = asyncio.run(run_sse_load(
+                    client.cookies, options["subscribers"], options["events"], options["timeout"],
+                ))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for key, value in result.items():
+            self.stdout.write(f"{key:<20} {value}")
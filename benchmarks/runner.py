@@ -0,0 +1,142 @@
+# benchmarks/runner.py
+"""
+Jalankan endpoint panas lewat Django test client dan ukur latency serta
+jumlah query per request.
+"""
+
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from main.middleware import QueryStats
+
+
+@dataclass
+class Endpoint:
+    name: str
+    # Nama URL untuk reverse(), atau path literal (diawali "/") untuk route tanpa nama
+    route: str
+    # Peran user yang login: None (anonim), "fan", "club_admin", atau "superuser"
+    role: str = None
+    kwargs: dict = field(default_factory=dict)
+    query: dict = field(default_factory=dict)
+
+    def url(self, context):
+        kwargs = {key: value(context) if callable(value) else value for key, value in self.kwargs.items()}
+        query = {key: value(context) if callable(value) else value for key, value in self.query.items()}
+        url = self.route if self.route.startswith("/") else reverse(self.route, kwargs=kwargs)
+        if query:
+            url += "?" + urlencode(query)
+        return url
+
+
+ENDPOINTS = [
+    Endpoint("homepage", "main:homepage"),
+    Endpoint("get_rumors_json", "rumors:get_rumors_json", role="fan"),
+    Endpoint("list_pemain_dijual_json", "player_transaction:list_pemain_dijual_json", role="club_admin"),
+    Endpoint("negotiation_inbox_json", "player_transaction:negotiation_inbox_json", role="club_admin"),
+    Endpoint(
+        "negotiation_inbox_received_pending", "player_transaction:negotiation_inbox_received_json",
+        role="club_admin", query={"status": "pending"},
+    ),
+    Endpoint("negotiation_inbox_sent", "player_transaction:negotiation_inbox_sent_json", role="club_admin"),
+    Endpoint("negotiation_inbox_counts", "player_transaction:negotiation_inbox_counts_json", role="club_admin"),
+    Endpoint(
+        "show_replies_json_flutter", "community:show_replies_json_flutter", role="fan",
+        kwargs={"post_id": lambda context: context["post"].id},
+    ),
+    Endpoint(
+        "get_players_by_club_api", "best_eleven:api_get_players", role="fan",
+        query={"club_id": lambda context: context["club"].id},
+    ),
+    Endpoint("admin_get_users", "/accounts/api/admin/users/", role="superuser"),
+]
+
+
+def percentile(values, fraction):
+    """Persentil dengan interpolasi linear (statistics.quantiles metode inclusive)."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[round(fraction * 100) - 1]
+
+
+def _consume(response):
+    # Body streaming baru dieksekusi saat dibaca; ikut diukur
+    if response.streaming:
+        return len(b"".join(response.streaming_content))
+    return len(response.content)
+
+
+def measure(client, url, repeat=20, warmup=2):
+    """Ukur `repeat` request GET ke `url` setelah `warmup` request yang tidak dihitung."""
+    for _ in range(warmup):
+        _consume(client.get(url))
+
+    durations, queries, duplicates = [], [], []
+    statuses = Counter()
+    size = 0
+    for _ in range(repeat):
+        stats = QueryStats()
+        with connection.execute_wrapper(stats):
+            start = time.perf_counter()
+            response = client.get(url)
+            size = _consume(response)
+            durations.append((time.perf_counter() - start) * 1000)
+        statuses[response.status_code] += 1
+        queries.append(stats.count)
+        duplicates.append(stats.duplicates)
+
+    return {
+        "url": url,
+        "requests": repeat,
+        "status": dict(statuses),
+        "p50_ms": round(percentile(durations, 0.5), 3),
+        "p95_ms": round(percentile(durations, 0.95), 3),
+        "mean_ms": round(statistics.fmean(durations), 3),
+        "queries": max(queries),
+        "duplicate_queries": max(duplicates),
+        "bytes": size,
+    }
+
+
+def clients_for(context):
+    """Satu Client per peran; user diambil dari hasil seed_data."""
+    clients = {None: Client()}
+    for role in ("fan", "club_admin", "superuser"):
+        client = Client()
+        client.force_login(context[role])
+        clients[role] = client
+    return clients
+
+
+def run(context, endpoints=ENDPOINTS, repeat=20, warmup=2):
+    clients = clients_for(context)
+    return {
+        endpoint.name: measure(clients[endpoint.role], endpoint.url(context), repeat=repeat, warmup=warmup)
+        for endpoint in endpoints
+    }
+
+
+def compare(baseline, current):
+    """Selisih p95 dan jumlah query per endpoint terhadap hasil sebelumnya."""
+    rows = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        rows.append({
+            "endpoint": name,
+            "p95_before": before["p95_ms"],
+            "p95_after": result["p95_ms"],
+            "p95_change": round((result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100, 1)
+            if before["p95_ms"] else None,
+            "queries_before": before["queries"],
+            "queries_after": result["queries"],
+        })
+    return rows
@@ -0,0 +1,246 @@
+# benchmarks/seed.py
+"""
+Generator data untuk benchmark endpoint. Semua data dibuat dengan
+bulk_create dan random.Random(seed) sehingga dua run dengan ukuran dan seed
+yang sama menghasilkan database yang sama.
+"""
+
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models import CustomUser, Profile
+from best_eleven.models import BestEleven
+from community.closure import link_replies
+from community.models import Post, Reply
+from main.models import Club, Player
+from main.versioning import bump_roster_version
+from player_transaction.counters import rebuild_counters
+from player_transaction.models import Negotiation
+from rumors.models import Rumors
+
+# Ukuran bawaan per skala; setiap nilai bisa di-override lewat seed_data(**sizes)
+SCALES = {
+    "small": {
+        "clubs": 6, "players_per_club": 15, "fans": 20, "rumors": 100,
+        "posts": 10, "replies_per_post": 10, "reply_depth": 3,
+        "negotiations": 200, "formations": 10,
+    },
+    "medium": {
+        "clubs": 20, "players_per_club": 30, "fans": 200, "rumors": 2_000,
+        "posts": 200, "replies_per_post": 40, "reply_depth": 4,
+        "negotiations": 5_000, "formations": 200,
+    },
+    "large": {
+        "clubs": 60, "players_per_club": 40, "fans": 2_000, "rumors": 50_000,
+        "posts": 2_000, "replies_per_post": 100, "reply_depth": 5,
+        "negotiations": 100_000, "formations": 2_000,
+    },
+}
+
+POSITIONS = ["GK", "CB", "LB", "RB", "CDM", "CM", "CAM", "LW", "RW", "ST"]
+COUNTRIES = ["England", "Spain", "France", "Brazil", "Argentina", "Portugal", "Indonesia", "Germany"]
+PASSWORD = "benchmark"
+BATCH_SIZE = 2_000
+
+
+def sizes_for(scale="small", **overrides):
+    sizes = dict(SCALES[scale])
+    sizes.update({key: value for key, value in overrides.items() if value is not None})
+    return sizes
+
+
+def _users(sizes, clubs, password):
+    superuser = CustomUser.objects.create(
+        username="bench_superuser", password=password, is_fan=True, is_club_admin=True,
+        is_staff=True, is_superuser=True,
+    )
+    admins = CustomUser.objects.bulk_create(
+        [
+            CustomUser(username=f"bench_admin_{i}", password=password, is_fan=False, is_club_admin=True)
+            for i in range(len(clubs))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    fans = CustomUser.objects.bulk_create(
+        [CustomUser(username=f"bench_fan_{i}", password=password) for i in range(sizes["fans"])],
+        batch_size=BATCH_SIZE,
+    )
+    # Superuser aplikasi ini = admin klub bernama "Admin" (lihat accounts.views._is_superuser_check)
+    admin_club, _ = Club.objects.get_or_create(name="Admin")
+    Profile.objects.bulk_create(
+        [Profile(user=superuser, managed_club=admin_club)]
+        + [Profile(user=admin, managed_club=club) for admin, club in zip(admins, clubs)]
+        + [Profile(user=fan) for fan in fans],
+        batch_size=BATCH_SIZE,
+    )
+    return superuser, admins, fans
+
+
+def _players(rng, sizes, clubs):
+    return Player.objects.bulk_create(
+        [
+            Player(
+                nama_pemain=f"{club.name} Player {j}",
+                current_club=club,
+                position=rng.choice(POSITIONS),
+                umur=rng.randint(17, 38),
+                market_value=rng.randrange(1, 200) * 1_000_000,
+                negara=rng.choice(COUNTRIES),
+                jumlah_goal=rng.randint(0, 30),
+                jumlah_asis=rng.randint(0, 20),
+                jumlah_match=rng.randint(0, 40),
+                sedang_dijual=rng.random() < 0.25,
+            )
+            for club in clubs
+            for j in range(sizes["players_per_club"])
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _rumors(rng, sizes, clubs, players, fans):
+    rumors = []
+    for _ in range(sizes["rumors"]):
+        player = rng.choice(players)
+        tujuan = rng.choice(clubs)
+        # bulk_create tidak memanggil Rumors.save(), judul diisi di sini
+        rumors.append(Rumors(
+            author=rng.choice(fans),
+            pemain=player,
+            club_asal_id=player.current_club_id,
+            club_tujuan=tujuan,
+            title=f"{player.nama_pemain} transfer ke {tujuan.name}",
+            content="Rumor benchmark",
+            status=rng.choice(["pending", "pending", "verified", "denied"]),
+            rumors_views=rng.randint(0, 5_000),
+        ))
+    Rumors.objects.bulk_create(rumors, batch_size=BATCH_SIZE)
+
+
+def _threads(rng, sizes, fans):
+    """Post dengan reply bersarang; reply dibuat per level agar parent sudah punya id."""
+    posts = Post.objects.bulk_create(
+        [
+            Post(author=rng.choice(fans), title=f"Diskusi {i}", description="Post benchmark")
+            for i in range(sizes["posts"])
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    # Rencana pohon per post: (post, index parent, depth); sepertiga reply adalah akar
+    levels = {}
+    for post in posts:
+        count = sizes["replies_per_post"]
+        nodes = []
+        parents = []  # index reply yang masih boleh punya anak
+        for i in range(count):
+            if i < max(1, count // 3) or not parents:
+                node = (None, 0)
+            else:
+                parent = rng.choice(parents)
+                node = (parent, nodes[parent][1] + 1)
+            nodes.append(node)
+            if node[1] < sizes["reply_depth"] - 1:
+                parents.append(i)
+        for i, (parent, depth) in enumerate(nodes):
+            levels.setdefault(depth, []).append((post, i, parent))
+
+    created = []
+    saved = {}
+    for depth in sorted(levels):
+        plan = levels[depth]
+        replies = Reply.objects.bulk_create(
+            [
+                Reply(
+                    post=post,
+                    parent=saved[post.id, parent] if parent is not None else None,
+                    author=rng.choice(fans),
+                    content=f"Balasan level {depth}",
+                )
+                for post, _, parent in plan
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        saved.update(((post.id, i), reply) for (post, i, _), reply in zip(plan, replies))
+        created.extend(replies)
+
+    # bulk_create tidak memicu signal closure
+    link_replies(created)
+    return posts
+
+
+def _negotiations(rng, sizes, clubs, players):
+    by_club = {}
+    for player in players:
+        by_club.setdefault(player.current_club_id, []).append(player)
+    negotiations = []
+    for _ in range(sizes["negotiations"]):
+        to_club, from_club = rng.sample(clubs, 2)
+        negotiations.append(Negotiation(
+            from_club=from_club,
+            to_club=to_club,
+            player=rng.choice(by_club[to_club.id]),
+            offered_price=rng.randrange(1, 200) * 1_000_000,
+            status=rng.choice(["pending", "pending", "accepted", "rejected", "cancelled"]),
+        ))
+    Negotiation.objects.bulk_create(negotiations, batch_size=BATCH_SIZE)
+    # bulk_create tidak memicu signal counter inbox
+    rebuild_counters([club.id for club in clubs])
+
+
+def _formations(rng, sizes, players, fans):
+    formations = BestEleven.objects.bulk_create(
+        [
+            BestEleven(
+                fan_account=rng.choice(fans),
+                name=f"Formasi {i}",
+                layout=rng.choice([choice for choice, _ in BestEleven.FORMATION_CHOICES]),
+            )
+            for i in range(sizes["formations"])
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    through = BestEleven.players.through
+    through.objects.bulk_create(
+        [
+            through(besteleven_id=formation.id, player_id=player.id)
+            for formation in formations
+            for player in rng.sample(players, min(11, len(players)))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+@transaction.atomic
+def seed_data(seed=42, scale="small", **overrides):
+    """
+    Isi database dengan data benchmark. Mengembalikan dict berisi ukuran
+    yang dipakai dan objek acuan untuk endpoint (user per peran, klub, post
+    dengan thread terbesar).
+    """
+    rng = random.Random(seed)
+    sizes = sizes_for(scale, **overrides)
+    password = make_password(PASSWORD)
+
+    clubs = Club.objects.bulk_create(
+        [Club(name=f"Bench Club {i}", country=rng.choice(COUNTRIES)) for i in range(sizes["clubs"])]
+    )
+    superuser, admins, fans = _users(sizes, clubs, password)
+    players = _players(rng, sizes, clubs)
+    _rumors(rng, sizes, clubs, players, fans)
+    posts = _threads(rng, sizes, fans)
+    _negotiations(rng, sizes, clubs, players)
+    _formations(rng, sizes, players, fans)
+    bump_roster_version()
+
+    return {
+        "sizes": sizes,
+        "seed": seed,
+        "superuser": superuser,
+        "club_admin": admins[0],
+        "club": clubs[0],
+        "fan": fans[0],
+        "post": posts[0],
+    }
@@ -0,0 +1,93 @@
+# benchmarks/sse.py
+"""
+Load test push channel: banyak subscriber SSE idle di satu event loop
+(satu worker ASGI), lalu ukur waktu sebaran event ke semua subscriber.
+Request lewat AsyncClient sehingga jalurnya sama dengan view di ASGI.
+"""
+
+import asyncio
+import resource
+import threading
+import time
+
+from django.test import AsyncClient
+from django.urls import reverse
+
+from events.broker import get_broker
+
+from .runner import percentile
+
+
+async def _subscribe(client, url, connected, expected, received):
+    response = await client.get(url)
+    stream = response.streaming_content.__aiter__()
+    await stream.__anext__()  # baris retry: koneksi sudah terpasang
+    connected()
+    try:
+        seen = 0
+        while seen < expected:
+            chunk = (await stream.__anext__()).decode()
+            now = time.perf_counter()
+            for block in chunk.split("\n\n"):
+                if "\nevent: " in block:
+                    received.append((int(block.split("\n")[0][4:]), now))
+                    seen += 1
+    finally:
+        await stream.aclose()
+
+
+async def run_sse_load(cookies, subscribers=1000, events=5, timeout=60):
+    """
+    Buka `subscribers` stream dengan cookie session `cookies`, tunggu sampai
+    semuanya idle, publish `events` event, lalu laporkan latency sebaran.
+    """
+    broker = get_broker()
+    client = AsyncClient()
+    client.cookies = cookies
+    url = reverse("events:event_stream")
+
+    ready = asyncio.Event()
+    connected = 0
+
+    def on_connected():
+        nonlocal connected
+        connected += 1
+        if connected == subscribers:
+            ready.set()
+
+    received = []
+    threads_before = threading.active_count()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_subscribe(client, url, on_connected, events, received))
+        for _ in range(subscribers)
+    ]
+    await asyncio.wait_for(ready.wait(), timeout)
+    connect_seconds = time.perf_counter() - start
+    # Beri waktu semua subscriber masuk ke wait_async
+    while broker.subscriber_count < subscribers:
+        await asyncio.sleep(0.01)
+    idle_threads = threading.active_count()
+
+    published = {}
+    for i in range(events):
+        published[broker.publish("player.listed", {"load_test": i}).id] = time.perf_counter()
+        await asyncio.sleep(0)
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout)
+
+    latencies = [(at - published[event_id]) * 1000 for event_id, at in received]
+    return {
+        "subscribers": subscribers,
+        "events": events,
+        "delivered": len(received),
+        "expected": subscribers * events,
+        "connect_seconds": round(connect_seconds, 3),
+        "fanout_p50_ms": round(percentile(latencies, 0.5), 3),
+        "fanout_p95_ms": round(percentile(latencies, 0.95), 3),
+        "fanout_max_ms": round(max(latencies), 3),
+        "threads_before": threads_before,
+        "threads_idle": idle_threads,
+        "max_rss_growth_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before,
+    }
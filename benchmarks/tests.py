@@ -0,0 +1,123 @@
+import asyncio
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from accounts.models import CustomUser
+from benchmarks.deployment import run_deployment_load
+from benchmarks.runner import ENDPOINTS, compare, percentile, run
+from benchmarks.seed import seed_data
+from benchmarks.sse import run_sse_load
+from best_eleven.models import BestEleven
+from community.models import Reply, ReplyClosure
+from events.broker import reset_broker
+from main.models import Club, Player
+from player_transaction.models import Negotiation
+from rumors.models import Rumors
+
+TINY = {
+    "clubs": 3, "players_per_club": 12, "fans": 4, "rumors": 20, "posts": 2,
+    "replies_per_post": 9, "reply_depth": 3, "negotiations": 30, "formations": 3,
+}
+
+
+class SeedDataTests(TestCase):
+    def test_ukuran_sesuai_permintaan(self):
+        context = seed_data(scale="small", **TINY)
+
+        self.assertEqual(context["sizes"]["clubs"], 3)
+        self.assertEqual(Player.objects.filter(current_club__name__startswith="Bench").count(), 36)
+        self.assertEqual(Rumors.objects.count(), 20)
+        self.assertEqual(Negotiation.objects.count(), 30)
+        self.assertEqual(Reply.objects.count(), 18)
+        self.assertEqual(BestEleven.objects.get(name="Formasi 0").players.count(), 11)
+        self.assertEqual(context["club_admin"].profile.managed_club, context["club"])
+
+    def test_reply_bersarang_tercatat_di_closure(self):
+        seed_data(scale="small", **TINY)
+
+        nested = Reply.objects.filter(parent__isnull=False)
+        self.assertTrue(nested.exists())
+        self.assertTrue(all(r.post_id == r.parent.post_id for r in nested.select_related("parent")))
+        self.assertFalse(ReplyClosure.objects.filter(depth__gte=3).exists())
+        self.assertEqual(ReplyClosure.objects.filter(depth=0).count(), Reply.objects.count())
+
+    def test_seed_sama_menghasilkan_data_sama(self):
+        def snapshot():
+            return list(Negotiation.objects.order_by("id").values_list("player__nama_pemain", "offered_price"))
+
+        seed_data(seed=7, scale="small", **TINY)
+        first = snapshot()
+        CustomUser.objects.filter(username__startswith="bench_").delete()
+        Club.objects.filter(name__startswith="Bench").delete()
+        seed_data(seed=7, scale="small", **TINY)
+
+        self.assertEqual(snapshot(), first)
+
+
+@override_settings(REQUEST_METRICS_ENABLED=False)
+class BenchmarkRunnerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.context = seed_data(scale="small", **TINY)
+
+    def test_semua_endpoint_terukur(self):
+        results = run(self.context, repeat=3, warmup=1)
+
+        self.assertEqual(set(results), {endpoint.name for endpoint in ENDPOINTS})
+        for name, result in results.items():
+            with self.subTest(name):
+                self.assertEqual(result["status"], {200: 3})
+                self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+                self.assertGreater(result["bytes"], 0)
+        self.assertGreater(results["negotiation_inbox_json"]["queries"], 0)
+
+    def test_compare_menghitung_selisih(self):
+        before = {"a": {"p95_ms": 10.0, "queries": 5}, "hilang": {"p95_ms": 1.0, "queries": 1}}
+        after = {"a": {"p95_ms": 12.0, "queries": 3}, "baru": {"p95_ms": 2.0, "queries": 1}}
+
+        rows = compare(before, after)
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["p95_change"], 20.0)
+        self.assertEqual((rows[0]["queries_before"], rows[0]["queries_after"]), (5, 3))
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50.5)
+        self.assertAlmostEqual(percentile(values, 0.95), 95.05)
+        self.assertEqual(percentile([4.0], 0.95), 4.0)
+
+
+@override_settings(REQUEST_METRICS_ENABLED=False)
+class SseLoadTests(TransactionTestCase):
+    def setUp(self):
+        reset_broker()
+        self.addCleanup(reset_broker)
+        user = CustomUser.objects.create_user(username="sse_test", password="sse_test")
+        self.client.force_login(user)
+
+    def test_semua_subscriber_menerima_event_tanpa_thread_per_koneksi(self):
+        result = asyncio.run(run_sse_load(self.client.cookies, subscribers=100, events=3, timeout=30))
+
+        self.assertEqual(result["delivered"], result["expected"])
+        self.assertLess(result["threads_idle"] - result["threads_before"], 5)
+
+
+@override_settings(REQUEST_METRICS_ENABLED=False)
+class DeploymentLoadTests(TransactionTestCase):
+    def test_wsgi_dan_asgi_dengan_client_lambat(self):
+        cache.clear()
+        context = seed_data(scale="small", **TINY)
+        results = {
+            mode: run_deployment_load(
+                context, mode, workers=2, fast_clients=4, slow_clients=2, duration=0.5, delay=0.05,
+            )
+            for mode in ("wsgi", "asgi")
+        }
+
+        for result in results.values():
+            self.assertGreater(result["requests"], 0)
+            self.assertEqual(list(result["status"]), [200])
+            self.assertGreater(result["slow_requests"], 0)
+        self.assertEqual(results["asgi"]["workers"], None)
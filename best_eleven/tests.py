@@ -6,6 +6,10 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse, NoReverseMatch
 from unittest.mock import patch
 
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from main.models import Player, Club
 from .models import BestEleven
 
@@ -449,4 +453,36 @@ class BestElevenViewsTest(TestCase):
         detail_url = reverse(self.api_detail_url_base, kwargs={'pk': self.formation1.pk})
         response = self.client.get(detail_url)
         self.assertEqual(response.status_code, 500)
-        self.assertEqual(response.json(), {'error': 'An unexpected error occurred: Unexpected Error'})
\ No newline at end of file
+        self.assertEqual(response.json(), {'error': 'An unexpected error occurred: Unexpected Error'})
+
+
+class BuilderDataConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='etaguser', password='password123')
+        Club.objects.create(name='ETag Club')
+        self.client.force_login(self.user)
+        self.url = reverse('best_eleven:api_builder_data')
+
+    def test_304_hanya_query_agregat_formasi(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(cached.status_code, 304)
+        # Selain session dan user dari middleware auth, hanya MAX/COUNT formasi
+        view_queries = [q['sql'] for q in queries.captured_queries
+                        if 'django_session' not in q['sql'] and 'accounts_customuser' not in q['sql']]
+        self.assertEqual(len(view_queries), 1)
+        self.assertIn('best_eleven_besteleven', view_queries[0])
+
+    def test_formasi_baru_mengganti_etag(self):
+        first = self.client.get(self.url)
+        BestEleven.objects.create(fan_account=self.user, name='Baru', layout='4-3-3')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([f['name'] for f in response.json()['history']], ['Baru'])
+
@@ -11,7 +11,10 @@ from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.db import transaction
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
 
+from main.conditional import roster_condition, roster_etag
 from main.models import Player, Club
 from .models import BestEleven
 from .forms import BestElevenForm
@@ -57,8 +60,24 @@ class BestElevenUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return self.request.user == formation.fan_account
 
 # --- API Views ---
+def _builder_data_etag(request):
+    """
+    ETag data builder: versi roster (klub) + riwayat formasi user. Satu
+    query agregat; COUNT ikut agar formasi yang dihapus juga mengubah ETag.
+    """
+    roster = roster_etag(request)
+    if roster is None:
+        return None
+    history = BestEleven.objects.filter(fan_account=request.user).aggregate(
+        latest=Max('updated_at'), total=Count('id')
+    )
+    latest = history['latest'].timestamp() if history['latest'] else 0
+    return f"{roster}-user-{request.user.pk}-{history['total']}-{latest}"
+
+
 @login_required
 @require_http_methods(['GET']) # **** TAMBAHKAN DECORATOR INI ****
+@condition(etag_func=_builder_data_etag)
 def get_builder_data(request):
     try:
         clubs = Club.objects.order_by('name')
@@ -72,6 +91,7 @@ def get_builder_data(request):
 
 @login_required
 @require_http_methods(['GET']) # **** TAMBAHKAN DECORATOR INI ****
+@roster_condition
 def get_players_by_club_api(request):
     try:
         club_id = request.GET.get('club_id')
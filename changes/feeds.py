@@ -0,0 +1,259 @@
+# changes/feeds.py
+"""
+Change feed untuk sync inkremental client: baris yang berubah sejak cursor
+(keyset (updated_at, id)) plus tombstone baris yang dihapus (keyset
+(deleted_at, id)). Cursor menyimpan posisi kedua keyset sekaligus, plus
+klub yang dikelola user saat cursor dibuat.
+
+Tombstone negosiasi hanya dikirim ke klub pengirim dan penerima. Baris
+negosiasi tidak pernah berpindah klub, jadi yang bisa mengubah himpunan
+baris yang terlihat hanyalah klub yang dikelola user; jika berubah, cursor
+lama ditolak (410) dan client harus sync penuh.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from community.models import Post, Reply
+from main.models import Player
+from main.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, KeysetPaginator, decode_cursor, encode_cursor
+from player_transaction.models import Negotiation
+from rumors.feed import FEED_FIELDS, managed_club_id_for, rumor_feed_queryset, serialize_rumor_row
+from rumors.models import Rumors
+
+from .models import Tombstone
+
+
+class CursorExpired(Exception):
+    """Tombstone setelah cursor sudah dipangkas; client harus sync penuh."""
+
+
+# ========== Baris per jenis data ==========
+
+def _players(user, club_id):
+    return Player.objects.values(
+        "id", "nama_pemain", "position", "umur", "negara", "jumlah_match", "jumlah_goal",
+        "jumlah_asis", "market_value", "thumbnail", "sedang_dijual", "current_club_id",
+        "current_club__name", "updated_at",
+    )
+
+
+def _player_row(row):
+    return {
+        "id": str(row["id"]),
+        "nama_pemain": row["nama_pemain"],
+        "posisi": row["position"],
+        "umur": row["umur"],
+        "negara": row["negara"],
+        "match": row["jumlah_match"],
+        "goal": row["jumlah_goal"],
+        "assist": row["jumlah_asis"],
+        "market_value": row["market_value"],
+        "thumbnail": row["thumbnail"],
+        "sedang_dijual": row["sedang_dijual"],
+        "club_id": row["current_club_id"],
+        "nama_klub": row["current_club__name"],
+    }
+
+
+def _negotiations(user, club_id):
+    # Hanya tawaran masuk/keluar klub yang dikelola user
+    if not club_id:
+        raise PermissionDenied("Hanya Admin Club yang dapat mengakses negosiasi.")
+    return Negotiation.objects.filter(Q(to_club_id=club_id) | Q(from_club_id=club_id)).values(
+        "id", "from_club_id", "from_club__name", "to_club_id", "to_club__name", "player_id",
+        "player__nama_pemain", "offered_price", "status", "created_at", "updated_at",
+    )
+
+
+def _negotiation_row(row):
+    return {
+        "id": row["id"],
+        "from_club_id": row["from_club_id"],
+        "from_club": row["from_club__name"],
+        "to_club_id": row["to_club_id"],
+        "to_club": row["to_club__name"],
+        "player": row["player__nama_pemain"],
+        "player_id": str(row["player_id"]),
+        "offered_price": float(row["offered_price"]),
+        "status": row["status"],
+        "created_at": row["created_at"].isoformat(),
+    }
+
+
+def _rumors(user, club_id):
+    return rumor_feed_queryset(user, club_id).values(*FEED_FIELDS, "updated_at")
+
+
+def _posts(user, club_id):
+    return Post.objects.values(
+        "id", "author__username", "title", "description", "image_url", "created_at", "updated_at",
+    )
+
+
+def _post_row(row):
+    return {
+        "id": row["id"],
+        "author_username": row["author__username"],
+        "title": row["title"],
+        "description": row["description"],
+        "image_url": row["image_url"],
+        "created_at": row["created_at"].isoformat(),
+    }
+
+
+def _replies(user, club_id):
+    return Reply.objects.values(
+        "id", "post_id", "parent_id", "author__username", "content", "created_at", "updated_at",
+    )
+
+
+def _reply_row(row):
+    return {
+        "id": row["id"],
+        "post_id": row["post_id"],
+        "parent_id": row["parent_id"],
+        "author_username": row["author__username"],
+        "content": row["content"],
+        "created_at": row["created_at"].isoformat(),
+    }
+
+
+# nama feed -> (model, fungsi queryset .values() untuk (user, klub yang dikelola),
+# fungsi serialisasi baris)
+FEEDS = {
+    "players": (Player, _players, _player_row),
+    "negotiations": (Negotiation, _negotiations, _negotiation_row),
+    "rumors": (Rumors, _rumors, serialize_rumor_row),
+    "posts": (Post, _posts, _post_row),
+    "replies": (Reply, _replies, _reply_row),
+}
+
+
+# Feed yang isinya bergantung pada klub yang dikelola user (baris yang
+# terlihat atau flag is_admin); cursor-nya hanya berlaku untuk klub itu
+CLUB_DEPENDENT_FEEDS = {"negotiations", "rumors"}
+
+# Feed yang tombstone-nya hanya untuk klub tertentu: nama -> klub dari objek
+TOMBSTONE_CLUBS = {
+    "negotiations": lambda negotiation: {negotiation.from_club_id, negotiation.to_club_id},
+}
+
+
+def feed_for_model(model):
+    for name, (feed_model, _, _) in FEEDS.items():
+        if feed_model is model:
+            return name
+    return None
+
+
+# ========== Cursor ==========
+
+def settled_before():
+    """
+    Batas atas updated_at/deleted_at yang dibaca. Baris yang ditulis dalam
+    CHANGE_FEED_SETTLE_SECONDS terakhir ditunda ke poll berikutnya, karena
+    transaksi yang commit belakangan bisa membawa timestamp lebih lama dari
+    baris yang sudah dikirim.
+    """
+    return timezone.now() - datetime.timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+
+
+def tombstone_horizon():
+    """Tombstone sebelum waktu ini boleh dipangkas."""
+    return timezone.now() - datetime.timedelta(days=settings.CHANGE_FEED_TOMBSTONE_DAYS)
+
+
+def _split_cursor(cursor, club_id):
+    try:
+        rows_cursor, tombstone_cursor, cursor_club_id = decode_cursor(cursor, 3)
+    except InvalidCursor:
+        # Cursor format lama (tanpa klub): tidak bisa dicek, minta sync penuh
+        decode_cursor(cursor, 2)
+        raise CursorExpired("Cursor sudah kadaluarsa, lakukan sync penuh.")
+    if not isinstance(tombstone_cursor, str) or not (rows_cursor is None or isinstance(rows_cursor, str)):
+        raise InvalidCursor("Cursor tidak valid.")
+    if cursor_club_id != club_id:
+        raise CursorExpired("Klub yang dikelola sudah berubah, lakukan sync penuh.")
+    deleted_at = parse_datetime(decode_cursor(tombstone_cursor, 2)[0] or "")
+    if deleted_at is None:
+        raise InvalidCursor("Cursor tidak valid.")
+    if deleted_at < tombstone_horizon():
+        raise CursorExpired("Cursor sudah kadaluarsa, lakukan sync penuh.")
+    return rows_cursor, tombstone_cursor
+
+
+def changes_since(name, user, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Satu halaman perubahan feed `name` untuk `user` sejak `cursor`.
+
+    Tanpa cursor: semua baris dari awal (sync penuh), tanpa tombstone lama.
+    Mengembalikan {"changed", "deleted", "cursor", "has_more"}; client
+    menyimpan "cursor" dan mengulang selama has_more true.
+    """
+    _, queryset_for, serialize = FEEDS[name]
+    settled = settled_before()
+    club_id = managed_club_id_for(user) if name in CLUB_DEPENDENT_FEEDS else None
+
+    if cursor:
+        rows_cursor, tombstone_cursor = _split_cursor(cursor, club_id)
+    else:
+        rows_cursor, tombstone_cursor = None, encode_cursor([settled, 0])
+
+    rows = KeysetPaginator(
+        queryset_for(user, club_id).filter(updated_at__lte=settled), ("updated_at", "id"), limit,
+    )
+    rows_page = rows.page(rows_cursor)
+
+    scope_club_id = club_id if name in TOMBSTONE_CLUBS else None
+    tombstones = KeysetPaginator(
+        Tombstone.objects.filter(feed=name, scope_club_id=scope_club_id, deleted_at__lte=settled)
+        .values("id", "object_id", "deleted_at"),
+        ("deleted_at", "id"),
+        limit,
+    )
+    tombstone_page = tombstones.page(tombstone_cursor) if cursor else None
+
+    changed = []
+    for row in rows_page.items:
+        item = serialize(row)
+        item["updated_at"] = row["updated_at"].isoformat()
+        changed.append(item)
+
+    if rows_page.items:
+        rows_cursor = rows.cursor_for(rows_page.items[-1])
+    if tombstone_page is None or not tombstone_page.has_next:
+        # Semua tombstone sampai `settled` sudah terbaca
+        tombstone_cursor = encode_cursor([settled, 0])
+    else:
+        tombstone_cursor = tombstone_page.next_cursor
+
+    return {
+        "changed": changed,
+        "deleted": [t["object_id"] for t in tombstone_page.items] if tombstone_page else [],
+        "cursor": encode_cursor([rows_cursor, tombstone_cursor, club_id]),
+        "has_more": rows_page.has_next or bool(tombstone_page and tombstone_page.has_next),
+    }
+
+
+def record_deletion(name, instance):
+    """Catat tombstone untuk `instance`; per klub jika feed-nya dibatasi klub."""
+    object_id = str(instance.pk)
+    if name in TOMBSTONE_CLUBS:
+        Tombstone.objects.bulk_create([
+            Tombstone(feed=name, object_id=object_id, scope_club_id=club_id)
+            for club_id in TOMBSTONE_CLUBS[name](instance)
+        ])
+    else:
+        Tombstone.objects.create(feed=name, object_id=object_id)
+
+
+def prune_tombstones():
+    """Hapus tombstone yang lebih tua dari CHANGE_FEED_TOMBSTONE_DAYS."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_horizon()).delete()
+    return deleted
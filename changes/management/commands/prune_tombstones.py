@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from changes.feeds import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Hapus tombstone change feed yang lebih tua dari CHANGE_FEED_TOMBSTONE_DAYS."
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f"{deleted} tombstone lebih dari {settings.CHANGE_FEED_TOMBSTONE_DAYS} hari dihapus"
+        ))
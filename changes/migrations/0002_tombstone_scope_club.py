@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tombstone',
+            name='tombstone_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='scope_club_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['feed', 'scope_club_id', 'deleted_at', 'id'], name='tombstone_feed_scope_idx'),
+        ),
+    ]
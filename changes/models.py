@@ -0,0 +1,29 @@
+# changes/models.py
+
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    Log penghapusan untuk change feed: satu baris per objek yang dihapus,
+    agar client yang sync inkremental tahu baris mana yang harus dibuang.
+    Dipangkas oleh manage.py prune_tombstones setelah
+    CHANGE_FEED_TOMBSTONE_DAYS.
+    """
+
+    feed = models.CharField(max_length=20)
+    object_id = models.CharField(max_length=64)
+    # Untuk feed per klub (negosiasi): klub yang boleh melihat tombstone ini,
+    # satu baris per klub. Null = terlihat oleh semua user. Bukan FK agar
+    # tombstone tetap ada walaupun klubnya dihapus.
+    scope_club_id = models.IntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['feed', 'scope_club_id', 'deleted_at', 'id'], name='tombstone_feed_scope_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.feed}: {self.object_id}"
@@ -0,0 +1,21 @@
+# changes/signals.py
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from community.models import Post, Reply
+from main.models import Player
+from player_transaction.models import Negotiation
+from rumors.models import Rumors
+
+from .feeds import feed_for_model, record_deletion
+
+
+@receiver(post_delete, sender=Player)
+@receiver(post_delete, sender=Negotiation)
+@receiver(post_delete, sender=Rumors)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Reply)
+def record_tombstone(sender, instance, **kwargs):
+    """Objek yang dihapus (termasuk lewat cascade) dicatat untuk change feed."""
+    record_deletion(feed_for_model(sender), instance)
@@ -0,0 +1,189 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
+from changes.feeds import changes_since
+from changes.models import Tombstone
+from community.models import Post, Reply
+from main.models import Club, Player
+from main.pagination import encode_cursor
+from main.query_plans import QueryPlanAssertions, analyze
+from player_transaction.models import Negotiation
+from player_transaction.transfers import execute_transfer
+
+User = get_user_model()
+
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        self.club = Club.objects.create(name="Arsenal")
+        self.other = Club.objects.create(name="Chelsea")
+        self.players = [
+            Player.objects.create(nama_pemain=f"Pemain {i}", current_club=self.club, position="CM")
+            for i in range(3)
+        ]
+        self.user = User.objects.create_user(username="fan_sync", password="12345")
+        self.client.force_login(self.user)
+
+    def poll(self, feed, since=None, **params):
+        if since:
+            params["since"] = since
+        response = self.client.get(reverse("changes:changes_json", args=[feed]), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_sync_penuh_lalu_hanya_perubahan(self):
+        first = self.poll("players")
+        self.assertEqual(len(first["changed"]), 3)
+        self.assertEqual(first["deleted"], [])
+
+        unchanged = self.poll("players", first["cursor"])
+        self.assertEqual(unchanged["changed"], [])
+
+        self.players[1].market_value = 5
+        self.players[1].save()
+        deleted_id = str(self.players[2].id)
+        self.players[2].delete()
+
+        delta = self.poll("players", unchanged["cursor"])
+        self.assertEqual([p["id"] for p in delta["changed"]], [str(self.players[1].id)])
+        self.assertEqual(delta["changed"][0]["market_value"], 5)
+        self.assertEqual(delta["deleted"], [deleted_id])
+        self.assertFalse(delta["has_more"])
+
+        self.assertEqual(self.poll("players", delta["cursor"])["deleted"], [])
+
+    def test_sync_penuh_tidak_mengirim_tombstone_lama(self):
+        self.players[0].delete()
+        self.assertEqual(self.poll("players")["deleted"], [])
+
+    def test_paginasi_dengan_has_more(self):
+        first = self.poll("players", limit=2)
+        second = self.poll("players", first["cursor"], limit=2)
+
+        self.assertTrue(first["has_more"])
+        self.assertFalse(second["has_more"])
+        ids = [p["id"] for p in first["changed"] + second["changed"]]
+        self.assertCountEqual(ids, [str(p.id) for p in self.players])
+
+    def test_transfer_lewat_update_tetap_tercatat(self):
+        player = self.players[0]
+        Player.objects.filter(pk=player.pk).update(sedang_dijual=True)
+        nego = Negotiation.objects.create(
+            from_club=self.other, to_club=self.club, player=player, offered_price=1,
+        )
+        cursor = changes_since("players", self.user)["cursor"]
+
+        execute_transfer(player.id, self.other, negotiation=nego)
+
+        changed = changes_since("players", self.user, cursor)["changed"]
+        self.assertEqual([(p["id"], p["nama_klub"]) for p in changed], [(str(player.id), "Chelsea")])
+
+    def test_negotiations_hanya_untuk_admin_klub(self):
+        response = self.client.get(reverse("changes:changes_json", args=["negotiations"]))
+        self.assertEqual(response.status_code, 403)
+
+        admin = User.objects.create_user(username="admin_sync", password="12345", is_club_admin=True)
+        Profile.objects.create(user=admin, managed_club=self.club)
+        third = Club.objects.create(name="Liverpool")
+        mine = Negotiation.objects.create(
+            from_club=self.other, to_club=self.club, player=self.players[0], offered_price=1,
+        )
+        Negotiation.objects.create(from_club=self.other, to_club=third, player=self.players[1], offered_price=1)
+        self.client.force_login(admin)
+
+        self.assertEqual([n["id"] for n in self.poll("negotiations")["changed"]], [mine.id])
+
+    def test_tombstone_negosiasi_hanya_untuk_klub_terkait(self):
+        third = Club.objects.create(name="Liverpool")
+        admins = {}
+        for club in (self.club, self.other, third):
+            admin = User.objects.create_user(username=f"admin_{club.pk}", password="12345", is_club_admin=True)
+            Profile.objects.create(user=admin, managed_club=club)
+            admins[club] = admin
+        nego = Negotiation.objects.create(
+            from_club=self.other, to_club=self.club, player=self.players[0], offered_price=1,
+        )
+        cursors = {club: changes_since("negotiations", admin)["cursor"] for club, admin in admins.items()}
+
+        nego_id = str(nego.id)
+        nego.delete()
+
+        for club in (self.club, self.other):
+            self.assertEqual(changes_since("negotiations", admins[club], cursors[club])["deleted"], [nego_id])
+        self.assertEqual(changes_since("negotiations", admins[third], cursors[third])["deleted"], [])
+
+    def test_cursor_ditolak_setelah_klub_yang_dikelola_berubah(self):
+        admin = User.objects.create_user(username="admin_pindah", password="12345", is_club_admin=True)
+        profile = Profile.objects.create(user=admin, managed_club=self.club)
+        self.client.force_login(admin)
+        cursor = self.poll("negotiations")["cursor"]
+
+        profile.managed_club = self.other
+        profile.save()
+
+        response = self.client.get(reverse("changes:changes_json", args=["negotiations"]), {"since": cursor})
+        self.assertEqual(response.status_code, 410)
+        # Feed yang tidak bergantung pada klub tetap bisa lanjut
+        players_cursor = changes_since("players", admin)["cursor"]
+        profile.managed_club = self.club
+        profile.save()
+        self.poll("players", players_cursor)
+
+    def test_reply_dan_post_dihapus_cascade(self):
+        post = Post.objects.create(author=self.user, title="Derby", description="...")
+        reply = Reply.objects.create(post=post, author=self.user, content="Hai")
+        cursors = {feed: self.poll(feed)["cursor"] for feed in ("posts", "replies")}
+
+        post_id, reply_id = str(post.id), str(reply.id)
+
+        post.delete()
+
+        self.assertEqual(self.poll("posts", cursors["posts"])["deleted"], [post_id])
+        self.assertEqual(self.poll("replies", cursors["replies"])["deleted"], [reply_id])
+
+    @override_settings(CHANGE_FEED_SETTLE_SECONDS=60)
+    def test_baris_terbaru_ditunda_sampai_settle(self):
+        self.assertEqual(self.poll("players")["changed"], [])
+
+    def test_cursor_kadaluarsa_dan_prune(self):
+        old = timezone.now() - datetime.timedelta(days=31)
+        Tombstone.objects.create(feed="players", object_id="x", deleted_at=old)
+        expired = encode_cursor([None, encode_cursor([old, 0]), None])
+
+        response = self.client.get(reverse("changes:changes_json", args=["players"]), {"since": expired})
+        self.assertEqual(response.status_code, 410)
+
+        call_command("prune_tombstones", stdout=StringIO())
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_parameter_tidak_valid(self):
+        url = reverse("changes:changes_json", args=["players"])
+        self.assertEqual(self.client.get(url, {"since": "rusak"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("changes:changes_json", args=["klub"])).status_code, 404)
+
+
+class ChangeFeedQueryPlanTests(QueryPlanAssertions, TestCase):
+    """EXPLAIN query change feed pada data seeded."""
+
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="Klub Sync")
+        Player.objects.bulk_create([
+            Player(current_club=club, nama_pemain=f"Pemain {i}", position="CM") for i in range(2000)
+        ])
+        analyze()
+
+    def test_players_since_cursor(self):
+        since = timezone.now() - datetime.timedelta(minutes=5)
+        self.assertUsesIndex(
+            Player.objects.filter(updated_at__gt=since).order_by("updated_at", "id")[:51]
+        )
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'changes'
+
+urlpatterns = [
+    path('api/<str:feed>/', views.changes_json, name='changes_json'),
+]
@@ -0,0 +1,35 @@
+# changes/views.py
+
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from main.pagination import InvalidCursor, parse_page_size
+
+from .feeds import FEEDS, CursorExpired, changes_since
+
+
+@login_required(login_url='/accounts/login/')
+@require_GET
+def changes_json(request, feed):
+    """
+    Sync inkremental: /changes/api/players/?since=<cursor>&limit=100
+    Mengembalikan baris yang berubah dan id yang dihapus sejak cursor,
+    plus cursor baru. 410 jika cursor terlalu lama (client harus sync penuh).
+    """
+    if feed not in FEEDS:
+        return JsonResponse({"error": f"Feed tidak dikenal: {feed}"}, status=404)
+
+    try:
+        data = changes_since(
+            feed, request.user, request.GET.get("since"), parse_page_size(request.GET.get("limit")),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except CursorExpired as e:
+        return JsonResponse({"error": str(e)}, status=410)
+    except PermissionDenied as e:
+        return JsonResponse({"error": str(e)}, status=403)
+
+    return JsonResponse(data)
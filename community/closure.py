@@ -0,0 +1,69 @@
+# community/closure.py
+
+from .models import Reply, ReplyClosure
+
+
+def closure_rows(pairs, known_ancestors=None):
+    """
+    Hitung baris closure untuk list (id, parent_id) yang urut dari induk ke
+    anak. `known_ancestors` memetakan parent_id di luar list ke daftar
+    (ancestor_id, depth) miliknya. Mengembalikan list ReplyClosure.
+    """
+    ancestors = dict(known_ancestors or {})
+    rows = []
+    for reply_id, parent_id in pairs:
+        chain = [(reply_id, 0)]
+        if parent_id is not None:
+            chain += [(ancestor_id, depth + 1) for ancestor_id, depth in ancestors[parent_id]]
+        ancestors[reply_id] = chain
+        rows.extend(
+            ReplyClosure(ancestor_id=ancestor_id, descendant_id=reply_id, depth=depth)
+            for ancestor_id, depth in chain
+        )
+    return rows
+
+
+def link_replies(replies):
+    """
+    Isi closure untuk reply yang baru dibuat (termasuk hasil bulk_create,
+    yang tidak memicu signal). Reply harus urut dari induk ke anak.
+    Dua query: ambil ancestor dari parent yang sudah ada, lalu bulk insert.
+    """
+    pairs = [(reply.id, reply.parent_id) for reply in replies]
+    new_ids = {reply_id for reply_id, _ in pairs}
+    outside = {parent_id for _, parent_id in pairs if parent_id is not None} - new_ids
+
+    known = {parent_id: [] for parent_id in outside}
+    if outside:
+        links = ReplyClosure.objects.filter(descendant_id__in=outside).values_list(
+            'descendant_id', 'ancestor_id', 'depth'
+        )
+        for descendant_id, ancestor_id, depth in links:
+            known[descendant_id].append((ancestor_id, depth))
+
+    return ReplyClosure.objects.bulk_create(closure_rows(pairs, known), batch_size=1000)
+
+
+def descendants(reply_ids, min_depth=1, max_depth=None):
+    """
+    Queryset reply di bawah `reply_ids` dengan min_depth <= depth <= max_depth
+    relatif terhadap reply tersebut (depth 0 = reply itu sendiri).
+    `reply_ids` boleh berupa id, list id, atau queryset .values("id").
+    """
+    if isinstance(reply_ids, int):
+        reply_ids = [reply_ids]
+    depth_filter = {'ancestor_links__depth__gte': min_depth}
+    if max_depth is not None:
+        depth_filter['ancestor_links__depth__lte'] = max_depth
+    return Reply.objects.filter(ancestor_links__ancestor_id__in=reply_ids, **depth_filter)
+
+
+def count_descendants(reply_id):
+    return ReplyClosure.objects.filter(ancestor_id=reply_id, depth__gt=0).count()
+
+
+def delete_subtree(reply_id):
+    """Hapus reply beserta semua turunannya berdasarkan closure, tanpa rekursi."""
+    return Reply.objects.filter(
+        pk__in=ReplyClosure.objects.filter(ancestor_id=reply_id).values('descendant_id')
+    ).delete()
@@ -0,0 +1,50 @@
+# community/feed.py
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from main.pagination import KeysetPaginator, parse_page_size
+from .models import Post, Reply
+
+# Jumlah post per halaman feed (HTML maupun JSON)
+FEED_PAGE_SIZE = 20
+
+FEED_ORDERING = ("-created_at", "-id")
+
+
+def feed_queryset():
+    """
+    Post beserta author, jumlah reply, dan info reply terakhir dalam satu
+    query, tanpa akses per baris. Semua info reply berupa subquery
+    berkorelasi (dilayani reply_post_created_idx), bukan JOIN + GROUP BY,
+    agar halaman feed tetap dibaca urut lewat post_feed_idx tanpa sort.
+    """
+    replies = Reply.objects.filter(post=OuterRef("pk"))
+    latest_reply = replies.order_by("-created_at", "-id")
+    reply_count = replies.order_by().values("post").annotate(count=Count("pk")).values("count")
+    return Post.objects.select_related("author").annotate(
+        reply_count=Coalesce(Subquery(reply_count), Value(0), output_field=IntegerField()),
+        latest_reply_at=Subquery(latest_reply.values("created_at")[:1]),
+        latest_reply_author=Subquery(latest_reply.values("author__username")[:1]),
+    )
+
+
+def feed_page(params):
+    """Satu halaman feed dari query string (?cursor=&limit=)."""
+    page_size = parse_page_size(params.get("limit"), default=FEED_PAGE_SIZE)
+    paginator = KeysetPaginator(feed_queryset(), FEED_ORDERING, page_size)
+    return paginator.page(params.get("cursor"))
+
+
+def serialize_post(post):
+    return {
+        "id": post.id,
+        "author_username": post.author.username,
+        "title": post.title,
+        "description": post.description,
+        "image_url": post.image_url,
+        "created_at": post.created_at.isoformat() if post.created_at else None,
+        "reply_count": post.reply_count,
+        "latest_reply_at": post.latest_reply_at.isoformat() if post.latest_reply_at else None,
+        "latest_reply_author": post.latest_reply_author,
+    }
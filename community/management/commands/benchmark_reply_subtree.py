@@ -0,0 +1,115 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from community.closure import count_descendants, link_replies
+from community.models import Post, Reply
+
+CTE_SQL = (
+    "WITH RECURSIVE tree(id) AS ("
+    " SELECT id FROM community_reply WHERE parent_id = %s"
+    " UNION ALL"
+    " SELECT r.id FROM community_reply r JOIN tree ON r.parent_id = tree.id"
+    ") SELECT id FROM tree"
+)
+
+
+def generate_chain(post, author, depth, width):
+    """
+    Thread sedalam `depth`: setiap level berisi satu reply yang diteruskan
+    ke level berikutnya plus `width - 1` reply daun.
+    """
+    root = Reply.objects.create(post=post, author=author, content="root")
+    parent = root
+    for level in range(depth):
+        batch = Reply.objects.bulk_create([
+            Reply(post=post, author=author, parent=parent, content=f"L{level}-{i}")
+            for i in range(width)
+        ])
+        link_replies(batch)
+        parent = batch[0]
+    return root
+
+
+def adjacency_ids(root_id):
+    # Tanpa closure: satu query per level
+    ids, frontier = [], [root_id]
+    with connection.cursor() as cursor:
+        while frontier:
+            placeholders = ", ".join(["%s"] * len(frontier))
+            cursor.execute(
+                f"SELECT id FROM community_reply WHERE parent_id IN ({placeholders})", frontier
+            )
+            frontier = [row[0] for row in cursor.fetchall()]
+            ids.extend(frontier)
+    return ids
+
+
+def cte_ids(root_id):
+    with connection.cursor() as cursor:
+        cursor.execute(CTE_SQL, [root_id])
+        return [row[0] for row in cursor.fetchall()]
+
+
+CLOSURE_SQL = "SELECT descendant_id FROM community_replyclosure WHERE ancestor_id = %s AND depth > 0"
+
+
+def closure_ids(root_id):
+    with connection.cursor() as cursor:
+        cursor.execute(CLOSURE_SQL, [root_id])
+        return [row[0] for row in cursor.fetchall()]
+
+
+class Command(BaseCommand):
+    help = "Bandingkan pembacaan subtree reply: adjacency per level, recursive CTE, dan closure table."
+
+    # Ketiga metode memakai SQL mentah agar yang dibandingkan hanya biaya query
+
+    def add_arguments(self, parser):
+        parser.add_argument("--depths", type=int, nargs="+", default=[5, 50, 500])
+        parser.add_argument("--width", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def _measure(self, func, repeat):
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = func()
+            elapsed = (time.perf_counter() - start) / repeat
+        return result, elapsed, queries // repeat
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        repeat = options["repeat"]
+        methods = [
+            ("adjacency", adjacency_ids),
+            ("recursive CTE", cte_ids),
+            ("closure", closure_ids),
+        ]
+
+        self.stdout.write(f"{'depth':>6} {'metode':<15} {'reply':>7} {'ms':>9} {'query':>6}")
+        # Data benchmark dibuat di dalam transaksi yang selalu di-rollback
+        with transaction.atomic():
+            author = User.objects.create_user(username="__bench_reply_subtree__")
+            post = Post.objects.create(author=author, title="Benchmark", description="Benchmark")
+
+            for depth in options["depths"]:
+                root = generate_chain(post, author, depth, options["width"])
+                expected = count_descendants(root.id)
+                for label, func in methods:
+                    ids, elapsed, queries = self._measure(lambda: func(root.id), repeat)
+                    if len(ids) != expected:
+                        self.stderr.write(f"{label}: {len(ids)} reply, seharusnya {expected}")
+                    self.stdout.write(
+                        f"{depth:>6} {label:<15} {len(ids):>7} {elapsed * 1000:>9.2f} {queries:>6}"
+                    )
+            transaction.set_rollback(True)
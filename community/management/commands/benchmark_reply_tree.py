@@ -0,0 +1,92 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from community.closure import link_replies
+from community.models import Post, Reply
+from community.reply_tree import load_thread, serialize_reply
+
+
+def generate_thread(post, author, size, branching=3):
+    """
+    Buat `size` reply di bawah `post` dengan bulk_create per level:
+    setiap reply punya paling banyak `branching` balasan.
+    """
+    level = Reply.objects.bulk_create(
+        [Reply(post=post, author=author, content="Reply 0")]
+    )
+    # bulk_create tidak memicu signal, closure diisi manual
+    link_replies(level)
+    created = 1
+    while created < size:
+        batch = []
+        for parent in level:
+            for _ in range(branching):
+                if created + len(batch) >= size:
+                    break
+                batch.append(Reply(
+                    post=post, author=author, parent=parent,
+                    content=f"Reply {created + len(batch)}",
+                ))
+        level = Reply.objects.bulk_create(batch, batch_size=1000)
+        link_replies(level)
+        created += len(level)
+    return created
+
+
+def naive_tree(reply):
+    # Cara lama: satu query per node
+    return {
+        "id": reply.id,
+        "author": reply.author.username,
+        "replies": [naive_tree(child) for child in reply.child_replies.all().order_by("created_at")],
+    }
+
+
+class Command(BaseCommand):
+    help = "Bandingkan loader pohon reply dengan rekursi per node pada thread besar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--replies", type=int, default=10000)
+        parser.add_argument("--branching", type=int, default=3)
+        parser.add_argument("--skip-naive", action="store_true", help="Lewati pengukuran cara lama.")
+
+    def _measure(self, label, func):
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(f"{label:<28} {elapsed * 1000:10.1f} ms  {queries:6d} query")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        # Data benchmark dibuat di dalam transaksi yang selalu di-rollback
+        with transaction.atomic():
+            author = User.objects.create_user(username="__bench_reply_tree__")
+            post = Post.objects.create(author=author, title="Benchmark", description="Benchmark")
+            size = generate_thread(post, author, options["replies"], options["branching"])
+            self.stdout.write(f"Thread berisi {size} reply (branching {options['branching']})")
+
+            self._measure("loader (semua)", lambda: [
+                serialize_reply(r) for r in load_thread(post.id).roots
+            ])
+            self._measure("loader (depth=3)", lambda: [
+                serialize_reply(r) for r in load_thread(post.id, max_depth=3).roots
+            ])
+            self._measure("loader (limit=20, depth=3)", lambda: [
+                serialize_reply(r) for r in load_thread(post.id, max_depth=3, limit=20).roots
+            ])
+            if not options["skip_naive"]:
+                self._measure("rekursi per node (lama)", lambda: [
+                    naive_tree(r) for r in Reply.objects.filter(post=post, parent=None)
+                ])
+            transaction.set_rollback(True)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0005_alter_reply_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplyClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='community.reply')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='community.reply')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor', 'depth'], name='reply_closure_anc_depth_idx'), models.Index(fields=['descendant', 'depth'], name='reply_closure_desc_depth_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='reply_closure_unique_pair')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Isi closure table untuk reply yang sudah ada sebelum tabelnya dibuat.
+
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    Reply = apps.get_model('community', 'Reply')
+    ReplyClosure = apps.get_model('community', 'ReplyClosure')
+
+    children = defaultdict(list)
+    for reply_id, parent_id in Reply.objects.values_list('id', 'parent_id').iterator():
+        children[parent_id].append(reply_id)
+
+    # Telusuri dari reply akar (parent None) ke bawah tanpa rekursi
+    batch = []
+    stack = [(reply_id, []) for reply_id in children[None]]
+    while stack:
+        reply_id, ancestors = stack.pop()
+        chain = [reply_id] + ancestors  # chain[i] adalah ancestor dengan depth i
+        batch.extend(
+            ReplyClosure(ancestor_id=ancestor_id, descendant_id=reply_id, depth=depth)
+            for depth, ancestor_id in enumerate(chain)
+        )
+        if len(batch) >= 1000:
+            ReplyClosure.objects.bulk_create(batch)
+            batch = []
+        stack.extend((child_id, chain) for child_id in children[reply_id])
+    ReplyClosure.objects.bulk_create(batch)
+
+
+def clear(apps, schema_editor):
+    apps.get_model('community', 'ReplyClosure').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0006_reply_closure'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
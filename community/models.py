@@ -9,6 +9,15 @@ class Post(models.Model):
     description = models.TextField() 
     image_url = models.URLField(max_length=500, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Feed community diurutkan (-created_at, -id) dengan keyset pagination
+            models.Index(fields=['-created_at', '-id'], name='post_feed_idx'),
+            # Change feed: keyset (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='post_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -19,6 +28,7 @@ class Reply(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     # 🆕 FITUR BARU: Reply bisa punya parent (reply ke reply)
     parent = models.ForeignKey(
@@ -32,6 +42,12 @@ class Reply(models.Model):
     class Meta:
         ordering = ['created_at']  # Urutkan berdasarkan waktu
         verbose_name_plural = 'Replies'
+        indexes = [
+            # Reply terakhir per post untuk feed
+            models.Index(fields=['post', 'created_at'], name='reply_post_created_idx'),
+            # Change feed: keyset (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='reply_updated_idx'),
+        ]
 
     def __str__(self):
         if self.parent:
@@ -45,4 +61,30 @@ class Reply(models.Model):
     # 🆕 Helper method: Ambil semua nested replies
     def get_nested_replies(self):
         """Rekursif ambil semua child replies"""
-        return self.child_replies.all()
\ No newline at end of file
+        return self.child_replies.all()
+
+
+class ReplyClosure(models.Model):
+    """
+    Closure table untuk pohon reply: satu baris untuk setiap pasangan
+    (ancestor, descendant), termasuk pasangan reply dengan dirinya sendiri
+    (depth 0). Subtree, jumlah turunan, dan hapus subtree cukup satu query
+    berindex tanpa rekursi. Diisi otomatis saat reply dibuat (lihat
+    community/closure.py).
+    """
+    ancestor = models.ForeignKey(Reply, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Reply, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='reply_closure_unique_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['ancestor', 'depth'], name='reply_closure_anc_depth_idx'),
+            models.Index(fields=['descendant', 'depth'], name='reply_closure_desc_depth_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.ancestor_id} -> {self.descendant_id} ({self.depth})'
+
@@ -0,0 +1,172 @@
+# community/reply_tree.py
+
+from collections import defaultdict
+
+from django.db.models import Exists, OuterRef
+
+from main.pagination import KeysetPaginator
+from .closure import descendants
+from .models import Reply
+
+
+class ReplyThread:
+    """Hasil loader: daftar reply akar (sudah berisi `tree_children`) + cursor."""
+
+    def __init__(self, roots, next_cursor=None):
+        self.roots = roots
+        self.next_cursor = next_cursor
+
+
+def _replies(queryset, max_depth):
+    queryset = queryset.select_related("author").order_by("created_at", "id")
+    if max_depth is not None:
+        # Untuk reply di batas kedalaman, client perlu tahu masih ada balasan
+        queryset = queryset.annotate(
+            has_children=Exists(Reply.objects.filter(parent_id=OuterRef("pk")))
+        )
+    return queryset
+
+
+def _fetch(queryset, max_depth):
+    return list(_replies(queryset, max_depth))
+
+
+async def _afetch(queryset, max_depth):
+    return [reply async for reply in _replies(queryset, max_depth)]
+
+
+def assemble(replies, root_ids=None, max_depth=None):
+    """
+    Susun list reply datar (urut created_at) menjadi pohon dalam O(n).
+    Setiap reply mendapat atribut `tree_children` dan `depth` (akar = 0).
+    Jika root_ids kosong, reply yang parent-nya tidak ikut di-fetch
+    dianggap akar.
+    """
+    by_id = {reply.id: reply for reply in replies}
+    children = defaultdict(list)
+    roots = []
+    for reply in replies:
+        reply.tree_children = children[reply.id]
+        is_root = reply.id in root_ids if root_ids is not None else reply.parent_id not in by_id
+        if is_root:
+            roots.append(reply)
+        else:
+            children[reply.parent_id].append(reply)
+
+    # Hitung depth dari akar, iteratif agar thread sangat dalam tidak kena recursion limit
+    stack = [(root, 0) for root in roots]
+    while stack:
+        reply, depth = stack.pop()
+        reply.depth = depth
+        if max_depth is not None and depth >= max_depth:
+            reply.tree_children = []
+            reply.has_more_replies = bool(getattr(reply, "has_children", False))
+            continue
+        reply.has_more_replies = False
+        stack.extend((child, depth + 1) for child in reply.tree_children)
+    return roots
+
+
+def load_thread(post_id, max_depth=None, limit=None, cursor=None):
+    """
+    Pohon reply sebuah post.
+
+    - Tanpa limit: semua reply akar beserta turunannya dalam satu query.
+    - Dengan limit: reply akar dipaginasi keyset (created_at, id), lalu
+      turunannya diambil dengan satu query lewat closure table.
+    - max_depth membatasi kedalaman (0 = hanya reply akar).
+    """
+    if limit is None:
+        if max_depth is None:
+            # Tanpa batas apapun cukup fetch datar berdasarkan post_id
+            replies = _fetch(Reply.objects.filter(post_id=post_id), None)
+        else:
+            roots = Reply.objects.filter(post_id=post_id, parent=None).values("id")
+            replies = _fetch(descendants(roots, min_depth=0, max_depth=max_depth), max_depth)
+        return ReplyThread(assemble(replies, max_depth=max_depth))
+
+    roots_qs = Reply.objects.filter(post_id=post_id, parent=None).values("id", "created_at")
+    page = KeysetPaginator(roots_qs, ("created_at", "id"), limit).page(cursor)
+    root_ids = [row["id"] for row in page.items]
+    if not root_ids:
+        return ReplyThread([], page.next_cursor)
+
+    replies = _fetch(descendants(root_ids, min_depth=0, max_depth=max_depth), max_depth)
+    return ReplyThread(
+        assemble(replies, root_ids=set(root_ids), max_depth=max_depth), page.next_cursor
+    )
+
+
+async def aload_thread(post_id, max_depth=None, limit=None, cursor=None):
+    """Versi async load_thread (ORM async), query yang dijalankan sama."""
+    if limit is None:
+        if max_depth is None:
+            replies = await _afetch(Reply.objects.filter(post_id=post_id), None)
+        else:
+            roots = Reply.objects.filter(post_id=post_id, parent=None).values("id")
+            replies = await _afetch(descendants(roots, min_depth=0, max_depth=max_depth), max_depth)
+        return ReplyThread(assemble(replies, max_depth=max_depth))
+
+    roots_qs = Reply.objects.filter(post_id=post_id, parent=None).values("id", "created_at")
+    page = await KeysetPaginator(roots_qs, ("created_at", "id"), limit).apage(cursor)
+    root_ids = [row["id"] for row in page.items]
+    if not root_ids:
+        return ReplyThread([], page.next_cursor)
+
+    replies = await _afetch(descendants(root_ids, min_depth=0, max_depth=max_depth), max_depth)
+    return ReplyThread(
+        assemble(replies, root_ids=set(root_ids), max_depth=max_depth), page.next_cursor
+    )
+
+
+def load_subtree(reply_id, max_depth=None):
+    """Balasan-balasan di bawah satu reply (tanpa reply itu sendiri)."""
+    # Depth di closure dihitung dari reply_id, anak langsung = 1
+    replies = _fetch(
+        descendants(reply_id, max_depth=None if max_depth is None else max_depth + 1),
+        max_depth,
+    )
+    return assemble(replies, max_depth=max_depth)
+
+
+def attach_top_level_replies(posts):
+    """
+    Untuk halaman community: isi `top_level_replies` setiap post dengan
+    satu query untuk semua post sekaligus.
+    """
+    posts = list(posts)
+    replies = _fetch(Reply.objects.filter(post_id__in=[post.id for post in posts]), None)
+
+    roots_by_post = defaultdict(list)
+    for root in assemble(replies):
+        roots_by_post[root.post_id].append(root)
+    for post in posts:
+        post.top_level_replies = roots_by_post[post.id]
+    return posts
+
+
+def _reply_data(reply):
+    data = {
+        "id": reply.id,
+        "author": reply.author.username,
+        "content": reply.content,
+        "created_at": reply.created_at.isoformat() if reply.created_at else "",
+        "parent_id": reply.parent_id,
+        "replies": [],
+    }
+    if getattr(reply, "has_more_replies", False):
+        data["has_more_replies"] = True
+    return data
+
+
+def serialize_reply(reply):
+    """Format JSON pohon reply untuk Flutter (key anak tetap "replies")."""
+    root = _reply_data(reply)
+    stack = [(reply, root)]
+    while stack:
+        node, data = stack.pop()
+        for child in node.tree_children:
+            child_data = _reply_data(child)
+            data["replies"].append(child_data)
+            stack.append((child, child_data))
+    return root
@@ -0,0 +1,14 @@
+# community/signals.py
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .closure import link_replies
+from .models import Reply
+
+
+@receiver(post_save, sender=Reply)
+def add_reply_to_closure(sender, instance, created, raw=False, **kwargs):
+    """Setiap reply baru langsung tercatat di closure table."""
+    if created and not raw:
+        link_replies([instance])
@@ -1,17 +1,27 @@
 # community/tests.py
 # FOKUS HANYA PADA APP COMMUNITY
 
+from asgiref.sync import sync_to_async
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 import json
+import time
 
 # Import model dari app community
-from .models import Post, Reply
+from .models import Post, Reply, ReplyClosure
+from .closure import closure_rows, count_descendants, delete_subtree, descendants, link_replies
+from .reply_tree import aload_thread, load_subtree, load_thread, serialize_reply
+from .feed import FEED_ORDERING, feed_queryset
+from .management.commands.benchmark_reply_tree import generate_thread
 
 # Import model dari app LAIN yang DIBUTUHKAN untuk setup
 # Kita butuh Profile agar user-nya "valid"
 from accounts.models import Profile 
+from main.pagination import KeysetPaginator, encode_cursor
+from main.query_plans import QueryPlanAssertions, analyze
 
 User = get_user_model()
 
@@ -140,8 +150,8 @@ class CommunityViewsTest(TestCase):
         
         # Cek konteks 'top_level_replies' di view sudah benar
         post_in_context = response.context['posts'][0]
-        self.assertEqual(post_in_context.top_level_replies.count(), 1)
-        self.assertEqual(post_in_context.top_level_replies.first().content, 'Top Reply')
+        self.assertEqual(len(post_in_context.top_level_replies), 1)
+        self.assertEqual(post_in_context.top_level_replies[0].content, 'Top Reply')
     
     def test_create_post_via_form(self):
         """Tes buat post baru (non-AJAX)"""
@@ -399,4 +409,298 @@ class IntegrationTest(TestCase):
         # 4. Delete post
         response = self.client.post(reverse('community:delete_post', args=[post.id]))
         self.assertEqual(response.status_code, 302)
-        self.assertFalse(Post.objects.filter(id=post.id).exists())
\ No newline at end of file
+        self.assertFalse(Post.objects.filter(id=post.id).exists())
+
+class CommunityShowJsonTest(TestCase):
+    def test_show_json_streaming(self):
+        user = User.objects.create_user(username='streamer', password='pass123')
+        for i in range(3):
+            Post.objects.create(author=user, title=f'Post {i}', description='desc')
+        response = Client().get(reverse('community:show_json'))
+        self.assertTrue(response.streaming)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([p['title'] for p in data], ['Post 2', 'Post 1', 'Post 0'])
+        self.assertEqual(data[0]['author_username'], 'streamer')
+
+    async def test_show_json_streaming_async_di_asgi(self):
+        user = await User.objects.acreate(username='streamer')
+        await Post.objects.acreate(author=user, title='Post 0', description='desc')
+        response = await self.async_client.get(reverse('community:show_json'))
+        self.assertTrue(response.is_async)
+        data = json.loads(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual(data[0]['author_username'], 'streamer')
+
+
+class ReplyTreeLoaderTest(TestCase):
+    """Loader pohon reply: jumlah query konstan, batas depth, dan pagination."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tree_user', password='pass123')
+        self.post = Post.objects.create(author=self.user, title='Thread', description='desc')
+        # a -> a1 -> a1x -> a1xy, a -> a2, b
+        self.a = Reply.objects.create(post=self.post, author=self.user, content='a')
+        self.a1 = Reply.objects.create(post=self.post, author=self.user, content='a1', parent=self.a)
+        self.a1x = Reply.objects.create(post=self.post, author=self.user, content='a1x', parent=self.a1)
+        self.a1xy = Reply.objects.create(post=self.post, author=self.user, content='a1xy', parent=self.a1x)
+        self.a2 = Reply.objects.create(post=self.post, author=self.user, content='a2', parent=self.a)
+        self.b = Reply.objects.create(post=self.post, author=self.user, content='b')
+
+    def _contents(self, nodes):
+        return [(n['content'], self._contents(n['replies'])) for n in nodes]
+
+    def test_full_tree_in_one_query(self):
+        with self.assertNumQueries(1):
+            data = [serialize_reply(r) for r in load_thread(self.post.id).roots]
+        self.assertEqual(self._contents(data), [
+            ('a', [('a1', [('a1x', [('a1xy', [])])]), ('a2', [])]),
+            ('b', []),
+        ])
+        self.assertEqual(data[0]['author'], 'tree_user')
+        self.assertEqual(data[0]['replies'][0]['parent_id'], self.a.id)
+
+    def test_max_depth_marks_truncated_nodes(self):
+        with self.assertNumQueries(1):
+            roots = load_thread(self.post.id, max_depth=1).roots
+        data = [serialize_reply(r) for r in roots]
+        self.assertEqual(self._contents(data), [('a', [('a1', []), ('a2', [])]), ('b', [])])
+        self.assertTrue(data[0]['replies'][0]['has_more_replies'])
+        self.assertNotIn('has_more_replies', data[0]['replies'][1])
+
+    def test_root_pagination_with_cursor(self):
+        with self.assertNumQueries(2):
+            first = load_thread(self.post.id, limit=1)
+        self.assertEqual([r.content for r in first.roots], ['a'])
+        self.assertEqual([c.content for c in first.roots[0].tree_children], ['a1', 'a2'])
+
+        second = load_thread(self.post.id, limit=1, cursor=first.next_cursor)
+        self.assertEqual([r.content for r in second.roots], ['b'])
+        self.assertIsNone(second.next_cursor)
+
+    def test_replies_endpoint_params(self):
+        url = reverse('community:show_replies_json_flutter', args=[self.post.id])
+        data = self.client.get(url, {'depth': 0, 'limit': 1}).json()
+        self.assertEqual(self._contents(data), [('a', [])])
+        self.assertTrue(data[0]['has_more_replies'])
+
+        res = self.client.get(url, {'limit': 1})
+        cursor = res['X-Next-Cursor']
+        data = self.client.get(url, {'limit': 1, 'cursor': cursor}).json()
+        self.assertEqual(self._contents(data), [('b', [])])
+
+        self.assertEqual(self.client.get(url, {'depth': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'depth': -1}).status_code, 400)
+
+    async def test_aload_thread_sama_dengan_load_thread(self):
+        def sync_thread():
+            thread = load_thread(self.post.id, max_depth=1, limit=1)
+            return [serialize_reply(r) for r in thread.roots], thread.next_cursor
+
+        expected, cursor = await sync_to_async(sync_thread)()
+        thread = await aload_thread(self.post.id, max_depth=1, limit=1)
+        self.assertEqual([serialize_reply(r) for r in thread.roots], expected)
+        self.assertEqual(thread.next_cursor, cursor)
+
+        full = await aload_thread(self.post.id)
+        self.assertEqual([r.content for r in full.roots], ['a', 'b'])
+
+    async def test_replies_endpoint_di_asgi(self):
+        url = reverse('community:show_replies_json_flutter', args=[self.post.id])
+        data = (await self.async_client.get(url, {'depth': 0, 'limit': 1})).json()
+        self.assertEqual(self._contents(data), [('a', [])])
+
+        missing = reverse('community:show_replies_json_flutter', args=[self.post.id + 1000])
+        self.assertEqual((await self.async_client.get(missing)).status_code, 404)
+        self.assertEqual((await self.async_client.get(url, {'depth': 'abc'})).status_code, 400)
+
+    def test_nested_replies_endpoint_loads_subtree(self):
+        url = reverse('community:show_nested_replies_json_flutter', args=[self.a1.id])
+        data = self.client.get(url).json()
+        self.assertEqual(self._contents(data), [('a1x', [('a1xy', [])])])
+
+        data = self.client.get(url, {'depth': 0}).json()
+        self.assertEqual(self._contents(data), [('a1x', [])])
+
+    def test_community_index_query_count_independent_of_posts(self):
+        self.client.login(username='tree_user', password='pass123')
+        url = reverse('community:community_home')
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        for i in range(10):
+            post = Post.objects.create(author=self.user, title=f'Post {i}', description='desc')
+            parent = Reply.objects.create(post=post, author=self.user, content='r')
+            Reply.objects.create(post=post, author=self.user, content='rr', parent=parent)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+        self.assertContains(response, 'a1xy')
+
+    def test_large_thread_benchmark(self):
+        """Thread 10k reply tetap satu query dan tersusun lengkap."""
+        big_post = Post.objects.create(author=self.user, title='Big', description='desc')
+        size = generate_thread(big_post, self.user, 10000, branching=4)
+
+        start = time.perf_counter()
+        with self.assertNumQueries(1):
+            roots = load_thread(big_post.id).roots
+        data = [serialize_reply(r) for r in roots]
+        elapsed = time.perf_counter() - start
+
+        def count(nodes):
+            return sum(1 + count(n['replies']) for n in nodes)
+
+        self.assertEqual(count(data), size)
+        self.assertLess(elapsed, 5)
+
+
+class ReplyClosureTest(TestCase):
+    """Closure table reply: terisi saat insert, dan dipakai untuk subtree/hapus."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='closure_user', password='pass123')
+        self.post = Post.objects.create(author=self.user, title='Closure', description='desc')
+        self.root = Reply.objects.create(post=self.post, author=self.user, content='root')
+        self.child = Reply.objects.create(post=self.post, author=self.user, content='child', parent=self.root)
+        self.grandchild = Reply.objects.create(post=self.post, author=self.user, content='gc', parent=self.child)
+        self.sibling = Reply.objects.create(post=self.post, author=self.user, content='sibling', parent=self.root)
+
+    def test_closure_rows_created_on_insert(self):
+        links = set(ReplyClosure.objects.filter(descendant=self.grandchild).values_list('ancestor_id', 'depth'))
+        self.assertEqual(links, {(self.grandchild.id, 0), (self.child.id, 1), (self.root.id, 2)})
+        self.assertEqual(ReplyClosure.objects.count(), 1 + 2 + 3 + 2)
+
+    def test_reply_created_via_view_is_linked(self):
+        self.client.login(username='closure_user', password='pass123')
+        self.client.post(
+            reverse('community:add_nested_reply', args=[self.grandchild.id]),
+            {'content': 'lewat view'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        new_reply = Reply.objects.get(content='lewat view')
+        self.assertEqual(
+            ReplyClosure.objects.get(ancestor=self.root, descendant=new_reply).depth, 3
+        )
+
+    def test_bulk_created_replies_can_be_linked(self):
+        level = Reply.objects.bulk_create([
+            Reply(post=self.post, author=self.user, content=f'bulk {i}', parent=self.grandchild)
+            for i in range(3)
+        ])
+        link_replies(level)
+        self.assertEqual(count_descendants(self.root.id), 6)
+        self.assertEqual(count_descendants(self.child.id), 4)
+
+    def test_subtree_queries_use_single_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(count_descendants(self.root.id), 3)
+        with self.assertNumQueries(1):
+            ids = set(descendants(self.root.id, max_depth=1).values_list('id', flat=True))
+        self.assertEqual(ids, {self.child.id, self.sibling.id})
+        with self.assertNumQueries(1):
+            subtree = load_subtree(self.root.id)
+        self.assertEqual([r.content for r in subtree], ['child', 'sibling'])
+        self.assertEqual([r.content for r in subtree[0].tree_children], ['gc'])
+
+    def test_delete_subtree_removes_descendants_and_links(self):
+        delete_subtree(self.child.id)
+        self.assertEqual(
+            set(Reply.objects.values_list('content', flat=True)), {'root', 'sibling'}
+        )
+        self.assertFalse(ReplyClosure.objects.filter(descendant_id=self.grandchild.id).exists())
+        self.assertEqual(count_descendants(self.root.id), 1)
+
+    def test_closure_rows_match_backfill_walk(self):
+        # Hasil closure_rows untuk data yang sama harus identik dengan yang dibuat signal
+        pairs = list(Reply.objects.order_by('id').values_list('id', 'parent_id'))
+        expected = {(r.ancestor_id, r.descendant_id, r.depth) for r in closure_rows(pairs)}
+        actual = set(ReplyClosure.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+        self.assertEqual(expected, actual)
+
+
+class CommunityFeedPaginationTest(TestCase):
+    """Feed community: keyset pagination dengan kontrak cursor yang sama untuk HTML dan Flutter."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='feed_user', password='pass123')
+        self.other = User.objects.create_user(username='feed_other', password='pass123')
+        self.posts = [
+            Post.objects.create(author=self.user, title=f'Feed {i}', description='desc')
+            for i in range(5)
+        ]
+        first = Reply.objects.create(post=self.posts[0], author=self.user, content='r1')
+        Reply.objects.create(post=self.posts[0], author=self.other, content='r2', parent=first)
+        self.url = reverse('community:show_json_flutter')
+
+    def test_json_feed_annotations(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual([p['title'] for p in data], [f'Feed {i}' for i in range(4, -1, -1)])
+        oldest = data[-1]
+        self.assertEqual(oldest['reply_count'], 2)
+        self.assertEqual(oldest['latest_reply_author'], 'feed_other')
+        self.assertIsNotNone(oldest['latest_reply_at'])
+        self.assertEqual(data[0]['reply_count'], 0)
+        self.assertIsNone(data[0]['latest_reply_author'])
+        self.assertEqual(data[0]['author_username'], 'feed_user')
+
+    def test_json_feed_single_query_regardless_of_size(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'limit': 100})
+        for i in range(30):
+            post = Post.objects.create(author=self.other, title=f'More {i}', description='desc')
+            Reply.objects.create(post=post, author=self.user, content='r')
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url, {'limit': 100}).json()
+        self.assertEqual(len(data), 35)
+
+    def test_cursor_walks_every_post_once(self):
+        seen, params = [], {'limit': 2}
+        while True:
+            res = self.client.get(self.url, params)
+            seen.extend(p['id'] for p in res.json())
+            if 'X-Next-Cursor' not in res:
+                break
+            params['cursor'] = res['X-Next-Cursor']
+        self.assertEqual(seen, [p.id for p in reversed(self.posts)])
+
+    def test_html_uses_same_cursor_contract(self):
+        self.client.login(username='feed_user', password='pass123')
+        res = self.client.get(reverse('community:community_home'), {'limit': 2})
+        self.assertEqual([p.title for p in res.context['posts']], ['Feed 4', 'Feed 3'])
+        self.assertIn('X-Next-Cursor', res)
+        self.assertContains(res, 'id="load-more-posts"')
+
+        # Cursor dari halaman HTML bisa dipakai di endpoint JSON dan sebaliknya
+        data = self.client.get(self.url, {'limit': 2, 'cursor': res['X-Next-Cursor']}).json()
+        self.assertEqual([p['title'] for p in data], ['Feed 2', 'Feed 1'])
+        res = self.client.get(self.url, {'limit': 4})
+        html = self.client.get(reverse('community:community_home'), {'cursor': res['X-Next-Cursor']})
+        self.assertEqual([p.title for p in html.context['posts']], ['Feed 0'])
+        self.assertIsNone(html.context['next_page_url'])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'rusak'}).status_code, 400)
+        self.client.login(username='feed_user', password='pass123')
+        res = self.client.get(reverse('community:community_home'), {'cursor': 'rusak'})
+        self.assertRedirects(res, reverse('community:community_home'))
+
+
+class CommunityQueryPlanTest(QueryPlanAssertions, TestCase):
+    """EXPLAIN feed post dan reply per post pada data seeded."""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(username="qp_community", password="12345")
+        posts = Post.objects.bulk_create([
+            Post(author=author, title=f"Post {i}", description="QP") for i in range(2000)
+        ])
+        Reply.objects.bulk_create([
+            Reply(post=posts[i % 2000], author=author, content="QP") for i in range(6000)
+        ])
+        analyze()
+        cls.post = posts[10]
+
+    def test_feed_page(self):
+        paginator = KeysetPaginator(feed_queryset(), FEED_ORDERING, page_size=20)
+        self.assertUsesIndex(paginator.page_queryset())
+        self.assertUsesIndex(paginator.page_queryset(encode_cursor([self.post.created_at, self.post.id])))
+
+    def test_replies_of_post(self):
+        self.assertUsesIndex(Reply.objects.filter(post=self.post).order_by("created_at", "id"))
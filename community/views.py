@@ -1,7 +1,14 @@
 import json
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import aget_object_or_404, render, get_object_or_404, redirect
 from django.http import HttpResponseNotAllowed, HttpResponseForbidden, JsonResponse
 from .models import Post, Reply
+from main.streaming import StreamingJsonResponse, values_for
+from main.pagination import (
+    InvalidCursor, KeysetPage, keyset_json_response, next_page_url, parse_page_size,
+    set_next_cursor_headers,
+)
+from .feed import feed_page, serialize_post
+from .reply_tree import aload_thread, attach_top_level_replies, load_subtree, serialize_reply
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
 from django.utils import timezone
@@ -58,12 +65,19 @@ def community_index(request):
             if is_json or request.headers.get('Content-Type') == 'application/json':
                 return JsonResponse({"status": "error", "message": "Title dan Description harus diisi!"}, status=400)
 
-    posts = Post.objects.all().order_by('-created_at')
-    # Ambil hanya reply top-level untuk halaman utama
-    for post in posts:
-        post.top_level_replies = post.replies.filter(parent=None).order_by('created_at')
+    try:
+        page = feed_page(request.GET)
+    except InvalidCursor:
+        return redirect('community:community_home')
+
+    # Semua reply untuk post di halaman ini diambil sekaligus lalu disusun jadi pohon
+    posts = attach_top_level_replies(page.items)
 
-    return render(request, 'community/index.html', {'posts': posts})
+    response = render(request, 'community/index.html', {
+        'posts': posts,
+        'next_page_url': next_page_url(request, page.next_cursor) if page.has_next else None,
+    })
+    return set_next_cursor_headers(response, request, page)
 
 # --- VIEW ADD_REPLY (Updated for Flutter JSON Support) ---
 @login_required
@@ -191,19 +205,22 @@ def delete_post(request, post_id):
     return HttpResponseNotAllowed(['POST'])
 
 # --- VIEW Show JSON (NEW) ---
-def show_json(request):
-    posts = Post.objects.all().order_by('-created_at')
-    data = []
-    for post in posts:
-        data.append({
-            "id": post.id,
-            "author_username": post.author.username,
-            "title": post.title,
-            "description": post.description,
-            "image_url": post.image_url,
-            "created_at": post.created_at.isoformat() if post.created_at else None,
-        })
-    return JsonResponse(data, safe=False)
+async def show_json(request):
+    # author__username di-join langsung, hasil di-stream per batch
+    posts = values_for(
+        request,
+        Post.objects.order_by('-created_at', '-id'),
+        ('id', 'author__username', 'title', 'description', 'image_url', 'created_at'),
+        transform=lambda post: {
+            "id": post['id'],
+            "author_username": post['author__username'],
+            "title": post['title'],
+            "description": post['description'],
+            "image_url": post['image_url'],
+            "created_at": post['created_at'].isoformat() if post['created_at'] else None,
+        },
+    )
+    return StreamingJsonResponse(posts)
 
 # --- VIEW Show JSON by ID (NEW) ---
 def show_json_by_id(request, id):
@@ -339,47 +356,55 @@ def add_nested_reply_flutter(request, reply_id):
             return JsonResponse({"status": "error", "message": str(e)}, status=500)
     return JsonResponse({"status": "error", "message": "Invalid method"}, status=401)
 
+# Feed untuk Flutter: kontrak cursor sama dengan halaman HTML (?cursor=&limit=,
+# header X-Next-Cursor/Link), body tetap array post.
 def show_json_flutter(request):
-    data = Post.objects.all().order_by('-created_at')
-    # Use existing show_json logic or custom serializer
-    return show_json(request)
+    try:
+        page = feed_page(request.GET)
+    except InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return keyset_json_response(request, page, [serialize_post(post) for post in page.items])
 
 def show_json_by_id_flutter(request, id):
     return show_json_by_id(request, id)
 
 
 
-# --- 1. Helper Function (WAJIB ADA) ---
-def serialize_reply_tree(reply):
-    data = {
-        "id": reply.id,
-        "author": reply.author.username,
-        "content": reply.content,
-        "created_at": reply.created_at.isoformat() if reply.created_at else "",
-        "parent_id": reply.parent.id if reply.parent else None,
-        # KUNCI UTAMA: Key harus "replies" agar dibaca Flutter
-        "replies": [] 
-    }
-    
-    # Logic Aman: Cek apakah pakai 'replies', 'child_replies', atau 'reply_set'
-    # Supaya tidak error apapun settingan models.py kamu
-    children = getattr(reply, 'replies', getattr(reply, 'child_replies', getattr(reply, 'reply_set', None))).all().order_by('created_at')
-    
-    for child in children:
-        data["replies"].append(serialize_reply_tree(child))
-        
-    return data
+# --- Helper: baca parameter ?depth= / ?limit= ---
+def _optional_int(request, name):
+    value = request.GET.get(name)
+    if value in (None, ""):
+        return None
+    number = int(value)
+    if number < 0:
+        raise ValueError(f"Parameter {name} tidak boleh negatif.")
+    return number
 
-# --- 2. Main View ---
-def show_replies_json_flutter(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    # Ambil HANYA reply induk (parent=None)
-    replies = Reply.objects.filter(post=post, parent=None).order_by('created_at')
-    data = [serialize_reply_tree(r) for r in replies]
-    return JsonResponse(data, safe=False)
+
+# --- Pohon reply sebuah post ---
+# Semua reply diambil dengan satu query (atau dua jika reply akar dipaginasi)
+# lalu disusun di Python, bukan satu query per node.
+# Opsional: ?depth=N membatasi kedalaman, ?limit=N&cursor=... memaginasi reply akar.
+async def show_replies_json_flutter(request, post_id):
+    post = await aget_object_or_404(Post, id=post_id)
+    try:
+        max_depth = _optional_int(request, 'depth')
+        limit = _optional_int(request, 'limit')
+        if limit is not None:
+            limit = parse_page_size(limit)
+        thread = await aload_thread(post.id, max_depth=max_depth, limit=limit, cursor=request.GET.get('cursor'))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    data = [serialize_reply(r) for r in thread.roots]
+    return keyset_json_response(request, KeysetPage(data, thread.next_cursor), data)
 
 def show_nested_replies_json_flutter(request, reply_id):
     parent_reply = get_object_or_404(Reply, id=reply_id)
-    children = getattr(parent_reply, 'replies', getattr(parent_reply, 'child_replies', getattr(parent_reply, 'reply_set', None))).all().order_by('created_at')
-    data = [serialize_reply_tree(child) for child in children]
-    return JsonResponse(data, safe=False)
\ No newline at end of file
+    try:
+        max_depth = _optional_int(request, 'depth')
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    data = [serialize_reply(child) for child in load_subtree(parent_reply.id, max_depth=max_depth)]
+    return JsonResponse(data, safe=False)
@@ -0,0 +1,154 @@
+# events/broker.py
+"""
+Pub/sub untuk push event ke client (SSE dan long-polling).
+
+Backend dipilih lewat settings EVENTS_BROKER (dotted path). Default-nya
+InProcessBroker: event hanya tersebar di dalam satu proses worker, jadi
+deployment dengan banyak worker perlu backend lain (misalnya Redis pub/sub)
+yang mengimplementasikan antarmuka Broker yang sama.
+"""
+
+import asyncio
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict
+    # None: semua user login. Selain itu hanya admin dari klub-klub ini.
+    clubs: frozenset = None
+
+    def visible_to(self, club_id):
+        return self.clubs is None or club_id in self.clubs
+
+
+class Broker:
+    """
+    Antarmuka backend. Id event naik terus; subscriber menyimpan id terakhir
+    yang sudah dibaca dan meminta event setelahnya.
+    """
+
+    def publish(self, type, data, clubs=None):
+        """Sebarkan event, mengembalikan Event yang dibuat."""
+        raise NotImplementedError
+
+    def since(self, after):
+        """
+        (events setelah id `after`, lengkap?, id terakhir). `lengkap` False
+        jika sebagian event sudah hilang dari buffer atau `after` tidak
+        dikenal (misalnya worker baru restart); client harus sync ulang.
+        """
+        raise NotImplementedError
+
+    def wait(self, after, timeout):
+        """Blok sampai ada event setelah `after` atau `timeout` detik lewat."""
+        raise NotImplementedError
+
+    async def wait_async(self, after, timeout):
+        """Seperti wait() tanpa memakai thread, untuk view ASGI."""
+        raise NotImplementedError
+
+
+class InProcessBroker(Broker):
+    """
+    Buffer event terakhir di memori (EVENTS_BUFFER_SIZE). Subscriber sync
+    menunggu di threading.Condition; subscriber async menunggu asyncio.Event
+    yang di-set dari thread publisher lewat call_soon_threadsafe, sehingga
+    ribuan koneksi idle tidak memakan satu thread pun.
+    """
+
+    def __init__(self, buffer_size=None):
+        self._events = deque(maxlen=buffer_size or settings.EVENTS_BUFFER_SIZE)
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._condition = threading.Condition()
+        self._async_waiters = set()
+
+    def publish(self, type, data, clubs=None):
+        with self._condition:
+            event = Event(next(self._ids), type, data, frozenset(clubs) if clubs is not None else None)
+            self._events.append(event)
+            self._last_id = event.id
+            self._condition.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, flag in waiters:
+            try:
+                loop.call_soon_threadsafe(flag.set)
+            except RuntimeError:
+                # Event loop subscriber sudah ditutup
+                pass
+        return event
+
+    def since(self, after):
+        with self._condition:
+            last_id = self._last_id
+            events = []
+            for event in reversed(self._events):
+                if event.id <= after:
+                    break
+                events.append(event)
+        events.reverse()
+        if after > last_id:
+            complete = False
+        else:
+            complete = not events or events[0].id == after + 1
+        return events, complete, last_id
+
+    def wait(self, after, timeout):
+        with self._condition:
+            self._condition.wait_for(lambda: self._last_id != after, timeout)
+
+    async def wait_async(self, after, timeout):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._condition:
+            if self._last_id != after:
+                return
+            self._async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                self._async_waiters.discard(waiter)
+
+    @property
+    def subscriber_count(self):
+        return len(self._async_waiters)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
+
+
+def reset_broker():
+    """Buang broker saat ini (dipakai test dan saat settings berubah)."""
+    global _broker
+    with _broker_lock:
+        _broker = None
+
+
+def publish_on_commit(type, data, clubs=None):
+    """
+    Publish setelah transaksi yang sedang berjalan commit, agar client tidak
+    menerima event untuk perubahan yang akhirnya di-rollback.
+    """
+    transaction.on_commit(lambda: get_broker().publish(type, data, clubs))
@@ -0,0 +1,44 @@
+# events/signals.py
+
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from player_transaction.models import Negotiation
+from rumors.models import Rumors
+
+from .broker import publish_on_commit
+
+
+@receiver(post_save, sender=Negotiation)
+def publish_negotiation_created(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    publish_on_commit(
+        "negotiation.created",
+        {
+            "id": instance.pk,
+            "player_id": str(instance.player_id),
+            "from_club_id": instance.from_club_id,
+            "to_club_id": instance.to_club_id,
+            "offered_price": float(instance.offered_price),
+        },
+        clubs={instance.from_club_id, instance.to_club_id},
+    )
+
+
+@receiver(post_init, sender=Rumors)
+def remember_rumor_status(sender, instance, **kwargs):
+    instance._published_status = instance.status if instance.pk else None
+
+
+@receiver(post_save, sender=Rumors)
+def publish_rumor_status_changed(sender, instance, created, raw=False, **kwargs):
+    """Status rumor berubah di banyak view (web dan Flutter); semuanya lewat save()."""
+    previous = instance._published_status
+    instance._published_status = instance.status
+    if created or raw or previous == instance.status:
+        return
+    publish_on_commit(
+        "rumor.status_changed",
+        {"rumor_id": str(instance.pk), "status": instance.status, "previous": previous},
+    )
@@ -0,0 +1,62 @@
+# events/stream.py
+"""Format Server-Sent Events dan generator body untuk view stream."""
+
+import json
+
+from django.conf import settings
+
+# Dikirim saat event yang belum dibaca client sudah hilang dari buffer:
+# client harus memuat ulang data lewat REST / change feed.
+RESET = "event: sync.reset\ndata: {}\n\n"
+
+
+def format_event(event):
+    return f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data)}\n\n"
+
+
+def format_position(last_id):
+    # Baris id tanpa data tidak memicu event di EventSource, tapi tetap
+    # mengganti Last-Event-ID yang dikirim saat reconnect.
+    return f"id: {last_id}\n\n"
+
+
+def collect(broker, club_id, after):
+    """SSE untuk event setelah `after` yang boleh dilihat klub ini, dan posisi baru."""
+    events, complete, last_id = broker.since(after)
+    parts = [] if complete else [RESET]
+    parts.extend(format_event(event) for event in events if event.visible_to(club_id))
+    return "".join(parts), last_id
+
+
+async def stream_async(broker, club_id, after, heartbeat=None):
+    """
+    Stream tanpa batas untuk ASGI. Menunggu di event loop (tanpa thread);
+    komentar heartbeat menjaga koneksi tetap hidup di balik proxy.
+    """
+    heartbeat = heartbeat or settings.EVENTS_HEARTBEAT_SECONDS
+    yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+    while True:
+        chunk, last_id = collect(broker, club_id, after)
+        if chunk:
+            yield chunk + format_position(last_id)
+        elif last_id != after:
+            yield format_position(last_id)
+        after = last_id
+        await broker.wait_async(after, heartbeat)
+        if broker.since(after)[2] == after:
+            yield ": ping\n\n"
+
+
+def stream_long_poll(broker, club_id, after, timeout=None):
+    """
+    Fallback WSGI: satu response per batch event. Menunggu paling lama
+    `timeout` detik lalu menutup koneksi; EventSource reconnect sendiri
+    dengan Last-Event-ID sehingga tidak ada event yang terlewat.
+    """
+    timeout = timeout or settings.EVENTS_LONG_POLL_SECONDS
+    yield "retry: 0\n\n"
+    chunk, last_id = collect(broker, club_id, after)
+    if not chunk:
+        broker.wait(last_id, timeout)
+        chunk, last_id = collect(broker, club_id, after)
+    yield chunk + format_position(last_id)
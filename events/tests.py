@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import Profile
+from events.broker import InProcessBroker, get_broker, reset_broker
+from events.stream import RESET, collect
+from main.models import Club, Player
+from player_transaction.models import Negotiation
+from player_transaction.transfers import execute_transfer
+from rumors.models import Rumors
+
+User = get_user_model()
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    def test_since_dan_deteksi_event_hilang(self):
+        broker = InProcessBroker(buffer_size=3)
+        for i in range(5):
+            broker.publish("player.listed", {"i": i})
+
+        events, complete, last_id = broker.since(2)
+        self.assertEqual([e.id for e in events], [3, 4, 5])
+        self.assertTrue(complete)
+        self.assertEqual(last_id, 5)
+
+        self.assertFalse(broker.since(0)[1])  # event 1-2 sudah keluar dari buffer
+        self.assertFalse(broker.since(99)[1])  # id dari proses sebelum restart
+        self.assertEqual(broker.since(5), ([], True, 5))
+
+    def test_event_klub_hanya_untuk_klub_terkait(self):
+        broker = InProcessBroker()
+        broker.publish("negotiation.created", {"id": 1}, clubs={1, 2})
+        broker.publish("player.sold", {"player_id": "x"})
+
+        chunk, _ = collect(broker, 3, 0)
+        self.assertNotIn("negotiation.created", chunk)
+        self.assertIn("event: player.sold", chunk)
+        self.assertIn("negotiation.created", collect(broker, 2, 0)[0])
+        self.assertTrue(collect(broker, None, 99)[0].startswith(RESET))
+
+    def test_wait_async_dibangunkan_dari_thread_lain(self):
+        broker = InProcessBroker()
+
+        async def scenario():
+            waiter = asyncio.create_task(broker.wait_async(0, timeout=5))
+            while not broker.subscriber_count:
+                await asyncio.sleep(0)
+            await asyncio.to_thread(broker.publish, "player.listed", {})
+            await asyncio.wait_for(waiter, 1)
+
+        asyncio.run(scenario())
+        self.assertEqual(broker.subscriber_count, 0)
+
+
+class EventEndpointTests(TestCase):
+    def setUp(self):
+        reset_broker()
+        self.addCleanup(reset_broker)
+        Club.objects.all().delete()
+        self.seller = Club.objects.create(name="Chelsea")
+        self.buyer = Club.objects.create(name="Arsenal")
+        self.player = Player.objects.create(
+            nama_pemain="Cole Palmer", current_club=self.seller, position="AM",
+            market_value=90_000_000, sedang_dijual=True,
+        )
+        self.admin = User.objects.create_user(username="chelsea_events", password="12345", is_club_admin=True)
+        Profile.objects.create(user=self.admin, managed_club=self.seller)
+        self.client.force_login(self.admin)
+
+    def poll(self, after=0, **params):
+        response = self.client.get(reverse("events:event_poll_json"), {"after": after, "timeout": 0, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_transfer_lewat_negosiasi_mempublish_event(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            nego = Negotiation.objects.create(
+                from_club=self.buyer, to_club=self.seller, player=self.player, offered_price=1,
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            execute_transfer(self.player.id, self.buyer, negotiation=nego)
+
+        data = self.poll()
+        self.assertEqual(
+            [e["type"] for e in data["events"]],
+            ["negotiation.created", "player.sold", "negotiation.responded"],
+        )
+        self.assertEqual(data["events"][2]["data"]["status"], "accepted")
+        self.assertEqual(self.poll(data["last_id"])["events"], [])
+
+    def test_negosiasi_klub_lain_tidak_terlihat(self):
+        other = Club.objects.create(name="Liverpool")
+        with self.captureOnCommitCallbacks(execute=True):
+            Negotiation.objects.create(from_club=self.buyer, to_club=other, player=self.player, offered_price=1)
+        data = self.poll()
+        self.assertEqual(data["events"], [])
+        self.assertEqual(data["last_id"], 1)
+
+    def test_perubahan_status_rumor(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rumor = Rumors.objects.create(
+                author=self.admin, pemain=self.player, club_asal=self.seller, club_tujuan=self.buyer,
+            )
+        rumor = Rumors.objects.get(pk=rumor.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            rumor.save()
+            rumor.status = "verified"
+            rumor.save()
+
+        events = self.poll()["events"]
+        self.assertEqual([e["type"] for e in events], ["rumor.status_changed"])
+        self.assertEqual(events[0]["data"]["previous"], "pending")
+
+    def test_jual_pemain_mempublish_player_listed(self):
+        Player.objects.filter(pk=self.player.pk).update(sedang_dijual=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("player_transaction:jual_pemain_ajax", args=[self.player.id]))
+        self.assertEqual([e["type"] for e in self.poll()["events"]], ["player.listed"])
+
+    def test_stream_wsgi_satu_batch_dengan_last_event_id(self):
+        get_broker().publish("player.listed", {"player_id": "a"})
+        get_broker().publish("player.sold", {"player_id": "a"})
+
+        response = self.client.get(reverse("events:event_stream"), HTTP_LAST_EVENT_ID="1")
+        body = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertNotIn("player.listed", body)
+        self.assertIn('event: player.sold\ndata: {"player_id": "a"}', body)
+        self.assertTrue(body.endswith("id: 2\n\n"))
+
+    @override_settings(EVENTS_LONG_POLL_SECONDS=0.05)
+    def test_stream_wsgi_tanpa_event_ditutup_setelah_timeout(self):
+        response = self.client.get(reverse("events:event_stream"))
+        self.assertEqual(b"".join(response.streaming_content).decode(), "retry: 0\n\nid: 0\n\n")
+
+    def test_parameter_tidak_valid(self):
+        response = self.client.get(reverse("events:event_poll_json"), {"after": "x"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", json.loads(response.content))
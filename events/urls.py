@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'events'
+
+urlpatterns = [
+    path('stream/', views.event_stream, name='event_stream'),
+    path('poll/', views.event_poll_json, name='event_poll_json'),
+]
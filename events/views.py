@@ -0,0 +1,80 @@
+# events/views.py
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from rumors.feed import managed_club_id_for
+
+from .broker import get_broker
+from .stream import stream_async, stream_long_poll
+
+
+def _start_id(request, broker):
+    """Posisi awal: header Last-Event-ID, ?after=, atau event terbaru (hanya event baru)."""
+    value = request.headers.get("Last-Event-ID") or request.GET.get("after")
+    if value in (None, ""):
+        return broker.since(0)[2]
+    return int(value)
+
+
+@login_required(login_url='/accounts/login/')
+@require_GET
+def event_stream(request):
+    """
+    Server-Sent Events: negotiation.created dan negotiation.responded (hanya
+    untuk klub yang terlibat), player.listed, player.sold, rumor.status_changed.
+
+    Di ASGI koneksi dibiarkan terbuka. Di WSGI setiap koneksi hanya
+    menunggu satu batch (long-polling) agar worker tidak tertahan selamanya.
+    """
+    broker = get_broker()
+    try:
+        after = _start_id(request, broker)
+    except ValueError:
+        return JsonResponse({"error": "Last-Event-ID harus berupa angka."}, status=400)
+    club_id = managed_club_id_for(request.user)
+
+    if isinstance(request, ASGIRequest):
+        content = stream_async(broker, club_id, after)
+    else:
+        content = stream_long_poll(broker, club_id, after)
+
+    response = StreamingHttpResponse(content, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Nginx tidak boleh mem-buffer stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required(login_url='/accounts/login/')
+@require_GET
+def event_poll_json(request):
+    """
+    Long-polling JSON untuk client tanpa EventSource (Flutter):
+    /events/poll/?after=<last_id>&timeout=25. Mengembalikan event baru,
+    last_id untuk poll berikutnya, dan reset jika client harus sync ulang.
+    """
+    broker = get_broker()
+    try:
+        after = _start_id(request, broker)
+        timeout = min(float(request.GET.get("timeout", settings.EVENTS_LONG_POLL_SECONDS)),
+                      settings.EVENTS_LONG_POLL_SECONDS)
+    except ValueError:
+        return JsonResponse({"error": "Parameter after dan timeout harus berupa angka."}, status=400)
+    club_id = managed_club_id_for(request.user)
+
+    events, complete, last_id = broker.since(after)
+    if complete and not events and timeout > 0:
+        broker.wait(after, timeout)
+        events, complete, last_id = broker.since(after)
+
+    return JsonResponse({
+        "events": [
+            {"id": e.id, "type": e.type, "data": e.data} for e in events if e.visible_to(club_id)
+        ],
+        "last_id": last_id,
+        "reset": not complete,
+    })
@@ -0,0 +1,48 @@
+# main/conditional.py
+"""
+Conditional GET (ETag / Last-Modified) untuk API JSON read-only.
+
+Validator diambil dari counter versi di cache (lihat versioning.py), bukan
+dari hash body, sehingga request dengan If-None-Match/If-Modified-Since yang
+masih cocok dijawab 304 tanpa menjalankan query utama.
+
+Counter hanya valid jika semua worker berbagi cache yang sama. Dengan
+VERSION_VALIDATORS_ENABLED = False (default di production tanpa CACHE_DIR,
+karena LocMem per proses) fungsi validator mengembalikan None dan view
+selalu menjawab 200 seperti biasa.
+"""
+
+from django.conf import settings
+from django.views.decorators.http import condition
+
+from .versioning import ROSTER, get_version, get_version_changed_at, get_version_epoch
+
+
+def version_etag(*names):
+    """Fungsi ETag dari satu atau beberapa counter versi, misalnya "roster-1f2e3d4c-12"."""
+    def etag(request, *args, **kwargs):
+        if not settings.VERSION_VALIDATORS_ENABLED:
+            return None
+        return "-".join(f"{name}-{get_version_epoch(name)}-{get_version(name)}" for name in names)
+    return etag
+
+
+def version_last_modified(*names):
+    def last_modified(request, *args, **kwargs):
+        if not settings.VERSION_VALIDATORS_ENABLED:
+            return None
+        return max(get_version_changed_at(name) for name in names)
+    return last_modified
+
+
+def version_condition(*names):
+    """
+    Decorator view: ETag dan Last-Modified dari counter versi `names`.
+    Body hanya bergantung pada URL dan data yang dilindungi counter tersebut.
+    """
+    return condition(etag_func=version_etag(*names), last_modified_func=version_last_modified(*names))
+
+
+# Untuk endpoint yang hanya membaca Club/Player
+roster_condition = version_condition(ROSTER)
+roster_etag = version_etag(ROSTER)
@@ -0,0 +1,80 @@
+# main/homepage.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+
+from .models import Club, Player
+from .versioning import get_roster_version
+
+# Jumlah pemain termahal per klub yang ditampilkan di homepage
+DEFAULT_TOP_PLAYERS = 4
+
+# Lama cache homepage (detik). Invalidasi utama tetap lewat roster version.
+DEFAULT_CACHE_TIMEOUT = 60 * 60
+
+
+def _get_top_n(top_n=None):
+    if top_n is None:
+        top_n = getattr(settings, "HOMEPAGE_TOP_PLAYERS", DEFAULT_TOP_PLAYERS)
+    return top_n
+
+
+def get_cache_timeout():
+    return getattr(settings, "HOMEPAGE_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def get_top_players_per_club(top_n=None):
+    """
+    Queryset pemain yang sudah diberi peringkat per klub dengan
+    ROW_NUMBER() OVER (PARTITION BY current_club_id ORDER BY market_value DESC),
+    lalu difilter hanya N teratas. Django membungkus window function ini
+    dalam subquery sehingga hasilnya tetap satu query.
+    """
+    top_n = _get_top_n(top_n)
+
+    return (
+        Player.objects.annotate(
+            club_rank=Window(
+                expression=RowNumber(),
+                partition_by=F("current_club_id"),
+                order_by=[F("market_value").desc(), F("nama_pemain").asc()],
+            )
+        )
+        .filter(club_rank__lte=top_n)
+        .order_by("current_club_id", "club_rank")
+    )
+
+
+def get_featured_clubs_data(top_n=None):
+    """
+    Data homepage: semua klub non-Admin beserta N pemain termahalnya.
+    Selalu dua query (klub + pemain) berapa pun jumlah klubnya.
+    """
+    clubs = (
+        Club.objects.exclude(name__iexact="Admin")
+        .order_by("name")
+        .prefetch_related(
+            Prefetch(
+                "players",
+                queryset=get_top_players_per_club(top_n),
+                to_attr="top_players",
+            )
+        )
+    )
+
+    return [{"club": club, "top_players": club.top_players} for club in clubs]
+
+
+def get_cached_featured_clubs_data(top_n=None):
+    """
+    Versi ter-cache dari get_featured_clubs_data. Cache key memuat roster
+    version, jadi begitu ada Player/Club yang berubah key lama tidak
+    dipakai lagi dan data dihitung ulang.
+    """
+    top_n = _get_top_n(top_n)
+    key = f"homepage:featured:v{get_roster_version()}:top{top_n}"
+    return cache.get_or_set(
+        key, lambda: get_featured_clubs_data(top_n), get_cache_timeout()
+    )
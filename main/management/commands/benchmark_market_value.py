@@ -0,0 +1,62 @@
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from main.market_value import SUFFIX_MULTIPLIERS, parse_market_values
+
+SUFFIXES = ["Mlyr.", "Jt", "Rb", "M", "JT"]
+
+NAIVE_PATTERN = re.compile(r"^\s*(?:rp\.?\s*)?(\d[\d.,]*)\s*([a-z]*)\.?\s*$")
+
+
+def generate_values(count, unique, seed=0):
+    """`count` string nilai pasar acak dengan `unique` nilai berbeda."""
+    rng = np.random.default_rng(seed)
+    whole = rng.integers(1, 2000, unique)
+    cents = rng.integers(0, 100, unique)
+    suffix = rng.choice(SUFFIXES, unique)
+    pool = np.array([
+        f"Rp{w:,}".replace(",", ".") + f",{c:02d}{s}" for w, c, s in zip(whole, cents, suffix)
+    ], dtype=object)
+    return pd.Series(pool[rng.integers(0, unique, count)])
+
+
+def naive_parse(value):
+    # Cara per baris: satu regex + konversi Python untuk setiap nilai
+    match = NAIVE_PATTERN.match(str(value).lower())
+    if not match or match.group(2) not in SUFFIX_MULTIPLIERS:
+        return None
+    number = match.group(1).replace(".", "").replace(",", ".")
+    return round(float(number) * SUFFIX_MULTIPLIERS[match.group(2)])
+
+
+class Command(BaseCommand):
+    help = "Ukur parser nilai pasar vektor dibanding parse per baris."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--values", type=int, default=1_000_000)
+        parser.add_argument(
+            "--unique", type=int, action="append",
+            help="Jumlah nilai unik (boleh diulang). Default: 1000 dan --values.",
+        )
+        parser.add_argument("--skip-naive", action="store_true", help="Lewati pengukuran per baris.")
+
+    def _measure(self, label, func, count):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{label:<32} {elapsed * 1000:10.1f} ms  {count / elapsed:12,.0f} nilai/detik")
+
+    def handle(self, *args, **options):
+        count = options["values"]
+        for unique in options["unique"] or [1000, count]:
+            unique = min(unique, count)
+            values = generate_values(count, unique)
+            self.stdout.write(f"{count:,} nilai, {unique:,} unik")
+            self._measure("parse_market_values", lambda: parse_market_values(values), count)
+            self._measure("  dari array NumPy", lambda: parse_market_values(values.to_numpy()), count)
+            if not options["skip_naive"]:
+                self._measure("per baris (lama)", lambda: [naive_parse(v) for v in values], count)
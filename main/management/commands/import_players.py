@@ -0,0 +1,80 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.player_import import (
+    DEFAULT_BATCH_SIZE, diff_players, normalize_players, read_player_file, resolve_clubs,
+    upsert_players,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Impor pemain dari file .xlsx/.csv. Pemain yang sudah ada (berdasarkan "
+        "external_id) diperbarui, yang baru ditambahkan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", nargs="?", default=str(Path(settings.BASE_DIR) / "data" / "Dataset.xlsx"),
+            help="Path file .xlsx atau .csv (default: data/Dataset.xlsx).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Tampilkan perbedaan dengan database tanpa menulis apapun.",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--show", type=int, default=20,
+            help="Jumlah detail perubahan yang ditampilkan saat --dry-run.",
+        )
+
+    def _timed(self, timings, label, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append((label, time.perf_counter() - start))
+        return result
+
+    def handle(self, *args, **options):
+        timings = []
+        try:
+            raw = self._timed(timings, "baca file", read_player_file, options["path"])
+            df, skipped = self._timed(timings, "normalisasi", normalize_players, raw)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"{len(df)} pemain valid, {skipped} baris dilewati.")
+
+        if options["dry_run"]:
+            diff = self._timed(timings, "diff", diff_players, df)
+            _, new_clubs = resolve_clubs(df["klub"].unique(), create=False)
+            self.stdout.write(
+                f"[dry-run] baru: {diff['created']}, berubah: {diff['updated']}, "
+                f"sama: {diff['unchanged']}, klub baru: {len(new_clubs)}"
+            )
+            for external_id, nama, fields in diff["changes"][: options["show"]]:
+                detail = ", ".join(f"{f}: {old!r} -> {new!r}" for f, (old, new) in fields.items())
+                self.stdout.write(f"  ~ {nama} ({external_id}): {detail}")
+            if new_clubs:
+                self.stdout.write(f"  + klub: {', '.join(new_clubs)}")
+        else:
+            result = self._timed(
+                timings, "tulis database", upsert_players, df, batch_size=options["batch_size"]
+            )
+            self._timed(timings, "index pencarian", self._reindex)
+            self.stdout.write(self.style.SUCCESS(
+                f"{result['written']} pemain ditulis, {len(result['new_clubs'])} klub baru."
+            ))
+
+        total = sum(elapsed for _, elapsed in timings)
+        for label, elapsed in timings:
+            self.stdout.write(f"  {label:<16} {elapsed:8.2f} s")
+        if total:
+            self.stdout.write(f"  {'total':<16} {total:8.2f} s  ({len(df) / total:,.0f} baris/detik)")
+
+    def _reindex(self):
+        # bulk_create tidak memicu signal pencarian
+        from search.index import rebuild
+        rebuild(["player"])
@@ -0,0 +1,104 @@
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SORT_KEYS = {
+    "p95": lambda row: row["p95_ms"],
+    "queries": lambda row: row["max_queries"],
+    "db": lambda row: row["db_ms"],
+    "duplicates": lambda row: row["duplicates"],
+    "count": lambda row: row["count"],
+}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def log_files(path):
+    """File log beserta hasil rotasinya (requests.jsonl, requests.jsonl.1, ...)."""
+    path = Path(path)
+    rotated = sorted(path.parent.glob(f"{path.name}.*"), key=lambda p: p.suffix, reverse=True)
+    return [p for p in rotated if p.suffix[1:].isdigit()] + ([path] if path.exists() else [])
+
+
+def read_records(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def summarize(records):
+    """Agregasi per endpoint (nama view, atau path jika tidak ter-resolve)."""
+    groups = defaultdict(list)
+    for record in records:
+        groups[(record.get("method"), record.get("view") or record.get("path"))].append(record)
+
+    rows = []
+    for (method, endpoint), items in groups.items():
+        durations = [item["duration_ms"] for item in items]
+        queries = [item["queries"] for item in items]
+        duplicate_sql = Counter()
+        for item in items:
+            for entry in item.get("top_duplicates", []):
+                duplicate_sql[entry["sql"]] += entry["count"]
+        rows.append({
+            "endpoint": f"{method} {endpoint}",
+            "count": len(items),
+            "p50_ms": percentile(durations, 0.5),
+            "p95_ms": percentile(durations, 0.95),
+            "avg_queries": sum(queries) / len(items),
+            "max_queries": max(queries),
+            "db_ms": sum(item["db_ms"] for item in items) / len(items),
+            "duplicates": sum(item["duplicates"] for item in items) / len(items),
+            "worst_duplicate": duplicate_sql.most_common(1)[0] if duplicate_sql else None,
+        })
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Ringkas log instrumentasi request: endpoint terburuk menurut latency, query, atau duplikat."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", default=settings.REQUEST_METRICS_LOG, help="File log JSON Lines.")
+        parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="p95")
+        parser.add_argument("--limit", type=int, default=15)
+        parser.add_argument("--json", action="store_true", help="Keluarkan hasil sebagai JSON.")
+
+    def handle(self, *args, **options):
+        if not options["log"] or options["log"] == "-":
+            raise CommandError("REQUEST_METRICS_LOG bukan file; berikan --log ke file log yang akan diringkas.")
+        paths = log_files(options["log"])
+        if not paths:
+            raise CommandError(f"Log tidak ditemukan: {options['log']}")
+
+        rows = summarize(read_records(paths))
+        rows.sort(key=SORT_KEYS[options["sort"]], reverse=True)
+        rows = rows[: options["limit"]]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'endpoint':<48} {'req':>6} {'p50 ms':>8} {'p95 ms':>8} {'query':>7} {'maks':>5} {'db ms':>7} {'dup':>6}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['endpoint'][:48]:<48} {row['count']:>6} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                f"{row['avg_queries']:>7.1f} {row['max_queries']:>5} {row['db_ms']:>7.1f} {row['duplicates']:>6.1f}"
+            )
+            if row["worst_duplicate"]:
+                sql, count = row["worst_duplicate"]
+                self.stdout.write(f"    duplikat x{count}: {sql[:110]}")
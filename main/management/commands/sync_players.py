@@ -0,0 +1,100 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.player_import import DEFAULT_BATCH_SIZE, normalize_players, read_player_file
+from main.player_sync import sync_players
+
+
+class Command(BaseCommand):
+    help = (
+        "Sinkronkan hasil scrape Transfermarkt ke database: hanya pemain baru "
+        "dan field yang berubah yang ditulis."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", nargs="?",
+            help="File .csv/.xlsx hasil scraping.py. Tanpa path, scrape langsung.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Laporkan perubahan tanpa menulis.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--show", type=int, default=20, help="Jumlah detail perubahan yang ditampilkan.")
+        scrape = parser.add_argument_group("scrape langsung (tanpa path)")
+        scrape.add_argument("--with-stats", action="store_true")
+        scrape.add_argument("--workers", type=int, default=4)
+        scrape.add_argument("--rate", type=float, default=0.5)
+        scrape.add_argument("--cache-dir", default=".scrape_cache")
+        scrape.add_argument("--offline", nargs="?", const="", default=None, metavar="DIR",
+                            help="Pakai fixture HTML (default scraper/fixtures).")
+
+    def _timed(self, timings, label, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append((label, time.perf_counter() - start))
+        return result
+
+    def _scrape(self, options):
+        import pandas as pd
+
+        from scraper.cache import ResponseCache
+        from scraper.engine import Fetcher, ScrapeEngine
+        from scraper.offline import FIXTURE_DIR, FixtureSession
+        from scraper.ratelimit import HostRateLimiter
+        from scraper.transfermarkt import COLUMNS, scrape
+
+        fetcher_options = {}
+        if options["offline"] is not None:
+            session = FixtureSession(options["offline"] or FIXTURE_DIR)
+            fetcher_options["session_factory"] = lambda: session
+        fetcher = Fetcher(
+            limiter=HostRateLimiter(options["rate"]),
+            cache=ResponseCache(options["cache_dir"]),
+            **fetcher_options,
+        )
+        engine = ScrapeEngine(fetcher, workers=options["workers"])
+        rows = scrape(engine, with_stats=options["with_stats"])
+        self.stdout.write(engine.stats.summary())
+        if engine.stats.failed:
+            raise CommandError(f"{engine.stats.failed} halaman gagal di-scrape; sync dibatalkan.")
+        return pd.DataFrame(rows, columns=COLUMNS)
+
+    def handle(self, *args, **options):
+        timings = []
+        try:
+            if options["path"]:
+                raw = self._timed(timings, "baca file", read_player_file, options["path"])
+            else:
+                raw = self._timed(timings, "scrape", self._scrape, options)
+            df, skipped = self._timed(timings, "normalisasi", normalize_players, raw)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        report = self._timed(
+            timings, "sync", sync_players, df,
+            batch_size=options["batch_size"], dry_run=options["dry_run"],
+        )
+        if report["touched_ids"]:
+            self._timed(timings, "index pencarian", self._reindex, report["touched_ids"])
+
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}baru: {report['inserted']}, berubah: {report['updated']}, "
+            f"sama: {report['unchanged']}, dilewati: {skipped}, klub baru: {len(report['new_clubs'])}"
+        ))
+        if report["fields"]:
+            detail = ", ".join(f"{field} {count}" for field, count in report["fields"].most_common())
+            self.stdout.write(f"  field berubah: {detail}")
+        for external_id, nama, fields in report["changes"][: options["show"]]:
+            detail = ", ".join(f"{f}: {old!r} -> {new!r}" for f, (old, new) in fields.items())
+            self.stdout.write(f"  ~ {nama} ({external_id}): {detail}")
+        for label, elapsed in timings:
+            self.stdout.write(f"  {label:<16} {elapsed:8.2f} s")
+
+    def _reindex(self, player_ids):
+        # bulk_create/bulk_update tidak memicu signal; index hanya pemain yang ditulis
+        from main.models import Player
+        from search.index import index_instance
+
+        for player in Player.objects.filter(pk__in=player_ids).select_related("current_club"):
+            index_instance("player", player)
@@ -0,0 +1,77 @@
+# main/market_value.py
+
+import numpy as np
+import pandas as pd
+
+# Satuan nilai pasar gaya Transfermarkt (locale Indonesia) dan output format_rupiah
+SUFFIX_MULTIPLIERS = {
+    "": 1,
+    "rb": 10**3,
+    "ribu": 10**3,
+    "jt": 10**6,
+    "juta": 10**6,
+    "m": 10**9,
+    "mlyr": 10**9,
+    "miliar": 10**9,
+    "t": 10**12,
+    "triliun": 10**12,
+}
+
+_PATTERN = r"(?i)^\s*(?:rp\.?\s*)?(?P<number>\d[\d.,]*)\s*(?P<suffix>[a-z]*)\.?\s*$"
+
+# "1.234.567" (tanpa koma) berarti pemisah ribuan, bukan desimal
+_THOUSANDS_ONLY = r"^\d{1,3}(?:\.\d{3})+$"
+
+
+def _parse_unique(values):
+    """Parse array string unik menjadi float (NaN jika tidak valid)."""
+    parts = pd.Series(values, dtype=object).str.extract(_PATTERN)
+    number = parts["number"]
+
+    has_comma = number.str.contains(",", regex=False, na=False)
+    thousands_only = number.str.match(_THOUSANDS_ONLY, na=False)
+    # Locale Indonesia: titik = ribuan, koma = desimal ("1.738,16").
+    # Tanpa koma, titik adalah desimal ("347.63" dari format_rupiah)
+    # kecuali bentuknya jelas kelompok ribuan ("1.234").
+    normalized = number.where(~(has_comma | thousands_only), number.str.replace(".", "", regex=False))
+    normalized = normalized.str.replace(",", ".", regex=False)
+
+    amount = pd.to_numeric(normalized, errors="coerce")
+    multiplier = parts["suffix"].str.lower().map(SUFFIX_MULTIPLIERS)
+    return (amount * multiplier).to_numpy(dtype="float64", na_value=np.nan)
+
+
+def parse_market_values(values):
+    """
+    Ubah string nilai pasar seperti "Rp347,63Mlyr.", "Rp1.738,16Mlyr.",
+    "Rp500Rb", "Rp1,5Jt" atau "Rp347.63M" menjadi rupiah (bilangan bulat).
+
+    Menerima pandas Series, array NumPy, atau list. Angka biasa (int/float)
+    dibiarkan apa adanya. Nilai yang tidak bisa dibaca menjadi <NA>.
+    Mengembalikan Series bertipe Int64 dengan index yang sama.
+
+    Kolom di-factorize dulu sehingga setiap nilai unik hanya di-parse sekali;
+    kolom nilai pasar satu juta baris biasanya hanya punya ribuan nilai unik.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values, dtype=object))
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        result = series.to_numpy(dtype="float64", na_value=np.nan)
+    else:
+        codes, uniques = pd.factorize(series)
+        is_text = np.fromiter((isinstance(value, str) for value in uniques), bool, len(uniques))
+        parsed = np.full(len(uniques), np.nan)
+        if (~is_text).any():
+            parsed[~is_text] = pd.to_numeric(uniques[~is_text], errors="coerce")
+        if is_text.any():
+            parsed[is_text] = _parse_unique(uniques[is_text])
+        # code -1 = None/NaN; tambahkan NaN di ujung agar ikut ter-index
+        result = np.append(parsed, np.nan)[codes]
+
+    return pd.Series(np.round(result), index=series.index).astype("Int64")
+
+
+def parse_market_value(value):
+    """Versi satu nilai dari parse_market_values; None jika tidak valid."""
+    parsed = parse_market_values([value]).iloc[0]
+    return None if pd.isna(parsed) else int(parsed)
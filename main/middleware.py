@@ -0,0 +1,194 @@
+# main/middleware.py
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from logging.handlers import WatchedFileHandler
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+logger = logging.getLogger("premiere_trade.requests")
+
+# Jumlah fingerprint query duplikat yang ikut dicatat per request
+TOP_DUPLICATES = 3
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """
+    Bentuk query tanpa nilai: literal dan daftar IN (...) disamakan sehingga
+    query N+1 (SQL sama, parameter beda) punya fingerprint yang sama.
+    """
+    sql = _LITERALS.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """execute_wrapper yang menghitung jumlah, durasi, dan fingerprint query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """Jumlah eksekusi berlebih: query dengan fingerprint yang sudah pernah jalan."""
+        return sum(n - 1 for n in self.fingerprints.values() if n > 1)
+
+    def top_duplicates(self, limit=TOP_DUPLICATES):
+        return [
+            {"sql": sql[:300], "count": n}
+            for sql, n in self.fingerprints.most_common(limit) if n > 1
+        ]
+
+
+def server_timing(stats, total):
+    return ", ".join([
+        f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+        f'dup;desc="{stats.duplicates} duplicate"',
+        f"total;dur={total * 1000:.1f}",
+    ])
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Catat jumlah query, total waktu DB, query duplikat (indikasi N+1) dan
+    latency view untuk setiap request. Hasilnya dikirim di header
+    Server-Timing / X-Query-Count dan ke logger "premiere_trade.requests"
+    (satu baris JSON per request). Ringkasan: manage.py request_metrics.
+
+    Bisa jalan di WSGI maupun ASGI tanpa memindahkan request ke thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "REQUEST_METRICS_ENABLED", True)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        stats = QueryStats()
+        start = time.perf_counter()
+        with self.instrument(stats):
+            response = self.get_response(request)
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        stats = QueryStats()
+        start = time.perf_counter()
+        # Koneksi database per thread: query ORM async dan view sync berjalan
+        # di thread sync_to_async milik request ini, wrapper dipasang di sana
+        stack = await sync_to_async(self.instrument)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, stats, start)
+
+    @staticmethod
+    def instrument(stats):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def finish(self, request, response, stats, start):
+        total = time.perf_counter() - start
+        response["Server-Timing"] = server_timing(stats, total)
+        response["X-Query-Count"] = str(stats.count)
+        logger.info(json.dumps(self.record(request, response, stats, total)))
+        return response
+
+    def record(self, request, response, stats, total):
+        match = getattr(request, "resolver_match", None)
+        return {
+            "ts": timezone.now().isoformat(),
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "duration_ms": round(total * 1000, 2),
+            "db_ms": round(stats.duration * 1000, 2),
+            "queries": stats.count,
+            "duplicates": stats.duplicates,
+            "top_duplicates": stats.top_duplicates(),
+            # Body streaming dieksekusi setelah middleware selesai, query-nya tidak terhitung
+            "streaming": response.streaming,
+        }
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware yang juga async-capable. WhiteNoise sendiri hanya
+    sync, dan satu middleware sync di ASGI membuat setiap request (termasuk
+    view async) dijalankan lewat thread. Lookup file statis cukup dict
+    lookup; hanya pembacaan file yang dipindah ke thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class RequestLogHandler(WatchedFileHandler):
+    """
+    WatchedFileHandler yang membuat folder log bila belum ada. Rotasi
+    dilakukan dari luar (logrotate); file dibuka ulang setelah dipindah.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(filename, *args, **kwargs)
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_alter_player_market_value'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['sedang_dijual', 'market_value', 'id'], name='player_dijual_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['sedang_dijual', 'position'], name='player_dijual_position_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:56
+
+import re
+
+from django.db import migrations, models
+
+TM_ID = re.compile(r"/(\d+)-")
+
+
+def backfill_external_id(apps, schema_editor):
+    # Pemain lama: ambil id Transfermarkt dari URL foto agar import berikutnya
+    # memperbarui pemain yang sama, bukan membuat duplikat.
+    Player = apps.get_model('main', 'Player')
+    seen = set()
+    updated = []
+    for player in Player.objects.exclude(thumbnail__isnull=True).only('id', 'thumbnail'):
+        match = TM_ID.search(player.thumbnail or '')
+        if not match or match.group(1) in seen:
+            continue
+        seen.add(match.group(1))
+        player.external_id = f"tm:{match.group(1)}"
+        updated.append(player)
+    Player.objects.bulk_update(updated, ['external_id'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_player_market_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_external_id, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_player_external_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='source_fingerprint',
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_player_source_fingerprint'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='player',
+            name='player_dijual_value_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='player',
+            name='player_dijual_position_idx',
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(('sedang_dijual', True)), fields=['market_value', 'id'], name='player_for_sale_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(('sedang_dijual', True)), fields=['position', 'market_value', 'id'], name='player_for_sale_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['current_club', 'nama_pemain'], name='player_club_nama_idx'),
+        ),
+    ]
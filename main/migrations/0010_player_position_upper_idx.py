@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:47
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='player',
+            name='player_for_sale_position_idx',
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(django.db.models.functions.text.Upper('position'), models.F('market_value'), models.F('id'), condition=models.Q(('sedang_dijual', True)), name='player_for_sale_position_idx'),
+        ),
+    ]
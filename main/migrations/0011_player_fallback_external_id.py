@@ -0,0 +1,35 @@
+# Kunci cadangan external_id tidak lagi memuat klub ("nama:slug@klub" ->
+# "nama:slug") agar pemain tanpa id Transfermarkt yang pindah klub
+# diperbarui saat sync, bukan menjadi duplikat.
+
+from collections import Counter
+
+from django.db import migrations
+
+
+def drop_club_from_fallback_id(apps, schema_editor):
+    Player = apps.get_model('main', 'Player')
+    fallback = Player.objects.filter(external_id__startswith='nama:')
+    rows = fallback.filter(external_id__contains='@').values_list('id', 'external_id')
+    new_ids = {pk: external_id.split('@', 1)[0] for pk, external_id in rows}
+    taken = Counter(new_ids.values())
+    taken.update(fallback.exclude(external_id__contains='@').values_list('external_id', flat=True))
+
+    # Nama yang sama di beberapa klub tidak bisa digabung otomatis: biarkan kunci lamanya
+    updated = [
+        Player(id=pk, external_id=new_id)
+        for pk, new_id in new_ids.items()
+        if taken[new_id] == 1
+    ]
+    Player.objects.bulk_update(updated, ['external_id'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_player_position_upper_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_club_from_fallback_id, migrations.RunPython.noop),
+    ]
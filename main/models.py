@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Upper
 
 # Create your models here.
 class Club(models.Model):
@@ -29,6 +30,39 @@ class Player(models.Model):
     jumlah_match = models.IntegerField(default=0)
     thumbnail = models.URLField(blank=True, null=True)
     sedang_dijual = models.BooleanField(default=False)
-    
+    # Kunci alami dari sumber data (id Transfermarkt), dipakai untuk upsert import
+    external_id = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    # Hash data sumber terakhir yang ditulis; sync melewati baris yang hash-nya sama
+    source_fingerprint = models.CharField(max_length=16, null=True, blank=True)
+    # Dibaca change feed (changes app); .update()/bulk_update harus mengisinya manual
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Transfer market: keyset (market_value, id) atas pemain yang dijual.
+            # Partial index karena Django menulis filter boolean sebagai
+            # WHERE "sedang_dijual" (tanpa "= 1"), yang tidak bisa memakai
+            # index komposit berawalan sedang_dijual di SQLite.
+            models.Index(
+                fields=["market_value", "id"],
+                condition=models.Q(sedang_dijual=True),
+                name="player_for_sale_value_idx",
+            ),
+            # Filter posisi tidak peka huruf besar/kecil: UPPER(position) = ?
+            # (iexact menjadi LIKE di SQLite dan tidak memakai index)
+            models.Index(
+                Upper("position"), "market_value", "id",
+                condition=models.Q(sedang_dijual=True),
+                name="player_for_sale_position_idx",
+            ),
+            # Daftar pemain per klub diurutkan nama
+            models.Index(
+                fields=["current_club", "nama_pemain"],
+                name="player_club_nama_idx",
+            ),
+            # Change feed: keyset (updated_at, id)
+            models.Index(fields=["updated_at", "id"], name="player_updated_idx"),
+        ]
+
     def __str__(self):
         return self.nama_pemain
@@ -0,0 +1,153 @@
+# main/pagination.py
+
+import base64
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import JsonResponse
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    """Cursor dari client tidak bisa dibaca atau tidak cocok dengan ordering."""
+
+
+def _to_json_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    return value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_to_json_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, expected_length):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise InvalidCursor("Cursor tidak valid.")
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise InvalidCursor("Cursor tidak valid.")
+    return values
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Baca parameter ?limit= dan batasi ke rentang 1..maximum."""
+    if value in (None, ""):
+        return default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise InvalidCursor("Parameter limit harus berupa angka.")
+    return max(1, min(size, maximum))
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Pagination berbasis cursor (keyset), bukan OFFSET, sehingga biaya
+    halaman ke-1000 sama dengan halaman pertama selama ada index yang
+    cocok dengan ordering.
+
+    `ordering` adalah tuple nama field seperti ("market_value", "id") atau
+    ("-created_at", "-id"). Field terakhir harus unik agar urutannya stabil.
+    Queryset boleh berupa model instance maupun .values().
+    """
+
+    def __init__(self, queryset, ordering, page_size=DEFAULT_PAGE_SIZE):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+        self.fields = [f.lstrip("-") for f in self.ordering]
+
+    def _after(self, values):
+        # (a, b) > (va, vb)  ==>  a > va OR (a = va AND b > vb)
+        condition = Q()
+        equal_so_far = Q()
+        for order, field, value in zip(self.ordering, self.fields, values):
+            lookup = "lt" if order.startswith("-") else "gt"
+            condition |= equal_so_far & Q(**{f"{field}__{lookup}": value})
+            equal_so_far &= Q(**{field: value})
+        return condition
+
+    def _values_of(self, item):
+        if isinstance(item, dict):
+            return [item[field] for field in self.fields]
+        return [getattr(item, field) for field in self.fields]
+
+    def cursor_for(self, item):
+        """Cursor yang menunjuk tepat setelah `item`."""
+        return encode_cursor(self._values_of(item))
+
+    def page_queryset(self, cursor=None):
+        """Queryset satu halaman (plus satu baris ekstra), belum dieksekusi."""
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            values = decode_cursor(cursor, len(self.fields))
+            try:
+                queryset = queryset.filter(self._after(values))
+            except (ValueError, TypeError, ValidationError):
+                raise InvalidCursor("Cursor tidak valid.")
+        # Satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+        return queryset[: self.page_size + 1]
+
+    def page(self, cursor=None):
+        return self._to_page(list(self.page_queryset(cursor)))
+
+    async def apage(self, cursor=None):
+        """Seperti page(), dengan ORM async untuk view async."""
+        return self._to_page([item async for item in self.page_queryset(cursor)])
+
+    def _to_page(self, items):
+        next_cursor = None
+        if len(items) > self.page_size:
+            items = items[: self.page_size]
+            next_cursor = self.cursor_for(items[-1])
+        return KeysetPage(items, next_cursor)
+
+
+def next_page_url(request, cursor):
+    """URL halaman berikutnya: query string saat ini dengan cursor baru."""
+    params = request.GET.copy()
+    params["cursor"] = cursor
+    return f"{request.path}?{params.urlencode()}"
+
+
+def set_next_cursor_headers(response, request, page):
+    """
+    Kontrak cursor yang sama untuk semua endpoint: cursor halaman berikutnya
+    dikirim lewat header X-Next-Cursor dan Link (rel="next").
+    """
+    if page.next_cursor:
+        response["X-Next-Cursor"] = page.next_cursor
+        response["Link"] = f'<{next_page_url(request, page.next_cursor)}>; rel="next"'
+        response["Access-Control-Expose-Headers"] = "X-Next-Cursor, Link"
+    return response
+
+
+def keyset_json_response(request, page, data):
+    """
+    JsonResponse untuk satu halaman keyset. Body tetap berupa array agar
+    client lama tidak rusak; cursor halaman berikutnya ada di header.
+    """
+    return set_next_cursor_headers(JsonResponse(data, safe=False), request, page)
@@ -0,0 +1,258 @@
+# main/player_import.py
+
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+from django.db import transaction
+
+from .market_value import parse_market_values
+from .models import Club, Player
+from .versioning import bump_roster_version
+
+# Kolom file (Dataset.xlsx / dataset.csv) -> field Player
+COLUMN_MAP = {
+    "nama_pemain": "nama_pemain",
+    "klub": "klub",
+    "posisi": "position",
+    "umur": "umur",
+    "market_value": "market_value",
+    "negara": "negara",
+    "jumlah_goal": "jumlah_goal",
+    "jumlah_asis": "jumlah_asis",
+    "jumlah_match": "jumlah_match",
+    "url profile": "thumbnail",
+}
+REQUIRED_COLUMNS = ("nama_pemain", "klub")
+TEXT_FIELDS = ("nama_pemain", "klub", "position", "negara", "thumbnail")
+INT_FIELDS = ("umur", "market_value", "jumlah_goal", "jumlah_asis", "jumlah_match")
+
+# Field yang ditimpa saat pemain sudah ada. sedang_dijual sengaja tidak ikut
+# agar import ulang tidak menarik pemain dari Transfer Market.
+UPDATE_FIELDS = (
+    "current_club", "nama_pemain", "position", "umur", "market_value",
+    "negara", "jumlah_goal", "jumlah_asis", "jumlah_match", "thumbnail",
+)
+COMPARE_FIELDS = tuple(f for f in UPDATE_FIELDS if f != "current_club") + ("klub",)
+
+DEFAULT_BATCH_SIZE = 2000
+
+# Batas parameter per query (SQLite lama: 999)
+LOOKUP_CHUNK = 900
+
+
+def read_player_file(path):
+    """Baca .csv atau .xlsx menjadi DataFrame mentah."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+    return pd.read_excel(path, dtype=str, keep_default_na=False)
+
+
+def _slug(series):
+    return series.str.lower().str.replace(r"\s+", "-", regex=True)
+
+
+def normalize_players(df):
+    """
+    Normalisasi seluruh kolom sekaligus (operasi vektor pandas, tanpa loop
+    per baris). Mengembalikan (DataFrame bersih, jumlah baris dilewati).
+    DataFrame hasil berisi kolom field Player + `klub` + `external_id`.
+    """
+    df = df.copy()
+    df.columns = df.columns.str.strip().str.lower()
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Kolom berikut hilang di file: {', '.join(missing)}")
+
+    df = df.rename(columns=COLUMN_MAP)
+    for field in TEXT_FIELDS:
+        if field not in df.columns:
+            df[field] = ""
+        df[field] = df[field].astype("string").fillna("").str.strip()
+    for field in INT_FIELDS:
+        if field not in df.columns:
+            df[field] = ""
+        # market_value di dataset.csv berupa teks "Rp347,63Mlyr."
+        parse = parse_market_values if field == "market_value" else partial(pd.to_numeric, errors="coerce")
+        values = parse(df[field])
+        # Kolom yang kosong seluruhnya (mis. statistik tidak ikut di-scrape)
+        # dibiarkan NaN: "tidak ada di sumber", bukan 0. Lihat source_fields().
+        if values.notna().any():
+            df[field] = values.fillna(0).astype("int64")
+        else:
+            df[field] = values.astype("float64")
+
+    valid = (df["nama_pemain"] != "") & (df["klub"] != "")
+    skipped = int((~valid).sum())
+    df = df[valid]
+
+    # Id Transfermarkt diambil dari URL foto (.../header/403151-...jpg);
+    # jika tidak ada, pakai nama sebagai kunci cadangan. Klub sengaja tidak
+    # ikut agar pemain yang pindah klub diperbarui, bukan menjadi duplikat.
+    tm_id = df["thumbnail"].str.extract(r"/(\d+)-", expand=False)
+    fallback = "nama:" + _slug(df["nama_pemain"])
+    df["external_id"] = ("tm:" + tm_id).fillna(fallback)
+    df["thumbnail"] = df["thumbnail"].astype(object).where(df["thumbnail"] != "", None)
+
+    # Baris ganda untuk pemain yang sama: yang terakhir menang
+    before = len(df)
+    df = df.drop_duplicates("external_id", keep="last")
+    skipped += before - len(df)
+
+    columns = ["external_id", "klub", *(f for f in UPDATE_FIELDS if f != "current_club")]
+    return df[columns].reset_index(drop=True), skipped
+
+
+def _chunks(values, size=LOOKUP_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def resolve_clubs(names, create=True):
+    """
+    Map nama klub -> id dengan lookup sekaligus. Klub yang belum ada dibuat
+    dengan satu bulk_create. Mengembalikan (mapping, daftar nama klub baru).
+    """
+    names = set(names)
+    mapping = {}
+    for chunk in _chunks(names):
+        mapping.update(Club.objects.filter(name__in=chunk).values_list("name", "id"))
+
+    new_names = sorted(names - mapping.keys())
+    if new_names and create:
+        Club.objects.bulk_create([Club(name=name) for name in new_names], ignore_conflicts=True)
+        for chunk in _chunks(new_names):
+            mapping.update(Club.objects.filter(name__in=chunk).values_list("name", "id"))
+    return mapping, new_names
+
+
+def existing_players(external_ids):
+    """DataFrame pemain di database untuk external_id yang diberikan."""
+    fields = [f for f in COMPARE_FIELDS if f != "klub"]
+    rows = []
+    for chunk in _chunks(external_ids):
+        rows.extend(
+            Player.objects.filter(external_id__in=chunk).values(
+                "external_id", "current_club__name", *fields
+            )
+        )
+    existing = pd.DataFrame(rows, columns=["external_id", "current_club__name", *fields])
+    return existing.rename(columns={"current_club__name": "klub"})
+
+
+def source_fields(df):
+    """
+    COMPARE_FIELDS yang benar-benar ada di sumber. Kolom angka yang NaN
+    seluruhnya (lihat normalize_players) tidak dibandingkan dan tidak
+    ditulis, sehingga nilai di database tetap.
+    """
+    return tuple(f for f in COMPARE_FIELDS if f not in INT_FIELDS or df[f].notna().any())
+
+
+def _python_value(value):
+    if value is None or value is pd.NA or (isinstance(value, float) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def fingerprints(df, fields=COMPARE_FIELDS):
+    """
+    Hash 64-bit (hex) per baris atas `fields` (default COMPARE_FIELDS).
+    Dihitung vektor dengan pandas dan stabil antar proses, jadi bisa
+    disimpan di Player. Hash atas himpunan field lain tidak akan cocok,
+    sehingga baris itu dibandingkan per field.
+    """
+    frame = pd.DataFrame({
+        field: (
+            df[field].astype("int64") if field in INT_FIELDS
+            else df[field].astype(object).where(df[field].notna(), "").astype(str)
+        )
+        for field in fields
+    })
+    hashes = pd.util.hash_pandas_object(frame, index=False)
+    return hashes.map("{:016x}".format).set_axis(df.index)
+
+
+def field_changes(merged, is_new, fields=COMPARE_FIELDS):
+    """
+    Mask per field untuk hasil merge data baru (kolom `field`) dengan
+    database (kolom `field_db`). Mengembalikan (mask baris berubah, {field: mask}).
+    """
+    changed_mask = pd.Series(False, index=merged.index)
+    field_changed = {}
+    for field in fields:
+        old, new = merged[f"{field}_db"], merged[field]
+        differs = ~((old == new) | (old.isna() & new.isna())) & ~is_new
+        field_changed[field] = differs
+        changed_mask |= differs
+    return changed_mask, field_changed
+
+
+def diff_players(df):
+    """
+    Bandingkan data baru dengan database tanpa menulis apapun.
+    Mengembalikan dict berisi jumlah baru/berubah/sama dan detail perubahan
+    per pemain: [(external_id, nama, {field: (lama, baru)})].
+    """
+    compared = source_fields(df)
+    existing = existing_players(df["external_id"])
+    merged = df.merge(existing, on="external_id", how="left", suffixes=("", "_db"), indicator=True)
+    is_new = merged["_merge"] == "left_only"
+    changed_mask, field_changed = field_changes(merged, is_new, compared)
+
+    changes = []
+    for idx in merged.index[changed_mask]:
+        fields = {
+            field: (_python_value(merged.at[idx, f"{field}_db"]), _python_value(merged.at[idx, field]))
+            for field in compared if field_changed[field].at[idx]
+        }
+        changes.append((merged.at[idx, "external_id"], merged.at[idx, "nama_pemain"], fields))
+
+    return {
+        "created": int(is_new.sum()),
+        "updated": int(changed_mask.sum()),
+        "unchanged": int((~is_new & ~changed_mask).sum()),
+        "changes": changes,
+    }
+
+
+def upsert_players(df, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Tulis semua pemain dengan INSERT ... ON CONFLICT (external_id) DO UPDATE
+    per batch, di dalam satu transaksi. Kolom yang tidak ada di sumber
+    hanya diisi 0 untuk pemain baru dan tidak menimpa pemain yang sudah ada.
+    Mengembalikan jumlah baris ditulis dan daftar klub baru.
+    """
+    compared = source_fields(df)
+    missing = [f for f in INT_FIELDS if f not in compared]
+    with transaction.atomic():
+        clubs, new_clubs = resolve_clubs(df["klub"].unique())
+        club_ids = df["klub"].map(clubs)
+        df = df.assign(source_fingerprint=fingerprints(df, compared), **{f: 0 for f in missing})
+        fields = [f for f in UPDATE_FIELDS if f != "current_club"] + ["source_fingerprint"]
+        update_fields = [f for f in UPDATE_FIELDS if f not in missing]
+
+        written = 0
+        for start in range(0, len(df), batch_size):
+            batch = df.iloc[start:start + batch_size]
+            players = [
+                Player(external_id=row[0], current_club_id=club_id, **dict(zip(fields, row[1:])))
+                for row, club_id in zip(
+                    # astype(object) agar nilainya tipe Python biasa, bukan numpy
+                    batch[["external_id", *fields]].astype(object).itertuples(index=False, name=None),
+                    club_ids.iloc[start:start + batch_size].astype(object),
+                )
+            ]
+            Player.objects.bulk_create(
+                players,
+                update_conflicts=True,
+                unique_fields=["external_id"],
+                update_fields=[*update_fields, "source_fingerprint", "updated_at"],
+            )
+            written += len(players)
+
+        # bulk_create tidak memicu signal, cache homepage di-invalidate manual
+        transaction.on_commit(bump_roster_version)
+    return {"written": written, "new_clubs": new_clubs}
@@ -0,0 +1,145 @@
+# main/player_sync.py
+
+from collections import Counter
+
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Player
+from .player_import import (
+    DEFAULT_BATCH_SIZE, UPDATE_FIELDS, _chunks, _python_value, existing_players,
+    field_changes, fingerprints, resolve_clubs, source_fields,
+)
+from .versioning import bump_roster_version
+
+# Nama kolom DataFrame -> field Player saat bulk_update
+FIELD_FOR_COLUMN = {"klub": "current_club"}
+
+
+def known_fingerprints(external_ids):
+    """DataFrame (external_id, id, source_fingerprint) pemain yang sudah ada."""
+    rows = []
+    for chunk in _chunks(external_ids):
+        rows.extend(
+            Player.objects.filter(external_id__in=chunk).values_list("external_id", "id", "source_fingerprint")
+        )
+    return pd.DataFrame(rows, columns=["external_id", "id", "source_fingerprint"])
+
+
+def plan_sync(df, fields):
+    """
+    Hitung apa yang harus ditulis tanpa menyentuh database.
+
+    Tahap 1 membandingkan fingerprint saja (satu kolom per pemain). Hanya
+    baris yang fingerprint-nya berbeda (atau belum punya fingerprint) yang
+    dibandingkan per field pada tahap 2. Hanya `fields` (lihat
+    source_fields) yang ikut fingerprint dan perbandingan.
+    """
+    df = df.assign(fingerprint=fingerprints(df, fields))
+    merged = df.merge(known_fingerprints(df["external_id"]), on="external_id", how="left")
+    is_new = merged["id"].isna()
+    same = merged["fingerprint"] == merged["source_fingerprint"]
+
+    candidates = merged[~is_new & ~same]
+    updates = []
+    refresh = []
+    if len(candidates):
+        detail = candidates.merge(
+            existing_players(candidates["external_id"]), on="external_id", how="left", suffixes=("", "_db")
+        )
+        changed_mask, field_changed = field_changes(detail, pd.Series(False, index=detail.index), fields)
+        for idx in detail.index:
+            changed = {
+                field: (_python_value(detail.at[idx, f"{field}_db"]), _python_value(detail.at[idx, field]))
+                for field in fields if field_changed[field].at[idx]
+            }
+            entry = (detail.at[idx, "id"], detail.at[idx, "external_id"], detail.at[idx, "nama_pemain"],
+                     changed, detail.at[idx, "fingerprint"])
+            # Fingerprint belum ada atau atas field lain, tapi datanya sama: cukup simpan hash-nya
+            (updates if changed_mask.at[idx] else refresh).append(entry)
+
+    return {
+        "new": merged[is_new].drop(columns=["id", "source_fingerprint"]),
+        "updates": updates,
+        "refresh": refresh,
+        "unchanged": int((~is_new & same).sum()) + len(refresh),
+    }
+
+
+def _apply_updates(updates, clubs, batch_size):
+    """
+    bulk_update per kelompok field yang berubah, jadi hanya kolom yang
+    benar-benar berubah yang ditulis.
+    """
+    groups = {}
+    now = timezone.now()
+    for player_id, _, _, fields, fingerprint in updates:
+        names = tuple(sorted(FIELD_FOR_COLUMN.get(field, field) for field in fields))
+        # bulk_update tidak mengisi auto_now; updated_at dibaca change feed
+        player = Player(id=player_id, source_fingerprint=fingerprint, updated_at=now)
+        for field, (_, new) in fields.items():
+            if field == "klub":
+                player.current_club_id = clubs[new]
+            else:
+                setattr(player, field, new)
+        groups.setdefault(names, []).append(player)
+
+    for names, players in groups.items():
+        Player.objects.bulk_update(players, [*names, "source_fingerprint", "updated_at"], batch_size=batch_size)
+
+
+def sync_players(df, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Sinkronkan hasil scrape (DataFrame dari normalize_players) ke Player
+    berdasarkan external_id: insert pemain baru, update hanya field yang
+    berubah, lewati sisanya. Kolom yang tidak di-scrape (statistik tanpa
+    --with-stats) tidak dibandingkan dan tidak ditimpa. Mengembalikan dict
+    laporan.
+    """
+    compared = source_fields(df)
+    plan = plan_sync(df, compared)
+    new, updates, refresh = plan["new"], plan["updates"], plan["refresh"]
+    report = {
+        "inserted": len(new),
+        "updated": len(updates),
+        "unchanged": plan["unchanged"],
+        "fields": Counter(FIELD_FOR_COLUMN.get(f, f) for *_, fields, _ in updates for f in fields),
+        "changes": [(external_id, nama, fields) for _, external_id, nama, fields, _ in updates],
+        "new_clubs": [],
+        "touched_ids": [],
+    }
+    club_names = set(new["klub"]) | {fields["klub"][1] for *_, fields, _ in updates if "klub" in fields}
+    if dry_run:
+        _, report["new_clubs"] = resolve_clubs(club_names, create=False)
+        return report
+
+    with transaction.atomic():
+        clubs, report["new_clubs"] = resolve_clubs(club_names)
+
+        # Kolom yang tidak ada di sumber memakai default model (0) untuk pemain baru
+        fields = [f for f in UPDATE_FIELDS if f != "current_club" and f in compared]
+        created = Player.objects.bulk_create(
+            [
+                Player(
+                    external_id=row["external_id"],
+                    current_club_id=clubs[row["klub"]],
+                    source_fingerprint=row["fingerprint"],
+                    **{field: _python_value(row[field]) for field in fields},
+                )
+                for row in new.to_dict("records")
+            ],
+            batch_size=batch_size,
+        )
+        _apply_updates(updates, clubs, batch_size)
+        if refresh:
+            Player.objects.bulk_update(
+                [Player(id=entry[0], source_fingerprint=entry[4]) for entry in refresh],
+                ["source_fingerprint"],
+                batch_size=batch_size,
+            )
+
+        report["touched_ids"] = [player.id for player in created] + [entry[0] for entry in updates]
+        if report["touched_ids"]:
+            transaction.on_commit(bump_roster_version)
+    return report
@@ -0,0 +1,48 @@
+# main/query_plans.py
+"""
+Pemeriksa rencana query (EXPLAIN) untuk test regresi index. Mendukung
+SQLite (development/test) dan PostgreSQL (production).
+"""
+
+import re
+
+from django.db import connection
+
+# SQLite: "SCAN main_player" tanpa "USING ... INDEX" = baca seluruh tabel.
+# "SCAN t USING INDEX i" masih oke: tabel dibaca urut lewat index (untuk ORDER BY + LIMIT).
+_SQLITE_FULL_SCAN = re.compile(r"\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)(?:\s|$)")
+_SQLITE_SORT = "USE TEMP B-TREE FOR ORDER BY"
+_PG_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def analyze():
+    """Perbarui statistik planner agar pilihan index sesuai ukuran data."""
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def plan_problems(queryset, allow_sort=False):
+    """
+    Daftar masalah pada rencana query: full scan per tabel dan (kecuali
+    `allow_sort`) sort terpisah untuk ORDER BY. List kosong berarti query
+    dilayani index.
+    """
+    plan = queryset.explain()
+    if connection.vendor == "postgresql":
+        problems = [f"full scan {table}" for table in _PG_FULL_SCAN.findall(plan)]
+        sort_node = re.search(r"^\s*(->\s*)?Sort\b", plan, re.M)
+        if sort_node and not allow_sort:
+            problems.append("sort tanpa index")
+        return problems
+
+    problems = [f"full scan {table}" for table in _SQLITE_FULL_SCAN.findall(plan)]
+    if _SQLITE_SORT in plan and not allow_sort:
+        problems.append("sort tanpa index")
+    return problems
+
+
+class QueryPlanAssertions:
+    """Mixin TestCase: assertUsesIndex(queryset) gagal jika rencana query full scan / sort."""
+
+    def assertUsesIndex(self, queryset, allow_sort=False):
+        self.assertEqual(plan_problems(queryset, allow_sort=allow_sort), [], queryset.explain())
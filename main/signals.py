@@ -0,0 +1,21 @@
+# main/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Club, Player
+from .versioning import bump_roster_version
+
+
+@receiver(post_save, sender=Player)
+@receiver(post_delete, sender=Player)
+@receiver(post_save, sender=Club)
+@receiver(post_delete, sender=Club)
+def invalidate_roster_cache(sender, **kwargs):
+    """
+    Setiap perubahan Player/Club membuat cache homepage kadaluarsa.
+    Versi dinaikkan setelah commit agar request lain tidak mengisi ulang
+    cache dengan data lama sebelum transaksi selesai.
+    """
+    transaction.on_commit(bump_roster_version)
@@ -0,0 +1,161 @@
+# main/streaming.py
+
+import json
+from itertools import islice
+
+from django.core import serializers
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Jumlah baris yang diambil dari database (dan ditulis ke response) per batch
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def _abatched(aiterable, size):
+    batch = []
+    async for item in aiterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_values(queryset, fields, transform=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Iterasi baris .values() dengan server-side cursor/chunk sehingga tidak
+    pernah ada list berisi seluruh tabel di memori. `transform` (opsional)
+    mengubah tiap dict menjadi bentuk JSON yang diinginkan.
+    """
+    rows = queryset.values(*fields).iterator(chunk_size=chunk_size)
+    if transform is None:
+        return rows
+    return (transform(row) for row in rows)
+
+
+async def aiter_values(queryset, fields, transform=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Seperti iter_values, tetapi lewat QuerySet.aiterator() untuk ASGI."""
+    async for row in queryset.values(*fields).aiterator(chunk_size=chunk_size):
+        yield row if transform is None else transform(row)
+
+
+def values_for(request, queryset, fields, transform=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    aiter_values di ASGI, iter_values di WSGI. Iterator async di WSGI
+    dikumpulkan Django seluruhnya sebelum dikirim, sehingga memori tidak
+    lagi konstan; karena itu jenis iterator mengikuti server.
+    """
+    if isinstance(request, ASGIRequest):
+        return aiter_values(queryset, fields, transform=transform, chunk_size=chunk_size)
+    return iter_values(queryset, fields, transform=transform, chunk_size=chunk_size)
+
+
+def _array_format(indent):
+    """(fungsi encode satu batch, separator antar elemen, newline penutup)."""
+    encoder = DjangoJSONEncoder(indent=indent)
+    separator = ",\n" if indent else ", "
+    pad = " " * indent if indent else ""
+
+    def encode(batch):
+        encoded = [encoder.encode(row) for row in batch]
+        if indent:
+            encoded = [pad + item.replace("\n", "\n" + pad) for item in encoded]
+        return separator.join(encoded)
+
+    return encode, separator, "\n" if indent else ""
+
+
+def stream_json_array(rows, indent=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Tulis iterable of dict sebagai satu JSON array, per batch."""
+    encode, separator, newline = _array_format(indent)
+
+    yield "[" + newline
+    first = True
+    for batch in _batched(rows, chunk_size):
+        yield ("" if first else separator) + encode(batch)
+        first = False
+    yield ("" if first else newline) + "]"
+
+
+async def astream_json_array(rows, indent=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """stream_json_array untuk async iterable (misal aiter_values)."""
+    encode, separator, newline = _array_format(indent)
+
+    yield "[" + newline
+    first = True
+    async for batch in _abatched(rows, chunk_size):
+        yield ("" if first else separator) + encode(batch)
+        first = False
+    yield ("" if first else newline) + "]"
+
+
+def _envelope_head(envelope, key):
+    head = json.dumps(envelope, cls=DjangoJSONEncoder)[:-1]
+    return head + (", " if envelope else "") + json.dumps(key) + ": "
+
+
+def stream_json_envelope(rows, envelope, key="data", **kwargs):
+    """
+    Seperti stream_json_array tapi dibungkus objek, misal
+    {"status": true, "data": [...]}. Array selalu diletakkan terakhir.
+    """
+    yield _envelope_head(envelope, key)
+    yield from stream_json_array(rows, **kwargs)
+    yield "}"
+
+
+async def astream_json_envelope(rows, envelope, key="data", **kwargs):
+    yield _envelope_head(envelope, key)
+    async for part in astream_json_array(rows, **kwargs):
+        yield part
+    yield "}"
+
+
+class StreamingJsonResponse(StreamingHttpResponse):
+    """
+    Pengganti JsonResponse untuk endpoint export seluruh tabel. Memori yang
+    dipakai konstan (satu batch) berapapun jumlah barisnya. `rows` boleh
+    iterable biasa atau async iterable (response async untuk ASGI).
+    """
+
+    def __init__(self, rows, envelope=None, key="data", indent=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        is_async = hasattr(rows, "__aiter__")
+        if envelope is None:
+            stream = astream_json_array if is_async else stream_json_array
+            content = stream(rows, indent=indent, chunk_size=chunk_size)
+        else:
+            stream = astream_json_envelope if is_async else stream_json_envelope
+            content = stream(rows, envelope, key=key, indent=indent, chunk_size=chunk_size)
+        super().__init__(content, **kwargs)
+
+
+def stream_xml_queryset(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Hasilkan output yang sama dengan serializers.serialize("xml", queryset)
+    tetapi per batch: setiap batch diserialisasi sendiri lalu header/footer
+    <django-objects> hanya ditulis sekali.
+    """
+    header = '<?xml version="1.0" encoding="utf-8"?>\n<django-objects version="1.0">'
+    footer = "</django-objects>"
+
+    yield header
+    for batch in _batched(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        xml = serializers.serialize("xml", batch)
+        yield xml[xml.index("<object"):xml.rindex(footer)]
+    yield footer
+
+
+class StreamingXmlResponse(StreamingHttpResponse):
+    def __init__(self, queryset, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        kwargs.setdefault("content_type", "application/xml")
+        super().__init__(stream_xml_queryset(queryset, chunk_size=chunk_size), **kwargs)
@@ -1,3 +1,717 @@
-from django.test import TestCase
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.core.management import CommandError, call_command
+from django.core import serializers
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from main.homepage import get_cached_featured_clubs_data, get_featured_clubs_data
+from main.market_value import parse_market_value, parse_market_values
+from main.middleware import QueryStats, RequestLogHandler, fingerprint
+from main.models import Club, Player
+from main.player_import import (
+    diff_players,
+    fingerprints,
+    normalize_players,
+    read_player_file,
+    resolve_clubs,
+    upsert_players,
+)
+from main.player_sync import sync_players
+from main.query_plans import QueryPlanAssertions, analyze
+from main.streaming import (
+    StreamingJsonResponse,
+    aiter_values,
+    iter_values,
+    stream_json_array,
+    stream_xml_queryset,
+)
+from main.versioning import bump_roster_version, get_roster_version
+from rumors.templatetags.number_filters import format_rupiah
+
+
+class HomepageDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Bersihkan klub bawaan dari data migration
+        Club.objects.all().delete()
+
+        self.club_a = Club.objects.create(name="Arsenal", country="England")
+        self.club_b = Club.objects.create(name="Chelsea", country="England")
+        Club.objects.create(name="Admin")
+
+        for i in range(6):
+            Player.objects.create(
+                nama_pemain=f"Arsenal {i}",
+                current_club=self.club_a,
+                position="CM",
+                market_value=(i + 1) * 1_000_000,
+            )
+        Player.objects.create(
+            nama_pemain="Chelsea 0",
+            current_club=self.club_b,
+            position="GK",
+            market_value=5_000_000,
+        )
+
+    def test_top_players_terurut_dan_dibatasi(self):
+        data = get_featured_clubs_data()
+        self.assertEqual([d["club"].name for d in data], ["Arsenal", "Chelsea"])
+
+        arsenal_players = data[0]["top_players"]
+        self.assertEqual(len(arsenal_players), 4)
+        self.assertEqual(
+            [p.market_value for p in arsenal_players],
+            [6_000_000, 5_000_000, 4_000_000, 3_000_000],
+        )
+        self.assertEqual(len(data[1]["top_players"]), 1)
+
+    def test_top_n_bisa_dikonfigurasi(self):
+        data = get_featured_clubs_data(top_n=2)
+        self.assertEqual(len(data[0]["top_players"]), 2)
+
+        with override_settings(HOMEPAGE_TOP_PLAYERS=5):
+            data = get_featured_clubs_data()
+        self.assertEqual(len(data[0]["top_players"]), 5)
+
+    def test_homepage_view(self):
+        response = self.client.get(reverse("main:homepage"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Arsenal 5")
+        self.assertNotContains(response, "Arsenal 0")
+
+
+class HomepageQueryCountBenchmark(TestCase):
+    """Jumlah query homepage harus tetap sama walaupun jumlah klub bertambah."""
+
+    def setUp(self):
+        Club.objects.all().delete()
+
+    def seed(self, club_count, players_per_club=8):
+        offset = Club.objects.count()
+        clubs = Club.objects.bulk_create(
+            [Club(name=f"Club {offset + i}") for i in range(club_count)]
+        )
+        Player.objects.bulk_create(
+            [
+                Player(
+                    nama_pemain=f"{club.name} Player {j}",
+                    current_club=club,
+                    position="CM",
+                    market_value=j * 1_000_000,
+                )
+                for club in clubs
+                for j in range(players_per_club)
+            ]
+        )
+
+    def test_query_count_tetap_dari_4_sampai_500_klub(self):
+        query_counts = {}
+        total_clubs = 0
+        for target in (4, 50, 500):
+            self.seed(target - total_clubs)
+            total_clubs = target
+
+            with CaptureQueriesContext(connection) as ctx:
+                data = get_featured_clubs_data()
+            query_counts[target] = len(ctx.captured_queries)
+
+            self.assertEqual(len(data), target)
+            self.assertTrue(all(len(d["top_players"]) == 4 for d in data))
+
+        self.assertEqual(query_counts, {4: 2, 50: 2, 500: 2})
+
+
+class HomepageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Club.objects.all().delete()
+        self.club = Club.objects.create(name="Arsenal", country="England")
+        self.player = Player.objects.create(
+            nama_pemain="Bukayo Saka",
+            current_club=self.club,
+            position="RW",
+            market_value=80_000_000,
+        )
+
+    def test_cache_hit_tidak_menjalankan_query(self):
+        get_cached_featured_clubs_data()
+        with self.assertNumQueries(0):
+            data = get_cached_featured_clubs_data()
+        self.assertEqual(data[0]["top_players"][0].nama_pemain, "Bukayo Saka")
+
+    def test_fragment_homepage_ter_cache(self):
+        self.client.get(reverse("main:homepage"))
+        # Request kedua hanya membaca fragment dari cache (tanpa query klub/pemain)
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("main:homepage"))
+        self.assertContains(response, "Bukayo Saka")
+
+    def test_save_player_menaikkan_roster_version(self):
+        version = get_roster_version()
+        self.player.nama_pemain = "Saka"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.player.save()
+        self.assertGreater(get_roster_version(), version)
+
+        response = self.client.get(reverse("main:homepage"))
+        self.assertContains(response, "Saka")
+
+    def test_delete_dan_club_save_menaikkan_roster_version(self):
+        version = get_roster_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.player.delete()
+        self.assertGreater(get_roster_version(), version)
+
+        version = get_roster_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Club.objects.create(name="Chelsea")
+        self.assertGreater(get_roster_version(), version)
+
+    def test_roster_version_naik_setelah_commit(self):
+        version = get_roster_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.player.nama_pemain = "Saka"
+            self.player.save()
+            # Request lain selama transaksi belum commit masih melihat versi lama
+            self.assertEqual(get_roster_version(), version)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertGreater(get_roster_version(), version)
+
+    def test_bump_setelah_cache_kosong(self):
+        cache.clear()
+        self.assertEqual(bump_roster_version(), 2)
+        self.assertEqual(get_roster_version(), 2)
+
+    def test_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            file_cache = {
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cache_dir,
+                }
+            }
+            with override_settings(CACHES=file_cache):
+                version = get_roster_version()
+                self.assertEqual(bump_roster_version(), version + 1)
+                get_cached_featured_clubs_data()
+                with self.assertNumQueries(0):
+                    get_cached_featured_clubs_data()
+
+
+class StreamingSerializerTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        club = Club.objects.create(name="Arsenal")
+        Player.objects.bulk_create(
+            [
+                Player(nama_pemain=f"Pemain {i}", current_club=club, position="CM", market_value=i)
+                for i in range(25)
+            ]
+        )
+
+    def test_json_array_sama_dengan_json_dumps(self):
+        rows = [{"a": i, "b": "x\ny"} for i in range(7)]
+        for indent in (None, 2):
+            streamed = "".join(stream_json_array(iter(rows), indent=indent, chunk_size=3))
+            self.assertEqual(streamed, json.dumps(rows, indent=indent))
+        self.assertEqual(json.loads("".join(stream_json_array(iter([])))), [])
+
+    def test_envelope(self):
+        rows = iter_values(Player.objects.order_by("market_value"), ("nama_pemain",))
+        response = StreamingJsonResponse(rows, envelope={"status": True}, chunk_size=10)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertTrue(data["status"])
+        self.assertEqual(len(data["data"]), 25)
+
+    def test_xml_sama_dengan_serializer_django(self):
+        queryset = Player.objects.order_by("pk")
+        streamed = "".join(stream_xml_queryset(queryset, chunk_size=4))
+        self.assertEqual(streamed, serializers.serialize("xml", queryset))
+
+    def test_query_dijalankan_per_chunk(self):
+        rows = iter_values(Player.objects.order_by("pk"), ("id",))
+        # SQLite tidak punya server-side cursor, jadi tetap satu query
+        # yang dibaca bertahap oleh iterator().
+        with self.assertNumQueries(1):
+            self.assertEqual(len(json.loads("".join(stream_json_array(rows, chunk_size=5)))), 25)
+
+    async def test_async_iterable_untuk_asgi(self):
+        queryset = Player.objects.order_by("pk")
+        fields = ("nama_pemain", "market_value")
+        expected = [row async for row in queryset.values(*fields)]
+
+        response = StreamingJsonResponse(aiter_values(queryset, fields), indent=2, chunk_size=10)
+        self.assertTrue(response.is_async)
+        streamed = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(streamed.decode(), json.dumps(expected, indent=2))
+
+        response = StreamingJsonResponse(aiter_values(queryset, fields), envelope={"status": True})
+        data = json.loads(b"".join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual(data["data"], expected)
+
+
+class PlayerFileMixin:
+    CSV_HEADER = "nama_pemain,klub,posisi,umur,market_value,negara,jumlah_goal,jumlah_asis,jumlah_match,url profile\n"
+
+    def setUp(self):
+        Club.objects.all().delete()
+
+    def _write_csv(self, rows):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8")
+        handle.write(self.CSV_HEADER + "".join(rows))
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def _frame(self, rows):
+        return normalize_players(read_player_file(self._write_csv(rows)))
+
+
+class PlayerImportTests(PlayerFileMixin, TestCase):
+
+    def test_normalize_is_vectorized_and_keys_rows(self):
+        df, skipped = self._frame([
+            " Bukayo Saka ,Arsenal,Sayap Kanan,23,1000,Inggris,10,5,100,https://img/portrait/header/433177-1.jpg\n",
+            ",Arsenal,Kiper,20,0,Inggris,0,0,0,\n",
+            "Tanpa Foto,Chelsea,Kiper,abc,5,Inggris,0,0,1,\n",
+            "Bukayo Saka,Arsenal,Sayap Kanan,24,2000,Inggris,11,6,101,https://img/portrait/header/433177-2.jpg\n",
+        ])
+        self.assertEqual(skipped, 2)  # baris tanpa nama + duplikat
+        rows = df.set_index("external_id")
+        self.assertEqual(rows.loc["tm:433177", "nama_pemain"], "Bukayo Saka")
+        self.assertEqual(rows.loc["tm:433177", "umur"], 24)
+        self.assertEqual(rows.loc["nama:tanpa-foto", "umur"], 0)
+        self.assertIsNone(rows.loc["nama:tanpa-foto", "thumbnail"])
+
+    def test_market_value_text_from_dataset_csv(self):
+        df, _ = self._frame([
+            "Saka,Arsenal,Sayap Kanan,23,\"Rp1.738,16Mlyr.\",Inggris,10,5,100,https://img/portrait/header/1-1.jpg\n",
+            "Rice,Arsenal,Gel. Bertahan,25,\"Rp347,63Mlyr.\",Inggris,3,4,150,https://img/portrait/header/3-1.jpg\n",
+            "Palmer,Chelsea,Gel. Serang,22,tidak diketahui,Inggris,20,8,90,https://img/portrait/header/2-1.jpg\n",
+        ])
+        values = df.set_index("external_id")["market_value"]
+        self.assertEqual(values["tm:1"], 1_738_160_000_000)
+        self.assertEqual(values["tm:3"], 347_630_000_000)
+        self.assertEqual(values["tm:2"], 0)
+
+    def test_missing_required_column(self):
+        with self.assertRaises(ValueError):
+            normalize_players(pd.DataFrame({"nama_pemain": ["A"]}))
+
+    def test_resolve_clubs_in_bulk(self):
+        Club.objects.create(name="Arsenal")
+        with self.assertNumQueries(3):
+            mapping, new = resolve_clubs(["Arsenal", "Chelsea", "Liverpool", "Chelsea"])
+        self.assertEqual(new, ["Chelsea", "Liverpool"])
+        self.assertEqual(set(mapping), {"Arsenal", "Chelsea", "Liverpool"})
+
+    def test_upsert_updates_existing_without_duplicates(self):
+        first, _ = self._frame([
+            "Saka,Arsenal,Sayap Kanan,23,1000,Inggris,10,5,100,https://img/portrait/header/1-1.jpg\n",
+            "Palmer,Chelsea,Gel. Serang,22,900,Inggris,20,8,90,https://img/portrait/header/2-1.jpg\n",
+        ])
+        upsert_players(first)
+        Player.objects.filter(external_id="tm:1").update(sedang_dijual=True)
+
+        second, _ = self._frame([
+            "Saka,Chelsea,Sayap Kanan,24,1500,Inggris,12,5,110,https://img/portrait/header/1-1.jpg\n",
+            "Rice,Arsenal,Gel. Bertahan,25,800,Inggris,3,4,150,https://img/portrait/header/3-1.jpg\n",
+        ])
+        result = upsert_players(second, batch_size=1)
+
+        self.assertEqual(result["written"], 2)
+        self.assertEqual(Player.objects.count(), 3)
+        saka = Player.objects.get(external_id="tm:1")
+        self.assertEqual((saka.current_club.name, saka.umur, saka.market_value), ("Chelsea", 24, 1500))
+        # Status Transfer Market tidak ditimpa import
+        self.assertTrue(saka.sedang_dijual)
+
+    def test_upsert_tanpa_kolom_statistik_tidak_menimpa_statistik(self):
+        df, _ = self._frame([
+            "Saka,Arsenal,Sayap Kanan,23,1000,Inggris,10,5,100,https://img/portrait/header/1-1.jpg\n",
+        ])
+        upsert_players(df)
+
+        no_stats, _ = self._frame([
+            "Saka,Arsenal,Sayap Kanan,24,1000,Inggris,,,,https://img/portrait/header/1-1.jpg\n",
+            "Rice,Arsenal,Gel. Bertahan,25,800,Inggris,,,,https://img/portrait/header/3-1.jpg\n",
+        ])
+        self.assertTrue(no_stats["jumlah_goal"].isna().all())
+        self.assertEqual(diff_players(no_stats)["changes"], [("tm:1", "Saka", {"umur": (23, 24)})])
+        upsert_players(no_stats)
+
+        saka = Player.objects.get(external_id="tm:1")
+        self.assertEqual((saka.umur, saka.jumlah_goal, saka.jumlah_asis, saka.jumlah_match), (24, 10, 5, 100))
+        self.assertEqual(Player.objects.get(external_id="tm:3").jumlah_match, 0)
+
+    def test_dry_run_diff_does_not_write(self):
+        df, _ = self._frame([
+            "Saka,Arsenal,Sayap Kanan,23,1000,Inggris,10,5,100,https://img/portrait/header/1-1.jpg\n",
+        ])
+        upsert_players(df)
+
+        changed, _ = self._frame([
+            "Saka,Arsenal,Sayap Kanan,24,1000,Inggris,10,5,100,https://img/portrait/header/1-1.jpg\n",
+            "Rice,Arsenal,Gel. Bertahan,25,800,Inggris,3,4,150,https://img/portrait/header/3-1.jpg\n",
+        ])
+        diff = diff_players(changed)
+        self.assertEqual((diff["created"], diff["updated"], diff["unchanged"]), (1, 1, 0))
+        self.assertEqual(diff["changes"], [("tm:1", "Saka", {"umur": (23, 24)})])
+        self.assertEqual(Player.objects.get(external_id="tm:1").umur, 23)
+        self.assertEqual(Player.objects.count(), 1)
+
+    def test_command_dry_run_and_import(self):
+        path = self._write_csv([
+            "Saka,Arsenal,Sayap Kanan,23,1000,Inggris,10,5,100,https://img/portrait/header/1-1.jpg\n",
+        ])
+        out = io.StringIO()
+        call_command("import_players", path, "--dry-run", stdout=out)
+        self.assertIn("baru: 1", out.getvalue())
+        self.assertFalse(Player.objects.exists())
+
+        version = get_roster_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_players", path, stdout=io.StringIO())
+        self.assertEqual(Player.objects.get().nama_pemain, "Saka")
+        self.assertGreater(get_roster_version(), version)
+
+
+class PlayerSyncTests(PlayerFileMixin, TestCase):
+    ROWS = [
+        "Saka,Arsenal,Sayap Kanan,23,\"Rp2.607,24Mlyr.\",Inggris,10,5,100,https://img/portrait/header/1-1.jpg\n",
+        "Palmer,Chelsea,Gel. Serang,22,\"Rp1.738,16Mlyr.\",Inggris,20,8,90,https://img/portrait/header/2-1.jpg\n",
+        "Rice,Arsenal,Gel. Bertahan,25,\"Rp1.303,90Mlyr.\",Inggris,3,4,150,https://img/portrait/header/3-1.jpg\n",
+    ]
+
+    def _sync(self, rows, **kwargs):
+        df, _ = self._frame(rows)
+        return sync_players(df, **kwargs)
+
+    def test_fingerprint_is_stable_and_sensitive(self):
+        df, _ = self._frame(self.ROWS)
+        again, _ = self._frame(self.ROWS)
+        self.assertEqual(fingerprints(df).tolist(), fingerprints(again).tolist())
+        df.loc[0, "umur"] = 24
+        self.assertNotEqual(fingerprints(df)[0], fingerprints(again)[0])
+
+    def test_second_run_touches_nothing(self):
+        first = self._sync(self.ROWS)
+        self.assertEqual((first["inserted"], first["updated"], first["unchanged"]), (3, 0, 0))
+
+        df, _ = self._frame(self.ROWS)
+        with CaptureQueriesContext(connection) as ctx:
+            report = sync_players(df)
+        self.assertEqual((report["inserted"], report["updated"], report["unchanged"]), (0, 0, 3))
+        writes = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith(("INSERT", "UPDATE"))]
+        self.assertEqual(writes, [])
+
+    def test_only_changed_fields_are_written(self):
+        self._sync(self.ROWS)
+        Player.objects.filter(external_id="tm:1").update(sedang_dijual=True)
+        rows = list(self.ROWS)
+        rows[0] = "Saka,Chelsea,Sayap Kanan,24,\"Rp2.607,24Mlyr.\",Inggris,10,5,100,https://img/portrait/header/1-1.jpg\n"
+        rows[2] = "Rice,Arsenal,Gel. Bertahan,25,\"Rp1.400Mlyr.\",Inggris,3,4,150,https://img/portrait/header/3-1.jpg\n"
+        rows.append("Rodri,Manchester City,Gel. Bertahan,29,\"Rp1.216,64Mlyr.\",Spanyol,1,2,12,https://img/portrait/header/4-1.jpg\n")
+
+        df, _ = self._frame(rows)
+        with CaptureQueriesContext(connection) as ctx:
+            report = sync_players(df)
+        self.assertEqual((report["inserted"], report["updated"], report["unchanged"]), (1, 2, 1))
+        self.assertEqual(report["fields"], {"current_club": 1, "umur": 1, "market_value": 1})
+        self.assertEqual(report["new_clubs"], ["Manchester City"])
+
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)  # satu per kelompok field
+        self.assertTrue(all('"nama_pemain"' not in sql for sql in updates))
+
+        saka = Player.objects.get(external_id="tm:1")
+        self.assertEqual((saka.current_club.name, saka.umur), ("Chelsea", 24))
+        self.assertTrue(saka.sedang_dijual)
+        self.assertEqual(Player.objects.get(external_id="tm:3").market_value, 1_400_000_000_000)
+        self.assertEqual(Player.objects.count(), 4)
+
+    def test_sync_tanpa_statistik_tidak_menghapus_statistik(self):
+        self._sync(self.ROWS)
+        # Scrape tanpa --with-stats: kolom statistik kosong untuk semua pemain
+        rows = [row.replace("10,5,100", ",,").replace("20,8,90", ",,").replace("3,4,150", ",,")
+                for row in self.ROWS]
+        rows.append("Rodri,Manchester City,Gel. Bertahan,29,1000,Spanyol,,,,https://img/portrait/header/4-1.jpg\n")
+
+        report = self._sync(rows)
+        self.assertEqual((report["inserted"], report["updated"], report["unchanged"]), (1, 0, 3))
+        self.assertEqual(report["fields"], {})
+
+        palmer = Player.objects.get(external_id="tm:2")
+        self.assertEqual((palmer.jumlah_goal, palmer.jumlah_asis, palmer.jumlah_match), (20, 8, 90))
+        self.assertEqual(Player.objects.get(external_id="tm:4").jumlah_goal, 0)
+
+        # Sync berikutnya dengan statistik tetap membandingkan statistik
+        rows = list(self.ROWS)
+        rows[1] = rows[1].replace("20,8,90", "21,8,91")
+        report = self._sync(rows)
+        self.assertEqual(report["fields"], {"jumlah_goal": 1, "jumlah_match": 1})
+
+    def test_pemain_tanpa_foto_pindah_klub_diperbarui(self):
+        self._sync(["Tanpa Foto,Arsenal,Kiper,30,100,Inggris,1,0,10,\n"])
+        report = self._sync(["Tanpa Foto,Chelsea,Kiper,30,100,Inggris,1,0,10,\n"])
+
+        self.assertEqual((report["inserted"], report["updated"]), (0, 1))
+        self.assertEqual(report["fields"], {"current_club": 1})
+        self.assertEqual(Player.objects.get(external_id="nama:tanpa-foto").current_club.name, "Chelsea")
+
+    def test_legacy_rows_without_fingerprint_count_as_unchanged(self):
+        df, _ = self._frame(self.ROWS)
+        upsert_players(df)
+        Player.objects.update(source_fingerprint=None)
+
+        report = self._sync(self.ROWS)
+        self.assertEqual((report["updated"], report["unchanged"]), (0, 3))
+        self.assertFalse(Player.objects.filter(source_fingerprint=None).exists())
+
+    def test_dry_run_writes_nothing(self):
+        report = self._sync(self.ROWS, dry_run=True)
+        self.assertEqual(report["inserted"], 3)
+        self.assertFalse(Player.objects.exists())
+
+    def test_command_syncs_offline_scrape(self):
+        out = io.StringIO()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        call_command("sync_players", offline="", rate=1000, cache_dir=cache_dir, stdout=out)
+        self.assertIn("baru: 12, berubah: 0, sama: 0", out.getvalue())
+        self.assertEqual(Player.objects.get(external_id="tm:433177").market_value, 2_607_240_000_000)
+
+
+class MarketValueParserTests(TestCase):
+    def test_transfermarkt_locale_strings(self):
+        parsed = parse_market_values(pd.Series([
+            "Rp347,63Mlyr.", "Rp1.738,16Mlyr.", "Rp500Rb", "Rp1,5Jt", " rp 2 juta ", "Rp3T",
+        ]))
+        self.assertEqual(parsed.tolist(), [
+            347_630_000_000, 1_738_160_000_000, 500_000, 1_500_000, 2_000_000, 3_000_000_000_000,
+        ])
+
+    def test_numbers_and_invalid_values(self):
+        parsed = parse_market_values(np.array([348000000000, "12345", None, "abc", "", "Rp5Kg"], dtype=object))
+        self.assertEqual(str(parsed.dtype), "Int64")
+        self.assertEqual(parsed.iloc[:2].tolist(), [348_000_000_000, 12_345])
+        self.assertTrue(parsed.iloc[2:].isna().all())
+        self.assertIsNone(parse_market_value("abc"))
+
+    def test_keeps_series_index(self):
+        parsed = parse_market_values(pd.Series(["Rp1Jt", "Rp2Jt"], index=[10, 20]))
+        self.assertEqual(parsed.index.tolist(), [10, 20])
+
+    def test_round_trip_with_format_rupiah(self):
+        values = [0, 7, 999, 1_000, 1_234, 987_654, 1_000_000, 1_234_567, 25_500_000,
+                  999_999_999, 1_000_000_000, 347_630_000_000, 1_738_160_000_000]
+        parsed = parse_market_values([format_rupiah(value) for value in values])
+        for value, result in zip(values, parsed):
+            # format_rupiah membulatkan ke 2 desimal dari satuan JT/M
+            unit = 1_000_000_000 if value >= 1_000_000_000 else 1_000_000 if value >= 1_000_000 else 1
+            self.assertLessEqual(abs(result - value), unit // 200, format_rupiah(value))
+            # Hasil parse sudah "bulat" sehingga format -> parse berikutnya stabil
+            self.assertEqual(parse_market_value(format_rupiah(result)), result)
+
+
+class PlayerQueryPlanTests(QueryPlanAssertions, TestCase):
+    """EXPLAIN query panas pada data seeded; gagal jika kembali ke full scan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Club.objects.all().delete()
+        clubs = Club.objects.bulk_create([Club(name=f"Klub {i}") for i in range(20)])
+        Player.objects.bulk_create([
+            Player(current_club=clubs[i % 20], nama_pemain=f"Pemain {i:05d}", position="CM",
+                   market_value=(i * 7919) % 100_000, sedang_dijual=i % 20 == 0)
+            for i in range(4000)
+        ])
+        analyze()
+        cls.club = clubs[3]
+
+    def test_club_players_ordered_by_name(self):
+        # Halaman klub dan API best eleven
+        self.assertUsesIndex(self.club.players.all().order_by("nama_pemain"))
+
+    def test_players_for_sale(self):
+        self.assertUsesIndex(Player.objects.filter(sedang_dijual=True).order_by("market_value", "id")[:21])
+
+
+class RequestInstrumentationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Club.objects.all().delete()
+        self.club = Club.objects.create(name="Arsenal", country="England")
+
+    def test_fingerprint_menyamakan_literal_dan_daftar_in(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "main_player" WHERE "id" = 12 AND "nama" = \'Saka\''),
+            'SELECT * FROM "main_player" WHERE "id" = ? AND "nama" = ?',
+        )
+        self.assertEqual(
+            fingerprint('SELECT 1 FROM t WHERE "id" IN (%s, %s, %s)'),
+            fingerprint('SELECT 1 FROM t WHERE "id" IN (%s)'),
+        )
+
+    def test_query_stats_mendeteksi_query_berulang(self):
+        stats = QueryStats()
+        with connection.execute_wrapper(stats):
+            for club_id in (1, 2, 3):
+                list(Player.objects.filter(current_club_id=club_id))
+            Club.objects.count()
+        self.assertEqual(stats.count, 4)
+        self.assertEqual(stats.duplicates, 2)
+        self.assertEqual(stats.top_duplicates()[0]["count"], 3)
+
+    def test_header_dan_log_per_request(self):
+        url = reverse("main:show_clubs_json")
+        with self.assertLogs("premiere_trade.requests", "INFO") as logs:
+            response = self.client.get(url)
+
+        self.assertIn("db;dur=", response["Server-Timing"])
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["path"], url)
+        self.assertEqual(record["view"], "main:show_clubs_json")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], int(response["X-Query-Count"]))
+        self.assertGreaterEqual(record["queries"], 1)
+
+    async def test_query_view_async_ikut_terhitung(self):
+        response = await self.async_client.get(reverse("rumors:get_rumors_json"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Query-Count"], "1")
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_bisa_dinonaktifkan(self):
+        response = self.client.get(reverse("main:show_clubs_json"))
+        self.assertNotIn("X-Query-Count", response)
+
+    def test_command_request_metrics_meringkas_log(self):
+        records = [
+            {"method": "GET", "path": "/a/", "view": "main:homepage", "status": 200,
+             "duration_ms": ms, "db_ms": 1.0, "queries": 2, "duplicates": 0, "top_duplicates": []}
+            for ms in (10, 20, 30)
+        ] + [
+            {"method": "GET", "path": "/club/1/players/", "view": "main:player_list_by_club", "status": 200,
+             "duration_ms": 5, "db_ms": 4.0, "queries": 12, "duplicates": 10,
+             "top_duplicates": [{"sql": "SELECT ? FROM t", "count": 11}]},
+        ]
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "requests.jsonl")
+        with open(path + ".1", "w") as f:
+            f.write(json.dumps(records[0]) + "\n")
+        with open(path, "w") as f:
+            f.writelines(json.dumps(r) + "\n" for r in records[1:])
+
+        out = io.StringIO()
+        call_command("request_metrics", log=path, sort="queries", json=True, stdout=out)
+        rows = json.loads(out.getvalue())
+
+        self.assertEqual(rows[0]["endpoint"], "GET main:player_list_by_club")
+        self.assertEqual(rows[0]["worst_duplicate"], ["SELECT ? FROM t", 11])
+        self.assertEqual(rows[1]["count"], 3)
+        self.assertEqual(rows[1]["p50_ms"], 20)
+
+    def test_log_request_tidak_ditulis_ke_file_saat_test(self):
+        handlers = logging.getLogger("premiere_trade.requests").handlers
+        self.assertTrue(all(isinstance(h, logging.NullHandler) for h in handlers))
+
+    def test_request_log_handler_membuka_ulang_setelah_dirotasi(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "logs", "requests.jsonl")
+        handler = RequestLogHandler(path, delay=True)
+        self.addCleanup(handler.close)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        def emit(message):
+            handler.emit(logging.makeLogRecord({"msg": message, "levelno": logging.INFO}))
+
+        emit("satu")
+        # Rotasi dari luar (logrotate): file dipindah, handler menulis ke file baru
+        os.rename(path, path + ".1")
+        emit("dua")
+
+        with open(path + ".1") as f:
+            self.assertEqual(f.read(), "satu\n")
+        with open(path) as f:
+            self.assertEqual(f.read(), "dua\n")
+
+    def test_command_request_metrics_tanpa_file_log(self):
+        with self.assertRaises(CommandError):
+            call_command("request_metrics", log="-", stdout=io.StringIO())
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Club.objects.all().delete()
+        self.club = Club.objects.create(name="Arsenal", country="England")
+        Player.objects.create(nama_pemain="Bukayo Saka", current_club=self.club, position="RW")
+
+    def urls(self):
+        return [
+            reverse("main:show_clubs_json"),
+            reverse("main:show_players_by_club_json", args=[self.club.id]),
+            "/accounts/api/admin/clubs/",
+            reverse("rumors:get_players_by_club") + f"?club_id={self.club.id}",
+        ]
+
+    def test_if_none_match_304_tanpa_query(self):
+        for url in self.urls():
+            with self.subTest(url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                with self.assertNumQueries(0):
+                    cached = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached.content, b"")
+
+    def test_if_modified_since_304(self):
+        url = reverse("main:show_clubs_json")
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_perubahan_roster_mengganti_etag(self):
+        url = reverse("main:show_players_by_club_json", args=[self.club.id])
+        first = self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Player.objects.create(nama_pemain="Martin Odegaard", current_club=self.club, position="AM")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(len(response.json()), 2)
+
+    def test_cache_dikosongkan_tidak_menghasilkan_304_basi(self):
+        url = reverse("main:show_clubs_json")
+        first = self.client.get(url)
+        cache.clear()
+        Club.objects.create(name="Chelsea", country="England")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    @override_settings(VERSION_VALIDATORS_ENABLED=False)
+    def test_validator_dimatikan_tanpa_cache_bersama(self):
+        response = self.client.get(reverse("main:show_clubs_json"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
@@ -0,0 +1,95 @@
+# main/versioning.py
+
+import secrets
+
+from django.core.cache import cache
+from django.utils import timezone
+
+# Counter global yang naik setiap kali data Player/Club berubah.
+# Dipakai sebagai bagian dari cache key homepage.
+ROSTER = "roster"
+
+
+def _version_key(name):
+    return f"version:{name}"
+
+
+def _changed_key(name):
+    return f"version_changed:{name}"
+
+
+def _epoch_key(name):
+    return f"version_epoch:{name}"
+
+
+def _new_epoch(name):
+    cache.set(_epoch_key(name), secrets.token_hex(4), timeout=None)
+
+
+def get_version(name):
+    """Ambil nilai counter versi. Counter yang belum ada dianggap 1."""
+    version = cache.get(_version_key(name))
+    if version is None:
+        # add() tidak menimpa nilai yang mungkin baru saja dibuat worker lain
+        if cache.add(_version_key(name), 1, timeout=None):
+            _new_epoch(name)
+        version = cache.get(_version_key(name), 1)
+    return version
+
+
+def get_version_epoch(name):
+    """
+    Token acak yang diganti setiap kali counter dibuat ulang (cache baru,
+    di-clear, atau di-evict). Counter bisa mulai lagi dari 1, tetapi
+    pasangan (epoch, versi) tidak pernah berulang, sehingga ETag lama
+    tidak cocok lagi.
+    """
+    # Pastikan counter sudah ada dulu: get_version() yang membuat counter
+    # juga mengganti epoch, jadi epoch yang dibaca sebelumnya akan basi
+    get_version(name)
+    epoch = cache.get(_epoch_key(name))
+    if epoch is None:
+        cache.add(_epoch_key(name), secrets.token_hex(4), timeout=None)
+        epoch = cache.get(_epoch_key(name)) or secrets.token_hex(4)
+    return epoch
+
+
+def bump_version(name):
+    """
+    Naikkan counter versi sehingga semua cache yang memakai versi lama
+    otomatis tidak terpakai lagi.
+    """
+    cache.set(_changed_key(name), timezone.now(), timeout=None)
+    try:
+        return cache.incr(_version_key(name))
+    except ValueError:
+        # Key belum ada (atau sudah di-evict): mulai dari versi 2
+        # agar tidak bentrok dengan versi default 1, dengan epoch baru.
+        cache.set(_version_key(name), 2, timeout=None)
+        _new_epoch(name)
+        return 2
+
+
+def get_version_changed_at(name):
+    """
+    Waktu counter versi terakhir dinaikkan (untuk header Last-Modified).
+    Jika belum tercatat (cache baru atau di-evict) dianggap sekarang, sehingga
+    client tidak pernah mendapat 304 untuk data yang mungkin sudah berubah.
+    """
+    changed = cache.get(_changed_key(name))
+    if changed is None:
+        cache.add(_changed_key(name), timezone.now(), timeout=None)
+        changed = cache.get(_changed_key(name)) or timezone.now()
+    return changed
+
+
+def get_roster_version():
+    return get_version(ROSTER)
+
+
+def bump_roster_version():
+    return bump_version(ROSTER)
+
+
+def get_roster_changed_at():
+    return get_version_changed_at(ROSTER)
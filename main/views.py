@@ -2,28 +2,23 @@
 
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
+from .conditional import roster_condition
 from .models import Club, Player
+from .homepage import get_cached_featured_clubs_data, get_cache_timeout
+from .versioning import get_roster_version
 
 def homepage(request):
     """
     Menampilkan halaman utama dengan semua klub non-Admin 
     dan 4 pemain termahal dari masing-masing klub.
     """
-    # Mengambil semua klub kecuali yang bernama 'Admin' (case-insensitive) dan diurutkan berdasarkan nama
-    clubs = Club.objects.exclude(name__iexact='Admin').prefetch_related('players').order_by('name')
-    featured_clubs_data = []
-
-    for club in clubs:
-        # Ambil 4 pemain termahal dari klub ini, urutkan descending
-        top_players = club.players.all().order_by('-market_value')[:4]
-        featured_clubs_data.append({
-            'club': club,
-            'top_players': top_players
-        })
-
     context = {
         'user': request.user,
-        'featured_clubs_data': featured_clubs_data,
+        # Dikirim sebagai callable: template hanya memanggilnya jika
+        # fragment {% cache %} untuk roster version ini belum tersimpan.
+        'featured_clubs_data': get_cached_featured_clubs_data,
+        'roster_version': get_roster_version(),
+        'homepage_cache_timeout': get_cache_timeout(),
     }
     return render(request, 'main/homepage.html', context)
 
@@ -40,6 +35,7 @@ def player_list_by_club(request, club_id):
     }   
     return render(request, 'main/player_list.html', context)
 
+@roster_condition
 def show_clubs_json(request):
     """API untuk mengirim daftar klub sebagai JSON ke Flutter"""
     clubs = Club.objects.exclude(name__iexact='Admin').order_by('name')
@@ -55,6 +51,7 @@ def show_clubs_json(request):
         })
     return JsonResponse(data, safe=False)
 
+@roster_condition
 def show_players_by_club_json(request, club_id):
     """API untuk mengirim daftar pemain per klub sebagai JSON ke Flutter"""
     # Pastikan ambil object Club atau 404 jika tidak ada, biar aman
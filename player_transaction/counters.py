@@ -0,0 +1,159 @@
+# player_transaction/counters.py
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Negotiation, NegotiationCounter
+
+STATUSES = [status for status, _ in Negotiation.STATUS_CHOICES]
+DIRECTIONS = {"received": "to_club_id", "sent": "from_club_id"}
+
+
+def counter_field(direction, status):
+    return f"{direction}_{status}"
+
+
+def deltas_for(to_club_id, from_club_id, status, sign=1):
+    """Perubahan counter untuk satu negosiasi: {(club_id, field): delta}."""
+    return {
+        (to_club_id, counter_field("received", status)): sign,
+        (from_club_id, counter_field("sent", status)): sign,
+    }
+
+
+FIELDS = [counter_field(d, s) for d in DIRECTIONS for s in STATUSES]
+
+
+def _table_counts(club_ids=None):
+    """{club_id: {field: n}} langsung dari tabel Negotiation."""
+    values = defaultdict(dict)
+    for direction, column in DIRECTIONS.items():
+        negotiations = Negotiation.objects.all()
+        if club_ids is not None:
+            negotiations = negotiations.filter(**{f"{column}__in": club_ids})
+        for club_id, status, total in (
+            negotiations.values_list(column, "status").annotate(total=Count("id")).order_by()
+        ):
+            values[club_id][counter_field(direction, status)] = total
+
+    if club_ids is not None:
+        for club_id in club_ids:
+            values.setdefault(club_id, {})
+    return values
+
+
+def rebuild_counters(club_ids=None, create_missing=True):
+    """
+    Hitung ulang counter dari tabel Negotiation (semua klub, atau hanya
+    `club_ids`). Dipakai setelah bulk_create dan saat baris counter belum ada.
+    Dengan create_missing=False hanya baris yang sudah ada yang diperbarui
+    (dipakai saat penghapusan, ketika klubnya sendiri mungkin ikut dihapus).
+    """
+    values = _table_counts(club_ids)
+    rows = [
+        NegotiationCounter(club_id=club_id, **{field: counts.get(field, 0) for field in FIELDS})
+        for club_id, counts in values.items()
+    ]
+    with transaction.atomic():
+        existing = set(
+            NegotiationCounter.objects.filter(club_id__in=list(values)).values_list("club_id", flat=True)
+        )
+        NegotiationCounter.objects.bulk_update([r for r in rows if r.club_id in existing], FIELDS, batch_size=500)
+        if create_missing:
+            # Baris yang baru saja dibuat request lain juga sudah dihitung dari tabel
+            NegotiationCounter.objects.bulk_create(
+                [r for r in rows if r.club_id not in existing], batch_size=500, ignore_conflicts=True
+            )
+        if club_ids is None:
+            NegotiationCounter.objects.exclude(club_id__in=list(values)).delete()
+
+
+def _apply(club_id, changes):
+    return NegotiationCounter.objects.filter(club_id=club_id).update(
+        **{field: F(field) + delta for field, delta in changes.items()}
+    )
+
+
+def adjust(deltas):
+    """
+    Terapkan {(club_id, field): delta} dengan UPDATE ... SET f = f + delta,
+    satu query per klub. Pengurangan untuk klub tanpa baris diabaikan karena
+    klub tersebut sedang dihapus.
+
+    Klub yang belum punya baris counter: buat baris dari tabel dikurangi
+    perubahan ini (INSERT ... ON CONFLICT DO NOTHING), lalu jalankan UPDATE
+    yang sama. Dua tawaran pertama yang bersamaan tidak bentrok: yang
+    insert-nya kalah tetap menambahkan delta-nya lewat UPDATE.
+    """
+    per_club = defaultdict(Counter)
+    for (club_id, field), delta in deltas.items():
+        per_club[club_id][field] += delta
+
+    missing = {}
+    for club_id, changes in per_club.items():
+        changes = {field: delta for field, delta in changes.items() if delta}
+        if not changes:
+            continue
+        if not _apply(club_id, changes) and any(delta > 0 for delta in changes.values()):
+            missing[club_id] = changes
+    if not missing:
+        return
+
+    with transaction.atomic():
+        counts = _table_counts(list(missing))
+        NegotiationCounter.objects.bulk_create(
+            [
+                NegotiationCounter(club_id=club_id, **{
+                    field: counts[club_id].get(field, 0) - changes.get(field, 0) for field in FIELDS
+                })
+                for club_id, changes in missing.items()
+            ],
+            ignore_conflicts=True,
+        )
+        for club_id, changes in missing.items():
+            _apply(club_id, changes)
+
+
+def set_status(queryset, status):
+    """
+    Ubah status negosiasi di `queryset` dan sesuaikan counter di transaksi
+    yang sama (pengganti queryset.update(status=...), yang tidak memicu
+    signal). Mengembalikan jumlah baris yang berubah.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.exclude(status=status)
+            .select_for_update()
+            .values_list("id", "to_club_id", "from_club_id", "status")
+        )
+        if not rows:
+            return 0
+        # Kondisi queryset asli tetap berlaku: baris yang berubah sejak dibaca tidak ikut
+        updated = queryset.filter(pk__in=[row[0] for row in rows]).update(
+            status=status, updated_at=timezone.now()
+        )
+
+        if updated == len(rows):
+            deltas = Counter()
+            for _, to_club_id, from_club_id, old in rows:
+                deltas.update(deltas_for(to_club_id, from_club_id, old, -1))
+                deltas.update(deltas_for(to_club_id, from_club_id, status))
+            adjust(deltas)
+        else:
+            rebuild_counters({club for row in rows for club in row[1:3]})
+    return updated
+
+
+def inbox_counts(club):
+    """Counter inbox klub {"received": {status: n}, "sent": {...}}."""
+    counter = NegotiationCounter.objects.filter(club=club).first()
+    if counter is None:
+        rebuild_counters([club.pk])
+        counter = NegotiationCounter.objects.get(club=club)
+    return {
+        direction: {status: getattr(counter, counter_field(direction, status)) for status in STATUSES}
+        for direction in DIRECTIONS
+    }
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_player_source_fingerprint'),
+        ('player_transaction', '0004_transaction_ledger'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='negotiation',
+            index=models.Index(fields=['to_club', 'created_at'], name='nego_to_club_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='negotiation',
+            index=models.Index(fields=['from_club', 'created_at'], name='nego_from_club_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='negotiation',
+            index=models.Index(fields=['player', 'status'], name='nego_player_status_idx'),
+        ),
+    ]
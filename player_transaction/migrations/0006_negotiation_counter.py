@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_player_indexes'),
+        ('player_transaction', '0005_negotiation_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NegotiationCounter',
+            fields=[
+                ('club', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='negotiation_counter', serialize=False, to='main.club')),
+                ('received_pending', models.IntegerField(default=0)),
+                ('received_accepted', models.IntegerField(default=0)),
+                ('received_rejected', models.IntegerField(default=0)),
+                ('received_cancelled', models.IntegerField(default=0)),
+                ('sent_pending', models.IntegerField(default=0)),
+                ('sent_accepted', models.IntegerField(default=0)),
+                ('sent_rejected', models.IntegerField(default=0)),
+                ('sent_cancelled', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='negotiation',
+            index=models.Index(fields=['to_club', 'status', 'created_at'], name='nego_to_club_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='negotiation',
+            index=models.Index(fields=['from_club', 'status', 'created_at'], name='nego_from_club_status_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Isi counter inbox untuk negosiasi yang sudah ada sebelum tabelnya dibuat.
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def backfill(apps, schema_editor):
+    Negotiation = apps.get_model('player_transaction', 'Negotiation')
+    NegotiationCounter = apps.get_model('player_transaction', 'NegotiationCounter')
+
+    counts = defaultdict(dict)
+    for direction, column in (('received', 'to_club_id'), ('sent', 'from_club_id')):
+        rows = Negotiation.objects.values_list(column, 'status').annotate(total=Count('id')).order_by()
+        for club_id, status, total in rows:
+            counts[club_id][f'{direction}_{status}'] = total
+
+    NegotiationCounter.objects.bulk_create(
+        [NegotiationCounter(club_id=club_id, **fields) for club_id, fields in counts.items()],
+        batch_size=500,
+    )
+
+
+def clear(apps, schema_editor):
+    apps.get_model('player_transaction', 'NegotiationCounter').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('player_transaction', '0006_negotiation_counter'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_updated_at'),
+        ('player_transaction', '0007_backfill_negotiation_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='negotiation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='negotiation',
+            index=models.Index(fields=['updated_at', 'id'], name='nego_updated_idx'),
+        ),
+    ]
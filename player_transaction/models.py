@@ -4,12 +4,27 @@ from accounts.models import CustomUser
 from main.models import Player, Club
 
 class Transaction(models.Model):
+    """Ledger: satu baris untuk setiap transfer yang selesai."""
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
     seller = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='sales')
     buyer = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='purchases')
-    price = models.IntegerField(default=0)
+    # Klub disimpan langsung agar history per klub tidak perlu join ke Profile
+    seller_club = models.ForeignKey(Club, on_delete=models.SET_NULL, null=True, blank=True, related_name='transfers_out')
+    buyer_club = models.ForeignKey(Club, on_delete=models.SET_NULL, null=True, blank=True, related_name='transfers_in')
+    negotiation = models.OneToOneField('Negotiation', on_delete=models.SET_NULL, null=True, blank=True, related_name='transaction')
+    price = models.BigIntegerField(default=0)
     timestamp = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp', 'id'], name='trx_timestamp_idx'),
+            models.Index(fields=['player', 'timestamp'], name='trx_player_timestamp_idx'),
+            models.Index(fields=['seller', 'timestamp'], name='trx_seller_timestamp_idx'),
+            models.Index(fields=['buyer', 'timestamp'], name='trx_buyer_timestamp_idx'),
+            models.Index(fields=['seller_club', 'timestamp'], name='trx_seller_club_ts_idx'),
+            models.Index(fields=['buyer_club', 'timestamp'], name='trx_buyer_club_ts_idx'),
+        ]
+
     def __str__(self):
         return f"{self.player.nama_pemain} - {self.seller} ➜ {self.buyer}"
     
@@ -27,6 +42,42 @@ class Negotiation(models.Model):
     offered_price = models.DecimalField(max_digits=15, decimal_places=2)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Change feed: keyset (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='nego_updated_idx'),
+            # Inbox tawaran masuk/keluar per klub, terbaru dulu
+            models.Index(fields=['to_club', 'created_at'], name='nego_to_club_created_idx'),
+            models.Index(fields=['from_club', 'created_at'], name='nego_from_club_created_idx'),
+            # Tawaran pending untuk pemain yang sama dibatalkan saat transfer
+            models.Index(fields=['player', 'status'], name='nego_player_status_idx'),
+            # Inbox per status (?status=pending), terbaru dulu
+            models.Index(fields=['to_club', 'status', 'created_at'], name='nego_to_club_status_idx'),
+            models.Index(fields=['from_club', 'status', 'created_at'], name='nego_from_club_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.from_club.name} → {self.to_club.name}: {self.player.nama_pemain} ({self.offered_price})"
+
+
+class NegotiationCounter(models.Model):
+    """
+    Jumlah negosiasi per klub, arah (masuk/keluar) dan status. Denormalisasi
+    untuk badge inbox: dibaca satu baris tanpa COUNT atas tabel Negotiation.
+    Dijaga di transaksi yang sama dengan perubahan negosiasi (lihat
+    player_transaction/counters.py).
+    """
+    club = models.OneToOneField(Club, on_delete=models.CASCADE, primary_key=True, related_name='negotiation_counter')
+    received_pending = models.IntegerField(default=0)
+    received_accepted = models.IntegerField(default=0)
+    received_rejected = models.IntegerField(default=0)
+    received_cancelled = models.IntegerField(default=0)
+    sent_pending = models.IntegerField(default=0)
+    sent_accepted = models.IntegerField(default=0)
+    sent_rejected = models.IntegerField(default=0)
+    sent_cancelled = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.club.name}: {self.received_pending} tawaran pending"
@@ -0,0 +1,42 @@
+# player_transaction/signals.py
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .counters import adjust, deltas_for, rebuild_counters
+from .models import Negotiation
+
+
+def _snapshot(instance):
+    return (instance.to_club_id, instance.from_club_id, instance.status)
+
+
+@receiver(post_init, sender=Negotiation)
+def remember_counted_state(sender, instance, **kwargs):
+    # Keadaan yang sudah tercatat di counter; None untuk instance yang belum disimpan
+    instance._counted = _snapshot(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Negotiation)
+def update_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    """Tawaran baru atau perubahan status lewat save() langsung mengubah counter."""
+    if raw:
+        return
+    current = _snapshot(instance)
+    previous = None if created else instance._counted
+    if previous == current:
+        return
+    deltas = deltas_for(*current)
+    if previous is not None:
+        for key, delta in deltas_for(*previous, -1).items():
+            deltas[key] = deltas.get(key, 0) + delta
+    adjust(deltas)
+    instance._counted = current
+
+
+@receiver(post_delete, sender=Negotiation)
+def update_counters_on_delete(sender, instance, **kwargs):
+    # Status instance bisa sudah basi (diubah lewat set_status); hitung ulang
+    # kedua klub dari tabel. Penghapusan negosiasi jarang terjadi. Baris yang
+    # belum ada tidak dibuat karena klubnya bisa jadi sedang dihapus (cascade).
+    rebuild_counters([instance.to_club_id, instance.from_club_id], create_missing=False)
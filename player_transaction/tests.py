@@ -1,9 +1,20 @@
-from django.test import TestCase, Client
+import threading
+import time
+from unittest import mock
+
+from django.db import connection, OperationalError
+from django.test import TestCase, TransactionTestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from main.models import Player, Club
 from accounts.models import Profile
-from player_transaction.models import Negotiation
+from player_transaction.counters import STATUSES, inbox_counts, rebuild_counters, set_status
+from player_transaction.models import Negotiation, NegotiationCounter, Transaction
+from player_transaction.transfers import TransferError, execute_transfer
+from player_transaction.views import filter_pemain_dijual
+from main.pagination import KeysetPaginator, encode_cursor
+from main.query_plans import QueryPlanAssertions, analyze
+from django.http import QueryDict
 import json
 
 User = get_user_model()
@@ -169,3 +180,536 @@ class PlayerTransactionViewTests(TestCase):
         data = response.json()
         self.assertIn("received_offers", data)
         self.assertGreaterEqual(len(data["received_offers"]), 1)
+
+
+class TransferMarketPaginationTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        self.club_a = Club.objects.create(name="Arsenal", country="England")
+        self.club_b = Club.objects.create(name="Chelsea", country="England")
+
+        self.user = User.objects.create_user(username="fan", password="12345")
+
+        positions = ["GK", "CB", "CM", "ST"]
+        for i in range(30):
+            Player.objects.create(
+                nama_pemain=f"Pemain {i}",
+                current_club=self.club_a if i % 2 == 0 else self.club_b,
+                position=positions[i % 4],
+                umur=18 + i,
+                negara="England" if i < 15 else "Brazil",
+                # Nilai kembar untuk menguji tie-break pada id
+                market_value=(i // 3) * 1_000_000,
+                sedang_dijual=True,
+            )
+        Player.objects.create(
+            nama_pemain="Tidak Dijual", current_club=self.club_a, position="GK",
+        )
+        self.client.login(username="fan", password="12345")
+        self.url = reverse("player_transaction:list_pemain_dijual_json")
+
+    def fetch_all(self, params):
+        names, cursor = [], None
+        while True:
+            query = dict(params)
+            if cursor:
+                query["cursor"] = cursor
+            response = self.client.get(self.url, query)
+            self.assertEqual(response.status_code, 200)
+            names.extend(p["nama_pemain"] for p in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return names
+
+    def test_default_limit_dan_header_cursor(self):
+        response = self.client.get(self.url, {"limit": 10})
+        data = response.json()
+        self.assertEqual(len(data), 10)
+        self.assertIn("X-Next-Cursor", response.headers)
+        self.assertIn('rel="next"', response.headers["Link"])
+        values = [p["market_value"] for p in data]
+        self.assertEqual(values, sorted(values))
+
+    def test_cursor_menelusuri_semua_pemain_tanpa_duplikat(self):
+        names = self.fetch_all({"limit": 7})
+        self.assertEqual(len(names), 30)
+        self.assertEqual(len(set(names)), 30)
+        self.assertNotIn("Tidak Dijual", names)
+
+    def test_filter_posisi_umur_value_negara_klub(self):
+        self.assertEqual(len(self.fetch_all({"posisi": "gk"})), 8)
+        self.assertEqual(len(self.fetch_all({"umur_min": 20, "umur_max": 24})), 5)
+        self.assertEqual(
+            len(self.fetch_all({"value_min": 2_000_000, "value_max": 3_000_000})), 6
+        )
+        self.assertEqual(len(self.fetch_all({"negara": "Brazil"})), 15)
+        self.assertEqual(len(self.fetch_all({"klub": self.club_b.id})), 15)
+
+    def test_parameter_tidak_valid(self):
+        self.assertEqual(self.client.get(self.url, {"umur_min": "x"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"cursor": "bukan-cursor"}).status_code, 400)
+
+    def test_jumlah_query_tetap_untuk_setiap_halaman(self):
+        first = self.client.get(self.url, {"limit": 5})
+        cursor = first.headers["X-Next-Cursor"]
+        # session + user + query pemain
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {"limit": 5, "cursor": cursor})
+
+    async def test_asgi_dan_is_my_club(self):
+        admin = await User.objects.acreate(username="admin_asgi", is_club_admin=True)
+        await Profile.objects.acreate(user=admin, managed_club=self.club_a)
+        await self.async_client.aforce_login(admin)
+
+        response = await self.async_client.get(self.url, {"limit": 6})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data), 6)
+        self.assertEqual([p["is_my_club"] for p in data], [p["nama_klub"] == "Arsenal" for p in data])
+        self.assertIn("X-Next-Cursor", response)
+
+        response = await self.async_client.get(self.url, {"umur_min": "x"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportEndpointTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        club = Club.objects.create(name="Arsenal")
+        for i in range(3):
+            Player.objects.create(nama_pemain=f"Pemain {i}", current_club=club, position="CM")
+
+    def test_show_json_streaming(self):
+        response = self.client.get(reverse("player_transaction:show_json"))
+        self.assertTrue(response.streaming)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[0]["club"], "Arsenal")
+
+    async def test_show_json_streaming_async_di_asgi(self):
+        response = await self.async_client.get(reverse("player_transaction:show_json"))
+        self.assertTrue(response.is_async)
+        data = json.loads(b"".join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual(len(data), 3)
+
+    def test_show_xml_streaming(self):
+        response = self.client.get(reverse("player_transaction:show_xml"))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/xml")
+        self.assertEqual(b"".join(response.streaming_content).count(b'<object model="main.player"'), 3)
+
+
+class AtomicTransferTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        self.seller = Club.objects.create(name="Chelsea")
+        self.buyer = Club.objects.create(name="Arsenal")
+        self.other = Club.objects.create(name="Liverpool")
+        self.player = Player.objects.create(
+            nama_pemain="Enzo Fernandez", current_club=self.seller, position="CM",
+            market_value=70_000_000, sedang_dijual=True,
+        )
+
+    def test_pembelian_membatalkan_semua_negosiasi_pending(self):
+        nego = Negotiation.objects.create(
+            from_club=self.other, to_club=self.seller, player=self.player, offered_price=1,
+        )
+        execute_transfer(self.player.id, self.buyer)
+        self.player.refresh_from_db()
+        nego.refresh_from_db()
+        self.assertEqual(self.player.current_club, self.buyer)
+        self.assertFalse(self.player.sedang_dijual)
+        self.assertEqual(nego.status, "cancelled")
+
+    def test_pembelian_kedua_ditolak(self):
+        execute_transfer(self.player.id, self.buyer)
+        with self.assertRaises(TransferError):
+            execute_transfer(self.player.id, self.other)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.current_club, self.buyer)
+
+    def test_accept_negosiasi_yang_sudah_tidak_pending_ditolak(self):
+        nego_a = Negotiation.objects.create(
+            from_club=self.buyer, to_club=self.seller, player=self.player, offered_price=1,
+        )
+        nego_b = Negotiation.objects.create(
+            from_club=self.other, to_club=self.seller, player=self.player, offered_price=2,
+        )
+        execute_transfer(self.player.id, self.buyer, negotiation=nego_a)
+        nego_b.refresh_from_db()
+        self.assertEqual(nego_b.status, "cancelled")
+
+        with self.assertRaises(TransferError):
+            execute_transfer(self.player.id, self.other, negotiation=nego_b)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.current_club, self.buyer)
+
+    def test_transfer_gagal_di_rollback(self):
+        nego = Negotiation.objects.create(
+            from_club=self.buyer, to_club=self.seller, player=self.player, offered_price=1,
+        )
+        # Pemain sudah pindah klub lewat jalur lain: tawaran tidak boleh jadi "accepted"
+        Player.objects.filter(pk=self.player.pk).update(current_club=self.other)
+        with self.assertRaises(TransferError):
+            execute_transfer(self.player.id, self.buyer, negotiation=nego)
+        nego.refresh_from_db()
+        self.assertEqual(nego.status, "pending")
+
+
+class ConcurrentPurchaseStressTest(TransactionTestCase):
+    """
+    Banyak pembeli paralel memperebutkan satu pemain; harus ada tepat satu
+    pemenang. Di SQLite penguncian terjadi per database, di Postgres lewat
+    SELECT ... FOR UPDATE pada baris pemain.
+    """
+
+    BUYERS = 12
+
+    def setUp(self):
+        Club.objects.all().delete()
+        self.seller = Club.objects.create(name="Seller FC")
+        self.buyers = [Club.objects.create(name=f"Buyer {i}") for i in range(self.BUYERS)]
+        self.player = Player.objects.create(
+            nama_pemain="Rebutan", current_club=self.seller, position="ST", sedang_dijual=True,
+        )
+        for club in self.buyers:
+            Negotiation.objects.create(
+                from_club=club, to_club=self.seller, player=self.player, offered_price=1,
+            )
+
+    def run_parallel(self, target):
+        barrier = threading.Barrier(self.BUYERS)
+        results = []
+        lock = threading.Lock()
+
+        def worker(club):
+            try:
+                barrier.wait()
+                outcome = None
+                while outcome is None:
+                    try:
+                        target(club)
+                        outcome = "win"
+                    except TransferError:
+                        outcome = "lose"
+                    except OperationalError:
+                        # SQLite: "database is locked" berarti transaksi lain sedang
+                        # menulis dan percobaan ini di-rollback; ulangi seperti client.
+                        time.sleep(0.01)
+                with lock:
+                    results.append((club, outcome))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(club,)) for club in self.buyers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def assert_single_winner(self, results):
+        winners = [club for club, outcome in results if outcome == "win"]
+        self.assertEqual(len(results), self.BUYERS)
+        self.assertEqual(len(winners), 1)
+
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.current_club_id, winners[0].id)
+        self.assertFalse(self.player.sedang_dijual)
+        self.assertFalse(Negotiation.objects.filter(status="pending").exists())
+        self.assertLessEqual(Negotiation.objects.filter(status="accepted").count(), 1)
+
+    def test_pembelian_paralel_hanya_satu_pemenang(self):
+        results = self.run_parallel(lambda club: execute_transfer(self.player.id, club))
+        self.assert_single_winner(results)
+
+    def test_accept_negosiasi_paralel_hanya_satu_pemenang(self):
+        negotiations = {n.from_club_id: n for n in Negotiation.objects.all()}
+        results = self.run_parallel(
+            lambda club: execute_transfer(
+                self.player.id, club, negotiation=negotiations[club.id]
+            )
+        )
+        self.assert_single_winner(results)
+
+
+class TransferLedgerTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        self.club_a = Club.objects.create(name="Arsenal")
+        self.club_b = Club.objects.create(name="Chelsea")
+        self.club_c = Club.objects.create(name="Liverpool")
+        self.user_a = User.objects.create_user(username="ledger_arsenal", password="12345", is_club_admin=True)
+        self.user_b = User.objects.create_user(username="ledger_chelsea", password="12345", is_club_admin=True)
+        Profile.objects.create(user=self.user_a, managed_club=self.club_a)
+        Profile.objects.create(user=self.user_b, managed_club=self.club_b)
+        self.player = Player.objects.create(
+            nama_pemain="Enzo Fernandez", current_club=self.club_b, position="CM",
+            market_value=70_000_000_000, sedang_dijual=True,
+        )
+
+    def test_pembelian_menulis_ledger(self):
+        self.client.login(username="ledger_arsenal", password="12345")
+        self.client.post(reverse("player_transaction:beli_pemain_ajax", args=[self.player.id]))
+
+        trx = Transaction.objects.get()
+        self.assertEqual(trx.player, self.player)
+        self.assertEqual(trx.buyer, self.user_a)
+        self.assertEqual(trx.seller, self.user_b)
+        self.assertEqual(trx.buyer_club, self.club_a)
+        self.assertEqual(trx.seller_club, self.club_b)
+        self.assertEqual(trx.price, 70_000_000_000)
+
+    def test_accept_negosiasi_menulis_ledger(self):
+        nego = Negotiation.objects.create(
+            from_club=self.club_a, to_club=self.club_b, player=self.player, offered_price=50_000_000,
+        )
+        self.client.login(username="ledger_chelsea", password="12345")
+        self.client.post(reverse("player_transaction:respond_negotiation", args=[nego.id, "accept"]))
+
+        trx = Transaction.objects.get()
+        self.assertEqual(trx.negotiation, nego)
+        self.assertEqual(trx.price, 50_000_000)
+        self.assertEqual(trx.seller, self.user_b)
+        self.assertEqual(trx.buyer, self.user_a)
+
+    def test_transfer_gagal_tidak_menulis_ledger(self):
+        self.player.sedang_dijual = False
+        self.player.save()
+        with self.assertRaises(TransferError):
+            execute_transfer(self.player.id, self.club_a)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_history_per_player_club_dan_user(self):
+        execute_transfer(self.player.id, self.club_a)
+        Player.objects.filter(pk=self.player.pk).update(sedang_dijual=True)
+        execute_transfer(self.player.id, self.club_c)
+        other = Player.objects.create(
+            nama_pemain="Lainnya", current_club=self.club_c, position="GK", sedang_dijual=True,
+        )
+        execute_transfer(other.id, self.club_b)
+
+        self.client.login(username="ledger_arsenal", password="12345")
+
+        url = reverse("player_transaction:player_transaction_history_json", args=[self.player.id])
+        data = self.client.get(url).json()
+        self.assertEqual([t["buyer_club"] for t in data], ["Liverpool", "Arsenal"])
+
+        url = reverse("player_transaction:club_transaction_history_json", args=[self.club_a.id])
+        self.assertEqual(len(self.client.get(url).json()), 2)
+
+        url = reverse("player_transaction:user_transaction_history_json", args=[self.user_b.id])
+        self.assertEqual(len(self.client.get(url).json()), 2)
+
+    def test_history_keyset_pagination(self):
+        for i in range(5):
+            Transaction.objects.create(player=self.player, price=i)
+        self.client.login(username="ledger_arsenal", password="12345")
+        url = reverse("player_transaction:transaction_history_json")
+
+        first = self.client.get(url, {"limit": 3})
+        self.assertEqual([t["price"] for t in first.json()], [4, 3, 2])
+        second = self.client.get(url, {"limit": 3, "cursor": first.headers["X-Next-Cursor"]})
+        self.assertEqual([t["price"] for t in second.json()], [1, 0])
+        self.assertNotIn("X-Next-Cursor", second.headers)
+
+
+class NegotiationInboxTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        self.seller = Club.objects.create(name="Chelsea")
+        self.buyer = Club.objects.create(name="Arsenal")
+        self.other = Club.objects.create(name="Liverpool")
+        self.player = Player.objects.create(
+            nama_pemain="Cole Palmer", current_club=self.seller, position="AM",
+            market_value=90_000_000, sedang_dijual=True,
+        )
+        self.admin = User.objects.create_user(username="chelsea_inbox", password="12345", is_club_admin=True)
+        Profile.objects.create(user=self.admin, managed_club=self.seller)
+        self.client.force_login(self.admin)
+
+    def offer(self, from_club, price=1, **kwargs):
+        return Negotiation.objects.create(
+            from_club=from_club, to_club=self.seller, player=self.player, offered_price=price, **kwargs
+        )
+
+    def assertCountersMatchTable(self):
+        for club in (self.seller, self.buyer, self.other):
+            counts = inbox_counts(club)
+            for status in STATUSES:
+                with self.subTest(club=club.name, status=status):
+                    self.assertEqual(
+                        counts["received"][status],
+                        Negotiation.objects.filter(to_club=club, status=status).count(),
+                    )
+                    self.assertEqual(
+                        counts["sent"][status],
+                        Negotiation.objects.filter(from_club=club, status=status).count(),
+                    )
+
+    def test_counter_mengikuti_create_reject_accept_dan_delete(self):
+        first = self.offer(self.buyer)
+        second = self.offer(self.other)
+        third = self.offer(self.other, price=2)
+        self.assertEqual(inbox_counts(self.seller)["received"]["pending"], 3)
+
+        self.client.post(reverse("player_transaction:respond_negotiation", args=[second.id, "reject"]))
+        self.assertCountersMatchTable()
+
+        self.client.post(reverse("player_transaction:respond_negotiation", args=[first.id, "accept"]))
+        third.refresh_from_db()
+        self.assertEqual(third.status, "cancelled")
+        self.assertCountersMatchTable()
+
+        second.delete()
+        self.assertCountersMatchTable()
+
+    def test_set_status_hanya_menghitung_baris_yang_berubah(self):
+        pending = self.offer(self.buyer)
+        self.offer(self.other, status="rejected")
+
+        updated = set_status(Negotiation.objects.filter(player=self.player), "rejected")
+
+        self.assertEqual(updated, 1)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, "rejected")
+        self.assertCountersMatchTable()
+
+    def test_counter_dibangun_ulang_setelah_bulk_create(self):
+        Negotiation.objects.bulk_create([
+            Negotiation(from_club=self.buyer, to_club=self.seller, player=self.player, offered_price=i)
+            for i in range(5)
+        ])
+        rebuild_counters()
+        self.assertCountersMatchTable()
+
+    def test_baris_counter_pertama_memuat_negosiasi_lama(self):
+        # Negosiasi lama tanpa baris counter (bulk_create tidak memicu signal)
+        Negotiation.objects.bulk_create([
+            Negotiation(from_club=self.buyer, to_club=self.seller, player=self.player, offered_price=i)
+            for i in range(2)
+        ])
+        self.offer(self.other)
+        self.assertCountersMatchTable()
+
+    def test_baris_counter_dibuat_request_lain_tidak_bentrok(self):
+        self.offer(self.buyer)
+        original = NegotiationCounter.objects.filter
+        calls = []
+
+        def filter_seolah_belum_ada(*args, **kwargs):
+            # UPDATE pertama tidak menemukan baris (baris dibuat request lain sesudahnya)
+            calls.append(kwargs)
+            queryset = original(*args, **kwargs)
+            return queryset.none() if len(calls) == 1 else queryset
+
+        with mock.patch.object(NegotiationCounter.objects, "filter", side_effect=filter_seolah_belum_ada):
+            self.offer(self.other)
+        self.assertCountersMatchTable()
+
+    def test_send_negotiation_rollback_jika_counter_gagal(self):
+        buyer_admin = User.objects.create_user(username="arsenal_inbox", password="12345", is_club_admin=True)
+        Profile.objects.create(user=buyer_admin, managed_club=self.buyer)
+        self.client.force_login(buyer_admin)
+        url = reverse("player_transaction:send_negotiation", args=[self.player.id])
+
+        with mock.patch("player_transaction.signals.adjust", side_effect=RuntimeError("counter")):
+            response = self.client.post(url, {"offered_price": 5}, content_type="application/json")
+
+        self.assertFalse(response.json()["success"])
+        self.assertFalse(Negotiation.objects.exists())
+
+    def test_badge_counts_satu_query_tanpa_scan_negotiation(self):
+        self.offer(self.buyer)
+        inbox_counts(self.seller)  # pastikan baris counter ada
+
+        with self.assertNumQueries(1) as queries:
+            counts = inbox_counts(self.seller)
+        self.assertNotIn('"player_transaction_negotiation"', queries.captured_queries[0]["sql"])
+        self.assertEqual(counts["received"]["pending"], 1)
+
+        response = self.client.get(reverse("player_transaction:negotiation_inbox_counts_json"))
+        self.assertEqual(response.json()["received"]["pending"], 1)
+
+    def test_inbox_received_dipaginasi_dan_disaring_status(self):
+        for i in range(5):
+            self.offer(self.buyer, price=i, status="rejected" if i % 2 else "pending")
+        url = reverse("player_transaction:negotiation_inbox_received_json")
+
+        first = self.client.get(url, {"limit": 2, "status": "pending"})
+        second = self.client.get(url, {"limit": 2, "status": "pending", "cursor": first["X-Next-Cursor"]})
+
+        self.assertEqual([n["offered_price"] for n in first.json()], [4.0, 2.0])
+        self.assertEqual([n["offered_price"] for n in second.json()], [0.0])
+        self.assertNotIn("X-Next-Cursor", second.headers)
+        self.assertEqual(self.client.get(url, {"status": "unknown"}).status_code, 400)
+
+    def test_inbox_json_halaman_pertama_dan_counts(self):
+        for i in range(3):
+            self.offer(self.buyer, price=i)
+
+        data = self.client.get(reverse("player_transaction:negotiation_inbox_json"), {"limit": 2}).json()
+
+        self.assertEqual(len(data["received_offers"]), 2)
+        self.assertIsNotNone(data["received_next"])
+        self.assertEqual(data["sent_offers"], [])
+        self.assertEqual(data["counts"]["received"]["pending"], 3)
+
+        sent = self.client.get(reverse("player_transaction:negotiation_inbox_sent_json"))
+        self.assertEqual(sent.json(), [])
+
+
+class NegotiationQueryPlanTests(QueryPlanAssertions, TestCase):
+    """EXPLAIN inbox negosiasi dan transfer market pada data seeded."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Club.objects.all().delete()
+        clubs = Club.objects.bulk_create([Club(name=f"Klub QP {i}") for i in range(20)])
+        players = Player.objects.bulk_create([
+            Player(current_club=clubs[i % 20], nama_pemain=f"Pemain {i}",
+                   position=("GK", "Bek-Tengah", "CM", "Sayap Kiri", "ST")[i // 20 % 5],
+                   market_value=(i * 7919) % 100_000, sedang_dijual=i % 20 == 0)
+            for i in range(2000)
+        ])
+        Negotiation.objects.bulk_create([
+            Negotiation(from_club=clubs[i % 20], to_club=clubs[(i + 7) % 20], player=players[i % 2000],
+                        offered_price=1000 + i, status=("pending", "rejected", "accepted")[i % 3])
+            for i in range(4000)
+        ])
+        analyze()
+        cls.club = clubs[5]
+        cls.player = players[42]
+
+    def test_inbox_received_and_sent(self):
+        self.assertUsesIndex(Negotiation.objects.filter(to_club=self.club).order_by("-created_at"))
+        self.assertUsesIndex(Negotiation.objects.filter(from_club=self.club).order_by("-created_at"))
+
+    def test_inbox_per_status(self):
+        self.assertUsesIndex(
+            Negotiation.objects.filter(to_club=self.club, status="pending").order_by("-created_at", "-id")
+        )
+        self.assertUsesIndex(
+            Negotiation.objects.filter(from_club=self.club, status="rejected").order_by("-created_at", "-id")
+        )
+
+    def test_pending_offers_for_player(self):
+        self.assertUsesIndex(Negotiation.objects.filter(player_id=self.player.pk, status="pending"))
+
+    def test_transfer_market_pages(self):
+        queryset = filter_pemain_dijual(
+            Player.objects.filter(sedang_dijual=True).select_related("current_club"), QueryDict()
+        )
+        paginator = KeysetPaginator(queryset, ("market_value", "id"), page_size=20)
+        self.assertUsesIndex(paginator.page_queryset())
+        self.assertUsesIndex(paginator.page_queryset(encode_cursor([50_000, str(self.player.pk)])))
+
+    def test_transfer_market_per_posisi(self):
+        queryset = filter_pemain_dijual(
+            Player.objects.filter(sedang_dijual=True), QueryDict("posisi=bek-tengah")
+        )
+        paginator = KeysetPaginator(queryset, ("market_value", "id"), page_size=20)
+        for page in (paginator.page_queryset(), paginator.page_queryset(encode_cursor([50_000, str(self.player.pk)]))):
+            self.assertUsesIndex(page)
+            self.assertRegex(page.explain(), r"SEARCH .*player_for_sale_position_idx")
+        self.assertEqual(len(paginator.page().items), 20)
@@ -0,0 +1,109 @@
+# player_transaction/transfers.py
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+from events.broker import publish_on_commit
+from main.models import Player
+from main.versioning import bump_roster_version
+from player_transaction.counters import set_status
+from player_transaction.models import Negotiation, Transaction
+
+
+class TransferError(Exception):
+    """Transfer ditolak. `status` adalah HTTP status yang cocok untuk response."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def club_admin_user(club_id):
+    """User admin yang mengelola klub, atau None jika belum ada."""
+    profile = (
+        Profile.objects.filter(managed_club_id=club_id, user__is_club_admin=True)
+        .select_related("user")
+        .order_by("id")
+        .first()
+    )
+    return profile.user if profile else None
+
+
+def execute_transfer(player_id, buyer_club, negotiation=None, buyer=None, seller=None):
+    """
+    Pindahkan pemain ke `buyer_club` sebagai satu unit atomik.
+
+    - Baris pemain dikunci dengan SELECT ... FOR UPDATE (Postgres) sehingga
+      pembeli lain menunggu sampai transaksi ini selesai.
+    - UPDATE bersyarat (sedang_dijual=True untuk pembelian langsung, atau
+      negosiasi masih pending untuk tawaran) memastikan hanya ada satu
+      pemenang, termasuk di SQLite yang tidak mendukung row lock.
+    - Semua negosiasi pending lain untuk pemain ini dibatalkan di transaksi
+      yang sama (counter inbox ikut disesuaikan lewat set_status).
+    - Satu baris Transaction (ledger) ditulis di transaksi yang sama.
+      `buyer`/`seller` adalah user yang bertransaksi; jika kosong diisi
+      admin dari klub pembeli/penjual.
+
+    Mengembalikan Player yang sudah ter-update, atau raise TransferError.
+    """
+    with transaction.atomic():
+        try:
+            player = Player.objects.select_for_update().get(pk=player_id)
+        except Player.DoesNotExist:
+            raise TransferError("Pemain tidak ditemukan.", status=404)
+
+        seller_club_id = player.current_club_id
+        if seller_club_id == buyer_club.id:
+            raise TransferError("Tidak bisa membeli pemain dari klub sendiri.")
+
+        guard = Player.objects.filter(pk=player.pk, current_club_id=seller_club_id)
+        if negotiation is None:
+            # Pembelian langsung hanya untuk pemain yang masih di Transfer Market
+            guard = guard.filter(sedang_dijual=True)
+        else:
+            if negotiation.player_id != player.pk or negotiation.to_club_id != seller_club_id:
+                raise TransferError("Tawaran ini sudah tidak berlaku.", status=409)
+            accepted = set_status(
+                Negotiation.objects.filter(pk=negotiation.pk, status="pending"), "accepted"
+            )
+            if not accepted:
+                raise TransferError("Tawaran ini sudah tidak berstatus pending.", status=409)
+
+        updated = guard.update(current_club=buyer_club, sedang_dijual=False, updated_at=timezone.now())
+        if not updated:
+            if negotiation is None:
+                raise TransferError("Pemain ini tidak sedang dijual di Transfer Market.")
+            raise TransferError("Pemain ini sudah berpindah klub.", status=409)
+
+        set_status(Negotiation.objects.filter(player_id=player.pk, status="pending"), "cancelled")
+
+        Transaction.objects.create(
+            player_id=player.pk,
+            seller=seller or club_admin_user(seller_club_id),
+            buyer=buyer or club_admin_user(buyer_club.id),
+            seller_club_id=seller_club_id,
+            buyer_club=buyer_club,
+            negotiation=negotiation,
+            price=int(negotiation.offered_price) if negotiation else player.market_value,
+        )
+
+        # .update() tidak memicu post_save, jadi cache homepage di-invalidate manual
+        transaction.on_commit(bump_roster_version)
+        publish_on_commit("player.sold", {
+            "player_id": str(player.pk),
+            "from_club_id": seller_club_id,
+            "to_club_id": buyer_club.id,
+            "price": int(negotiation.offered_price) if negotiation else player.market_value,
+        })
+        if negotiation is not None:
+            publish_on_commit(
+                "negotiation.responded",
+                {"id": negotiation.pk, "status": "accepted", "player_id": str(player.pk)},
+                clubs={negotiation.from_club_id, negotiation.to_club_id},
+            )
+
+    player.current_club = buyer_club
+    player.sedang_dijual = False
+    return player
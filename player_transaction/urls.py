@@ -16,6 +16,9 @@ urlpatterns = [
     path('beli/<uuid:player_id>/', views.beli_pemain_ajax, name='beli_pemain_ajax'),
     path('inbox/', views.negotiation_inbox_view, name='negotiation_inbox'),
     path('inbox/json', views.negotiation_inbox_json, name='negotiation_inbox_json'),
+    path('inbox/received/json', views.negotiation_inbox_received_json, name='negotiation_inbox_received_json'),
+    path('inbox/sent/json', views.negotiation_inbox_sent_json, name='negotiation_inbox_sent_json'),
+    path('inbox/counts/json', views.negotiation_inbox_counts_json, name='negotiation_inbox_counts_json'),
     path('send-negotiation/<uuid:player_id>/', views.send_negotiation, name='send_negotiation'),
     path('negotiation/<int:nego_id>/<str:action>/', views.respond_negotiation, name='respond_negotiation'),
 
@@ -26,4 +29,7 @@ urlpatterns = [
     path('show_xml_by_id/<uuid:player_id>/', views.show_xml_by_id, name='show_xml_by_id'),
     path('show_json_by_id/<uuid:player_id>/', views.show_json_by_id, name='show_json_by_id'),
     path('api/transaction_history/', views.transaction_history_json, name='transaction_history_json'),
+    path('api/transaction_history/player/<uuid:player_id>/', views.player_transaction_history_json, name='player_transaction_history_json'),
+    path('api/transaction_history/club/<int:club_id>/', views.club_transaction_history_json, name='club_transaction_history_json'),
+    path('api/transaction_history/user/<int:user_id>/', views.user_transaction_history_json, name='user_transaction_history_json'),
 ]
\ No newline at end of file
@@ -11,9 +11,17 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.http import HttpResponseRedirect, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Upper
 from accounts.models import Profile, CustomUser
 from main.models import Player, Club
 from player_transaction.models import Negotiation, Transaction
+from events.broker import publish_on_commit
+from player_transaction.counters import STATUSES, inbox_counts, set_status
+from player_transaction.transfers import TransferError, execute_transfer
+from main.pagination import KeysetPaginator, keyset_json_response, parse_page_size
+from main.streaming import StreamingJsonResponse, StreamingXmlResponse, values_for
 
 def club_admin_required(user):
     return user.is_authenticated and user.is_club_admin
@@ -23,20 +31,74 @@ def list_pemain_dijual_view(request):
     """Menampilkan halaman list pemain yang sedang dijual (HTML)"""
     return render(request, "list_pemain_dijual.html")
 
+# Filter yang didukung oleh list_pemain_dijual_json: nama parameter -> lookup ORM
+MARKET_INT_FILTERS = {
+    "umur_min": "umur__gte",
+    "umur_max": "umur__lte",
+    "value_min": "market_value__gte",
+    "value_max": "market_value__lte",
+    "klub": "current_club_id",
+}
+MARKET_TEXT_FILTERS = {
+    "negara": "negara__iexact",
+}
+
+
+def filter_pemain_dijual(queryset, params):
+    """Terapkan filter transfer market dari query string. ValueError jika angka tidak valid."""
+    for param, lookup in MARKET_INT_FILTERS.items():
+        value = params.get(param, "").strip()
+        if value:
+            try:
+                queryset = queryset.filter(**{lookup: int(value)})
+            except ValueError:
+                raise ValueError(f"Parameter {param} harus berupa angka.")
+
+    for param, lookup in MARKET_TEXT_FILTERS.items():
+        value = params.get(param, "").strip()
+        if value:
+            queryset = queryset.filter(**{lookup: value})
+
+    posisi = params.get("posisi", "").strip()
+    if posisi:
+        # Ekspresi sama persis dengan index player_for_sale_position_idx
+        queryset = queryset.alias(position_upper=Upper("position")).filter(position_upper=posisi.upper())
+
+    return queryset
+
+
 @login_required(login_url='/accounts/login/')
-def list_pemain_dijual_json(request):
-    """Endpoint AJAX: Mengembalikan daftar pemain yang sedang dijual (JSON)"""
-    pemain_list = Player.objects.filter(sedang_dijual=True).select_related('current_club')
-    
-    # Cek klub user jika admin club
-    user_club = None
-    if request.user.is_club_admin:
-        try:
-            profile = Profile.objects.get(user=request.user)
-            user_club = profile.managed_club
-        except Profile.DoesNotExist:
-            pass
-    
+async def list_pemain_dijual_json(request):
+    """
+    Endpoint AJAX: Mengembalikan daftar pemain yang sedang dijual (JSON).
+
+    Hasil dipaginasi dengan cursor (keyset) berurutan (market_value, id).
+    Query string: limit, cursor, posisi, umur_min, umur_max, value_min,
+    value_max, negara, klub. Cursor halaman berikutnya ada di header X-Next-Cursor.
+    View async (ORM async), di WSGI tetap jalan lewat adapter Django.
+    """
+    try:
+        pemain_list = filter_pemain_dijual(
+            Player.objects.filter(sedang_dijual=True).select_related('current_club'),
+            request.GET,
+        )
+        paginator = KeysetPaginator(
+            pemain_list,
+            ordering=("market_value", "id"),
+            page_size=parse_page_size(request.GET.get("limit")),
+        )
+        page = await paginator.apage(request.GET.get("cursor"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    # Cek klub user jika admin club (cukup id klubnya)
+    user = await request.auser()
+    user_club_id = None
+    if user.is_club_admin:
+        user_club_id = await Profile.objects.filter(user=user).values_list(
+            'managed_club_id', flat=True
+        ).afirst()
+
     data = [
         {
             "id": p.id,
@@ -50,12 +112,12 @@ def list_pemain_dijual_json(request):
             "market_value": p.market_value,
             "thumbnail": p.thumbnail,
             "nama_klub": p.current_club.name if p.current_club else "-",
-            "is_my_club": user_club is not None and p.current_club == user_club,  # True jika pemain dari klub user
+            "is_my_club": user_club_id is not None and p.current_club_id == user_club_id,  # True jika pemain dari klub user
         }
-        for p in pemain_list
+        for p in page.items
     ]
 
-    return JsonResponse(data, safe=False)
+    return keyset_json_response(request, page, data)
 
 @login_required(login_url='/accounts/login/')
 def list_pemain_saya(request):
@@ -159,6 +221,11 @@ def jual_pemain_ajax(request, player_id):
 
     player.sedang_dijual = True
     player.save()
+    publish_on_commit("player.listed", {
+        "player_id": str(player.id),
+        "club_id": player.current_club_id,
+        "market_value": player.market_value,
+    })
 
     return JsonResponse({
         'success': True,
@@ -229,44 +296,27 @@ def beli_pemain_ajax(request, player_id):
             }, status=400)
         
         pembeli_club = profile.managed_club
-        player = Player.objects.get(id=player_id)
-        
-        # Cek apakah pemain sedang dijual
-        if not player.sedang_dijual:
-            return JsonResponse({
-                'success': False,
-                'message': 'Pemain ini tidak sedang dijual di Transfer Market.'
-            }, status=400)
-        
-        # Cek apakah pemain dari klub sendiri (tidak bisa beli pemain sendiri)
-        if player.current_club == pembeli_club:
-            return JsonResponse({
-                'success': False,
-                'message': 'Tidak bisa membeli pemain dari klub sendiri.'
-            }, status=400)
-        
     except Profile.DoesNotExist:
         return JsonResponse({
             'success': False,
             'message': 'Profile tidak ditemukan.'
         }, status=404)
-    except Player.DoesNotExist:
+
+    # Cek status jual, klub sendiri, dan perpindahan klub dilakukan atomik
+    # di execute_transfer agar dua pembeli tidak bisa sama-sama menang.
+    try:
+        player = execute_transfer(player_id, pembeli_club, buyer=request.user)
+    except TransferError as e:
         return JsonResponse({
             'success': False,
-            'message': 'Pemain tidak ditemukan.'
-        }, status=404)
+            'message': e.message
+        }, status=e.status)
     except Exception as e:
         return JsonResponse({
             'success': False,
             'message': f'Terjadi kesalahan: {str(e)}'
         }, status=500)
 
-    player.current_club = pembeli_club
-    player.sedang_dijual = False
-    player.save()
-
-    Negotiation.objects.filter(player=player, status='pending').update(status='cancelled')
-
     return JsonResponse({
         'success': True,
         'message': f"{player.nama_pemain} berhasil dibeli oleh {pembeli_club.name}!"
@@ -286,49 +336,116 @@ def negotiation_inbox_view(request):
     return render(request, 'negotiation_inbox.html', {"club": club})
 
 
+def _inbox_club(request):
+    """Klub yang dikelola admin yang login, atau None."""
+    profile = get_object_or_404(Profile.objects.select_related('managed_club'), user=request.user)
+    return profile.managed_club
+
+
+def _negotiation_row(n, direction):
+    # Tawaran masuk menampilkan klub pengirim, tawaran keluar klub tujuan
+    other = "from_club" if direction == "received" else "to_club"
+    return {
+        "id": n.id,
+        other: getattr(n, other).name,
+        "player": n.player.nama_pemain,
+        "player_id": str(n.player.id),
+        "offered_price": float(n.offered_price),
+        "status": n.status,  # Return status code for mobile compatibility
+        "created_at": n.created_at.isoformat(),  # ISO format for mobile
+    }
+
+
+def _inbox_page(club, direction, params):
+    """
+    Satu halaman tawaran masuk/keluar, terbaru dulu, dengan keyset pagination
+    (created_at, id). ?status= menyaring per status; ValueError jika tidak valid.
+    """
+    if direction == "received":
+        negotiations = Negotiation.objects.filter(to_club=club).select_related('from_club', 'player')
+    else:
+        negotiations = Negotiation.objects.filter(from_club=club).select_related('to_club', 'player')
+
+    status = params.get("status", "").strip()
+    if status:
+        if status not in STATUSES:
+            raise ValueError(f"Status harus salah satu dari: {', '.join(STATUSES)}.")
+        negotiations = negotiations.filter(status=status)
+
+    paginator = KeysetPaginator(
+        negotiations,
+        ordering=('-created_at', '-id'),
+        page_size=parse_page_size(params.get("limit")),
+    )
+    page = paginator.page(params.get("cursor"))
+    return page, [_negotiation_row(n, direction) for n in page.items]
+
+
 @login_required(login_url='/accounts/login/')
 @user_passes_test(club_admin_required)
 def negotiation_inbox_json(request):
-    """Endpoint AJAX — mengembalikan data negosiasi dalam format JSON"""
-    profile = get_object_or_404(Profile, user=request.user)
-    club = profile.managed_club
+    """
+    Endpoint AJAX — halaman pertama tawaran masuk dan keluar plus counter
+    per status. Halaman berikutnya lewat negotiation_inbox_received_json /
+    negotiation_inbox_sent_json dengan cursor di received_next / sent_next.
+    """
+    club = _inbox_club(request)
 
     if not club:
         return JsonResponse({"error": "Anda bukan admin klub."}, status=400)
 
-    received_offers = Negotiation.objects.filter(to_club=club).select_related('from_club', 'player').order_by('-created_at')
-    sent_offers = Negotiation.objects.filter(from_club=club).select_related('to_club', 'player').order_by('-created_at')
+    try:
+        received, received_offers = _inbox_page(club, "received", request.GET)
+        sent, sent_offers = _inbox_page(club, "sent", request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
     data = {
-        "received_offers": [
-            {
-                "id": n.id,
-                "from_club": n.from_club.name,
-                "player": n.player.nama_pemain,
-                "player_id": str(n.player.id),
-                "offered_price": float(n.offered_price),
-                "status": n.status,  # Return status code for mobile compatibility
-                "created_at": n.created_at.isoformat(),  # ISO format for mobile
-            }
-            for n in received_offers
-        ],
-        "sent_offers": [
-            {
-                "id": n.id,
-                "to_club": n.to_club.name,
-                "player": n.player.nama_pemain,
-                "player_id": str(n.player.id),
-                "offered_price": float(n.offered_price),
-                "status": n.status,  # Return status code for mobile compatibility
-                "created_at": n.created_at.isoformat(),  # ISO format for mobile
-            }
-            for n in sent_offers
-        ]
+        "received_offers": received_offers,
+        "sent_offers": sent_offers,
+        "received_next": received.next_cursor,
+        "sent_next": sent.next_cursor,
+        "counts": inbox_counts(club),
     }
 
     return JsonResponse(data)
 
 
+def _inbox_direction_json(request, direction):
+    club = _inbox_club(request)
+    if not club:
+        return JsonResponse({"error": "Anda bukan admin klub."}, status=400)
+    try:
+        page, data = _inbox_page(club, direction, request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return keyset_json_response(request, page, data)
+
+
+@login_required(login_url='/accounts/login/')
+@user_passes_test(club_admin_required)
+def negotiation_inbox_received_json(request):
+    """Tawaran masuk (query string: limit, cursor, status). Cursor di header X-Next-Cursor."""
+    return _inbox_direction_json(request, "received")
+
+
+@login_required(login_url='/accounts/login/')
+@user_passes_test(club_admin_required)
+def negotiation_inbox_sent_json(request):
+    """Tawaran keluar (query string: limit, cursor, status). Cursor di header X-Next-Cursor."""
+    return _inbox_direction_json(request, "sent")
+
+
+@login_required(login_url='/accounts/login/')
+@user_passes_test(club_admin_required)
+def negotiation_inbox_counts_json(request):
+    """Badge inbox: jumlah tawaran per arah dan status, dibaca dari NegotiationCounter."""
+    club = _inbox_club(request)
+    if not club:
+        return JsonResponse({"error": "Anda bukan admin klub."}, status=400)
+    return JsonResponse(inbox_counts(club))
+
+
 
 # --- Kirim tawaran (dari halaman pemain dijual) ---
 @csrf_exempt  # Exempt CSRF for Flutter/mobile API calls
@@ -349,12 +466,14 @@ def send_negotiation(request, player_id):
         if from_club == to_club:
             return JsonResponse({'success': False, 'message': 'Tidak bisa menawar pemain dari klub sendiri.'})
 
-        Negotiation.objects.create(
-            from_club=from_club,
-            to_club=to_club,
-            player=player,
-            offered_price=offered_price,
-        )
+        # Tawaran dan counter inbox (post_save) commit bersama atau tidak sama sekali
+        with transaction.atomic():
+            Negotiation.objects.create(
+                from_club=from_club,
+                to_club=to_club,
+                player=player,
+                offered_price=offered_price,
+            )
 
         return JsonResponse({'success': True, 'message': 'Tawaran berhasil dikirim!'})
     except Exception as e:
@@ -376,27 +495,29 @@ def respond_negotiation(request, nego_id, action):
         return JsonResponse({'success': False, 'message': 'Anda tidak berhak merespons tawaran ini.'})
 
     if action == 'accept':
+        # Terima tawaran + pindahkan pemain + batalkan tawaran lain dalam satu transaksi
+        try:
+            execute_transfer(nego.player_id, nego.from_club, negotiation=nego, seller=request.user)
+        except TransferError as e:
+            return JsonResponse({'success': False, 'message': e.message}, status=e.status)
         nego.status = 'accepted'
-        nego.save()
-
-        player = nego.player
-        player.current_club = nego.from_club  #  Pemain berpindah ke klub pembeli
-        player.sedang_dijual = False
-        player.save()
-
-        #  Batalkan semua negosiasi lain pada pemain ini
-        Negotiation.objects.filter(player=player).exclude(id=nego.id).filter(status='pending').update(status='cancelled')
         new_status = "Accepted"
 
     elif action == 'reject':
+        # UPDATE bersyarat: tawaran yang sudah diterima/dibatalkan tidak bisa ditolak
+        if not set_status(Negotiation.objects.filter(pk=nego.pk, status='pending'), 'rejected'):
+            return JsonResponse({'success': False, 'message': 'Tawaran ini sudah tidak berstatus pending.'}, status=409)
+        publish_on_commit(
+            "negotiation.responded",
+            {"id": nego.id, "status": "rejected", "player_id": str(nego.player_id)},
+            clubs={nego.from_club_id, nego.to_club_id},
+        )
         nego.status = 'rejected'
-        nego.save()
         message = f"Tawaran dari {nego.from_club.name} ditolak."
         new_status = "Rejected"
     else:
         return JsonResponse({'success': False, 'message': 'Aksi tidak valid.'})
 
-    nego.save()
     return JsonResponse({'success': True, 'message': f'Tawaran {action}ed!', 'new_status': new_status})
 
 
@@ -425,30 +546,34 @@ def respond_negotiation(request, nego_id, action):
 
 
 def show_xml(request):
-     pemain_list = Player.objects.all()
-     xml_data = serializers.serialize("xml", pemain_list)
-     return HttpResponse(xml_data, content_type="application/xml")
-
-def show_json(request):
-    pemain_list = Player.objects.select_related('current_club').all()
-    
-    data = [
-        {
-            'id': str(pemain.id),
-            'nama_pemain': pemain.nama_pemain,
-            'club': pemain.current_club.name,
-            'umur': pemain.umur,
-            'market_value': pemain.market_value,
-            'negara': pemain.negara,
-            'jumlah_goal': pemain.jumlah_goal,
-            'jumlah_asis': pemain.jumlah_asis,
-            'jumlah_match': pemain.jumlah_match,
-            'sedang_dijual': pemain.sedang_dijual,
-        }
-        for pemain in pemain_list
-    ]
+     pemain_list = Player.objects.order_by('pk')
+     return StreamingXmlResponse(pemain_list)
+
+def _pemain_export_row(row):
+    return {
+        'id': str(row['id']),
+        'nama_pemain': row['nama_pemain'],
+        'club': row['current_club__name'],
+        'umur': row['umur'],
+        'market_value': row['market_value'],
+        'negara': row['negara'],
+        'jumlah_goal': row['jumlah_goal'],
+        'jumlah_asis': row['jumlah_asis'],
+        'jumlah_match': row['jumlah_match'],
+        'sedang_dijual': row['sedang_dijual'],
+    }
 
-    return JsonResponse(data, safe=False, json_dumps_params={'indent': 2})
+async def show_json(request):
+    # Di-stream per batch agar memori tetap konstan berapapun jumlah pemain
+    # (iterator async di ASGI, sync di WSGI)
+    rows = values_for(
+        request,
+        Player.objects.order_by('pk'),
+        ('id', 'nama_pemain', 'current_club__name', 'umur', 'market_value', 'negara',
+         'jumlah_goal', 'jumlah_asis', 'jumlah_match', 'sedang_dijual'),
+        transform=_pemain_export_row,
+    )
+    return StreamingJsonResponse(rows, indent=2)
 
 
 def show_xml_by_id(request, product_id):
@@ -479,11 +604,21 @@ def show_json_by_id(request, product_id):
         return JsonResponse({'detail': 'Not found'}, status=404)
 
 # --- Transaction History API (untuk mobile) ---
-@login_required(login_url='/accounts/login/')
-def transaction_history_json(request):
-    """Endpoint API: Mengembalikan history transaksi dalam format JSON"""
-    transactions = Transaction.objects.select_related('player', 'seller', 'buyer').order_by('-timestamp')[:50]
-    
+def _transaction_history_response(request, transactions):
+    """
+    Satu halaman history transaksi, terbaru dulu, dengan keyset pagination
+    (timestamp, id) sehingga query memakai index timestamp yang sesuai.
+    """
+    try:
+        paginator = KeysetPaginator(
+            transactions.select_related('player', 'seller', 'buyer', 'seller_club', 'buyer_club'),
+            ordering=('-timestamp', '-id'),
+            page_size=parse_page_size(request.GET.get('limit')),
+        )
+        page = paginator.page(request.GET.get('cursor'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
     data = [
         {
             'id': str(t.id),
@@ -493,10 +628,38 @@ def transaction_history_json(request):
             'seller_name': t.seller.username if t.seller else None,
             'buyer_id': str(t.buyer.id) if t.buyer else None,
             'buyer_name': t.buyer.username if t.buyer else None,
+            'seller_club': t.seller_club.name if t.seller_club else None,
+            'buyer_club': t.buyer_club.name if t.buyer_club else None,
             'price': t.price,
             'timestamp': t.timestamp.isoformat(),
         }
-        for t in transactions
+        for t in page.items
     ]
-    
-    return JsonResponse(data, safe=False)
\ No newline at end of file
+
+    return keyset_json_response(request, page, data)
+
+
+@login_required(login_url='/accounts/login/')
+def transaction_history_json(request):
+    """Endpoint API: Mengembalikan history transaksi dalam format JSON"""
+    return _transaction_history_response(request, Transaction.objects.all())
+
+
+@login_required(login_url='/accounts/login/')
+def player_transaction_history_json(request, player_id):
+    """History transfer satu pemain"""
+    return _transaction_history_response(request, Transaction.objects.filter(player_id=player_id))
+
+
+@login_required(login_url='/accounts/login/')
+def club_transaction_history_json(request, club_id):
+    """History transfer masuk dan keluar satu klub"""
+    transactions = Transaction.objects.filter(Q(seller_club_id=club_id) | Q(buyer_club_id=club_id))
+    return _transaction_history_response(request, transactions)
+
+
+@login_required(login_url='/accounts/login/')
+def user_transaction_history_json(request, user_id):
+    """History transaksi di mana user menjadi penjual atau pembeli"""
+    transactions = Transaction.objects.filter(Q(seller_id=user_id) | Q(buyer_id=user_id))
+    return _transaction_history_response(request, transactions)
@@ -3,6 +3,14 @@ ASGI config for premiere_trade project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Jalankan dengan uvicorn (satu event loop per worker):
+
+    uvicorn premiere_trade.asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
+Semua middleware proyek async-capable sehingga view async (feed rumor,
+bursa transfer, export JSON, thread reply) dan stream SSE tidak menahan
+thread selama menunggu database atau client.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
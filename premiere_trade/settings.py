@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -29,6 +30,9 @@ SECRET_KEY = "django-insecure-n=temx@qa5k-w!b*=!2vuuvf3wa!$#q=z&qsbm@b7#^eg-82a1
 
 PRODUCTION = os.getenv("PRODUCTION", "False").lower() == "true"
 
+# Sedang dijalankan oleh `manage.py test`
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = not PRODUCTION
 
@@ -82,13 +86,19 @@ INSTALLED_APPS = [
     "player_transaction",
     "rumors",
     "authentication",
+    "search",
+    "changes",
+    "events",
+    "benchmarks",
     "corsheaders",
 ]
 
 MIDDLEWARE = [
+    # Paling luar agar query dari middleware lain (session, auth) ikut terhitung
+    "main.middleware.QueryInstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "main.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -155,6 +165,31 @@ else:
         }
     }
 
+# Cache
+# Default: local-memory (per proses). Untuk beberapa worker gunicorn, isi
+# CACHE_DIR agar semua worker berbagi cache berbasis file (termasuk
+# roster version yang dipakai untuk invalidasi cache homepage).
+CACHE_DIR = os.getenv("CACHE_DIR")
+if CACHE_DIR:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_DIR,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "premiere-trade",
+        }
+    }
+
+# ETag/Last-Modified dari counter versi (main/conditional.py) hanya benar
+# jika semua worker membaca counter yang sama. LocMem per proses hanya aman
+# untuk satu proses (dev/test); di production perlu CACHE_DIR.
+VERSION_VALIDATORS_ENABLED = bool(CACHE_DIR) or not PRODUCTION
+
 AUTH_USER_MODEL = "accounts.CustomUser"
 
 # Password validation
@@ -208,3 +243,77 @@ MEDIA_URL = "/media/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Jumlah pemain termahal per klub yang ditampilkan di homepage
+HOMEPAGE_TOP_PLAYERS = int(os.getenv("HOMEPAGE_TOP_PLAYERS", 4))
+
+# Lama cache data & fragment homepage (detik)
+HOMEPAGE_CACHE_TIMEOUT = int(os.getenv("HOMEPAGE_CACHE_TIMEOUT", 60 * 60))
+
+# Jeda minimum (detik) antar flush buffer view rumor ke database
+RUMOR_VIEW_FLUSH_INTERVAL = int(os.getenv("RUMOR_VIEW_FLUSH_INTERVAL", 10))
+# Thread latar yang mem-flush buffer setiap interval walau tidak ada view baru.
+# Dimatikan saat test agar tidak menulis dari koneksi lain di tengah transaksi test.
+RUMOR_VIEW_FLUSH_BACKGROUND = not TESTING
+
+# Change feed (changes app): baris yang ditulis dalam N detik terakhir ditunda
+# ke poll berikutnya agar transaksi yang commit belakangan tidak terlewat.
+# Tombstone lebih tua dari CHANGE_FEED_TOMBSTONE_DAYS dihapus oleh
+# manage.py prune_tombstones; cursor yang lebih tua mendapat 410.
+CHANGE_FEED_SETTLE_SECONDS = int(os.getenv("CHANGE_FEED_SETTLE_SECONDS", 2))
+CHANGE_FEED_TOMBSTONE_DAYS = int(os.getenv("CHANGE_FEED_TOMBSTONE_DAYS", 30))
+
+# Push event (events app). EVENTS_BROKER adalah backend pub/sub; default-nya
+# hanya menyebarkan event di dalam satu proses worker. Stream SSE di WSGI
+# ditutup setelah satu batch atau EVENTS_LONG_POLL_SECONDS (long-polling).
+EVENTS_BROKER = os.getenv("EVENTS_BROKER", "events.broker.InProcessBroker")
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", 1000))
+EVENTS_HEARTBEAT_SECONDS = int(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+EVENTS_LONG_POLL_SECONDS = int(os.getenv("EVENTS_LONG_POLL_SECONDS", 25))
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", 3000))
+
+# Instrumentasi per request (jumlah query, waktu DB, query duplikat, latency).
+# Satu baris JSON per request dikirim ke logger "premiere_trade.requests":
+# - kosong (default): tidak ditulis ke mana pun (header Server-Timing tetap ada)
+# - "-": ke stdout, untuk dikumpulkan log collector platform
+# - path file: ditambahkan (append) lewat WatchedFileHandler. Beberapa worker
+#   boleh menulis ke file yang sama, tetapi rotasi harus dari luar (logrotate
+#   dengan move/create); handler membuka ulang file setelah dipindah. Jangan
+#   memakai rotasi in-process: tiap worker akan merotasi file sendiri-sendiri.
+# Test runner selalu memakai NullHandler. Ringkasan: manage.py request_metrics
+REQUEST_METRICS_ENABLED = os.getenv("REQUEST_METRICS_ENABLED", "True").lower() == "true"
+REQUEST_METRICS_LOG = os.getenv("REQUEST_METRICS_LOG", "")
+
+if TESTING or not REQUEST_METRICS_LOG:
+    REQUEST_METRICS_HANDLER = {"class": "logging.NullHandler"}
+elif REQUEST_METRICS_LOG == "-":
+    REQUEST_METRICS_HANDLER = {
+        "class": "logging.StreamHandler",
+        "stream": "ext://sys.stdout",
+        "formatter": "message",
+    }
+else:
+    REQUEST_METRICS_HANDLER = {
+        "class": "main.middleware.RequestLogHandler",
+        "filename": REQUEST_METRICS_LOG,
+        "delay": True,
+        "formatter": "message",
+    }
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "message": {"format": "%(message)s"},
+    },
+    "handlers": {
+        "request_metrics": REQUEST_METRICS_HANDLER,
+    },
+    "loggers": {
+        "premiere_trade.requests": {
+            "handlers": ["request_metrics"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
@@ -12,4 +12,7 @@ urlpatterns = [
     path('rumors/', include(('rumors.urls', 'rumors'), namespace='rumors')),       
     path('best_eleven/', include('best_eleven.urls')),    
     path('auth/', include('authentication.urls')),
+    path('search/', include('search.urls')),
+    path('changes/', include('changes.urls')),
+    path('events/', include('events.urls')),
 ]
\ No newline at end of file
@@ -0,0 +1,135 @@
+# rumors/feed.py
+
+from django.db.models import BooleanField, ExpressionWrapper, Q, Value
+
+from accounts.models import Profile
+from rumors.models import Rumors
+from search.index import matching_ids
+
+DEFAULT_THUMBNAIL = "https://cdn-icons-png.flaticon.com/512/149/149071.png"
+
+# Semua kolom yang dibutuhkan feed diambil lewat satu query .values() dengan JOIN
+FEED_FIELDS = (
+    "id",
+    "title",
+    "content",
+    "status",
+    "created_at",
+    "rumors_views",
+    "author__username",
+    "pemain_id",
+    "pemain__nama_pemain",
+    "pemain__thumbnail",
+    "pemain__market_value",
+    "pemain__umur",
+    "pemain__position",
+    "pemain__negara",
+    "club_asal_id",
+    "club_asal__name",
+    "club_asal__logo_url",
+    "club_tujuan_id",
+    "club_tujuan__name",
+    "club_tujuan__logo_url",
+    "is_author",
+    "is_admin",
+)
+
+
+def managed_club_id_for(user):
+    """ID klub yang dikelola user (hanya untuk admin klub), satu query ringan."""
+    if not (user.is_authenticated and user.is_club_admin):
+        return None
+    return (
+        Profile.objects.filter(user=user)
+        .values_list("managed_club_id", flat=True)
+        .first()
+    )
+
+
+async def amanaged_club_id_for(user):
+    """Versi async managed_club_id_for."""
+    if not (user.is_authenticated and user.is_club_admin):
+        return None
+    return await (
+        Profile.objects.filter(user=user)
+        .values_list("managed_club_id", flat=True)
+        .afirst()
+    )
+
+
+def filter_rumors(queryset, params):
+    """Filter nama pemain, klub asal, dan klub tujuan dari query string."""
+    nama = params.get("nama", "").strip()
+    club_asal_id = params.get("asal")
+    club_tujuan_id = params.get("tujuan")
+
+    if nama:
+        # Index full-text atas nama pemain saja: cocok per awal kata, tidak
+        # peka aksen (paling banyak MATCHING_IDS_LIMIT pemain)
+        queryset = queryset.filter(pemain_id__in=matching_ids("player", nama, title_only=True))
+
+    if club_asal_id and club_asal_id != "null":
+        try:
+            queryset = queryset.filter(club_asal__id=int(club_asal_id))
+        except ValueError:
+            pass
+
+    if club_tujuan_id and club_tujuan_id != "null":
+        try:
+            queryset = queryset.filter(club_tujuan__id=int(club_tujuan_id))
+        except ValueError:
+            pass
+
+    return queryset
+
+
+def rumor_feed_queryset(user, managed_club_id=None, queryset=None):
+    """
+    Queryset .values() untuk feed rumor. Flag is_author dan is_admin
+    dihitung di SQL sehingga tidak ada akses relasi per baris.
+    """
+    if queryset is None:
+        queryset = Rumors.objects.all()
+
+    if user.is_authenticated:
+        is_author = ExpressionWrapper(Q(author_id=user.pk), output_field=BooleanField())
+    else:
+        is_author = Value(False, output_field=BooleanField())
+
+    if managed_club_id:
+        is_admin = ExpressionWrapper(
+            Q(club_asal_id=managed_club_id) | Q(club_tujuan_id=managed_club_id),
+            output_field=BooleanField(),
+        )
+    else:
+        is_admin = Value(False, output_field=BooleanField())
+
+    return queryset.annotate(is_author=is_author, is_admin=is_admin).values(*FEED_FIELDS)
+
+
+def serialize_rumor_row(row):
+    """Ubah satu baris .values() menjadi format JSON yang dipakai Flutter."""
+    return {
+        "id": str(row["id"]),
+        "title": row["title"],
+        "content": row["content"],
+        "author": row["author__username"],
+        "pemain_nama": row["pemain__nama_pemain"],
+        "pemain_id": str(row["pemain_id"]),
+        "pemain_thumbnail": row["pemain__thumbnail"] or DEFAULT_THUMBNAIL,
+        "pemain_value": row["pemain__market_value"],
+        "pemain_umur": row["pemain__umur"],
+        "pemain_posisi": row["pemain__position"],
+        "pemain_negara": row["pemain__negara"],
+        "club_asal_nama": row["club_asal__name"] or "-",
+        "club_asal_id": str(row["club_asal_id"]) if row["club_asal_id"] else None,
+        "club_asal_logo": row["club_asal__logo_url"] or "",
+        "club_tujuan_nama": row["club_tujuan__name"] or "-",
+        "club_tujuan_id": str(row["club_tujuan_id"]) if row["club_tujuan_id"] else None,
+        "club_tujuan_logo": row["club_tujuan__logo_url"] or "",
+        "status": row["status"],
+        "created_at": row["created_at"].isoformat(),
+        "views": row["rumors_views"],
+        "is_author": bool(row["is_author"]),
+        "is_admin": bool(row["is_admin"]),
+    }
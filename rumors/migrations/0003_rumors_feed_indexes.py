@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_player_source_fingerprint'),
+        ('rumors', '0002_remove_rumors_is_verified_rumors_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rumors',
+            index=models.Index(fields=['-created_at', '-id'], name='rumor_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rumors',
+            index=models.Index(fields=['club_asal', '-created_at', '-id'], name='rumor_asal_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rumors',
+            index=models.Index(fields=['club_tujuan', '-created_at', '-id'], name='rumor_tujuan_feed_idx'),
+        ),
+    ]
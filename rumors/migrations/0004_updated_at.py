@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_updated_at'),
+        ('rumors', '0003_rumors_feed_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rumors',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='rumors',
+            index=models.Index(fields=['updated_at', 'id'], name='rumor_updated_idx'),
+        ),
+    ]
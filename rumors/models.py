@@ -3,6 +3,7 @@ import uuid
 from django.db import models
 from main.models import Player, Club
 from accounts.models import CustomUser
+from rumors.view_counter import view_counter
 
 class Rumors(models.Model):
     STATUS_CHOICES = [
@@ -20,8 +21,20 @@ class Rumors(models.Model):
     content = models.TextField(blank=True)
     rumors_views = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Tidak ikut berubah saat view counter di-flush (lihat view_counter.py)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')  
 
+    class Meta:
+        indexes = [
+            # Feed rumor: keyset (-created_at, -id), juga saat difilter klub asal/tujuan
+            models.Index(fields=['-created_at', '-id'], name='rumor_feed_idx'),
+            models.Index(fields=['club_asal', '-created_at', '-id'], name='rumor_asal_feed_idx'),
+            models.Index(fields=['club_tujuan', '-created_at', '-id'], name='rumor_tujuan_feed_idx'),
+            # Change feed: keyset (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='rumor_updated_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         # Generate title otomatis
         if self.club_asal and self.club_tujuan and self.pemain:
@@ -29,8 +42,14 @@ class Rumors(models.Model):
         super().save(*args, **kwargs)
 
     def increment_views(self):
-        self.rumors_views += 1
-        self.save()
+        # Ditampung di buffer write-behind, tidak menyimpan ulang seluruh baris
+        if view_counter.record(self.pk):
+            # Buffer baru saja di-flush, nilai di instance ini sudah basi
+            self.refresh_from_db(fields=["rumors_views"])
+
+    @property
+    def live_views(self):
+        return view_counter.live_count(self)
 
     def __str__(self):
         return self.title or "Rumor Tanpa Judul"
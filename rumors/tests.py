@@ -1,7 +1,17 @@
-from django.test import TestCase, Client
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, TransactionTestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import OperationalError, connection
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rumors.models import Rumors
+from rumors.view_counter import ViewCounter, view_counter
+from rumors.feed import filter_rumors, rumor_feed_queryset
+from main.pagination import KeysetPaginator, encode_cursor
+from main.query_plans import QueryPlanAssertions, analyze
 from main.models import Club, Player
 from accounts.models import Profile
 import uuid
@@ -86,6 +96,8 @@ class RumorsViewTests(TestCase):
         self.client.login(username="user", password="12345")
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"{old_views + 1} kali dilihat")
+        view_counter.flush()
         self.rumor.refresh_from_db()
         self.assertEqual(self.rumor.rumors_views, old_views + 1)
 
@@ -491,6 +503,250 @@ class RumorsCoverageFinisherTests(TestCase):
         res = self.client.get(url)
         self.assertEqual(res.status_code, 200)
 
+class RumorsFeedJsonTests(TestCase):
+    """Feed JSON rumor: jumlah query konstan, flag benar, dan pagination cursor."""
+
+    def setUp(self):
+        Club.objects.all().delete()
+        self.club_a = Club.objects.create(name="FeedA", country="England")
+        self.club_b = Club.objects.create(name="FeedB", country="Spain")
+        self.club_c = Club.objects.create(name="FeedC", country="Italy")
+
+        self.author = User.objects.create_user(username="feed_author", password="12345", is_fan=True)
+        self.club_admin = User.objects.create_user(username="feed_admin", password="12345", is_club_admin=True)
+        Profile.objects.create(user=self.club_admin, managed_club=self.club_b)
+        self.url = reverse("rumors:get_rumors_json")
+
+    def _create_rumors(self, count, club_tujuan=None):
+        for i in range(count):
+            player = Player.objects.create(
+                nama_pemain=f"Feed Player {Rumors.objects.count()}",
+                position="Winger",
+                umur=20,
+                market_value=1000000,
+                negara="England",
+                current_club=self.club_a,
+            )
+            Rumors.objects.create(
+                author=self.author,
+                pemain=player,
+                club_asal=self.club_a,
+                club_tujuan=club_tujuan or self.club_b,
+                content="Feed",
+            )
+
+    def _count_feed_queries(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(self.url, params)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx.captured_queries), res
+
+    def test_query_count_constant_regardless_of_rumor_count(self):
+        self.client.login(username="feed_admin", password="12345")
+        self._create_rumors(5)
+        small, res = self._count_feed_queries(limit=200)
+        self.assertEqual(len(res.json()), 5)
+
+        self._create_rumors(45)
+        large, res = self._count_feed_queries(limit=200)
+        self.assertEqual(len(res.json()), 50)
+        self.assertEqual(small, large)
+
+    def test_anonymous_feed_uses_single_query(self):
+        self._create_rumors(10)
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url)
+        self.assertEqual(len(res.json()), 10)
+
+    def test_flags_and_output_shape(self):
+        self._create_rumors(1)
+        self._create_rumors(1, club_tujuan=self.club_c)
+        self.client.login(username="feed_admin", password="12345")
+
+        data = {row["club_tujuan_nama"]: row for row in self.client.get(self.url).json()}
+        self.assertTrue(data["FeedB"]["is_admin"])
+        self.assertFalse(data["FeedC"]["is_admin"])
+        self.assertFalse(data["FeedB"]["is_author"])
+        self.assertEqual(data["FeedB"]["author"], "feed_author")
+        self.assertEqual(data["FeedB"]["club_asal_id"], str(self.club_a.id))
+        self.assertEqual(
+            data["FeedB"]["pemain_thumbnail"],
+            "https://cdn-icons-png.flaticon.com/512/149/149071.png",
+        )
+
+        self.client.login(username="feed_author", password="12345")
+        rows = self.client.get(self.url).json()
+        self.assertTrue(all(row["is_author"] and not row["is_admin"] for row in rows))
+
+    def test_cursor_pagination_walks_all_rumors(self):
+        self._create_rumors(7)
+        seen = []
+        params = {"limit": 3}
+        while True:
+            res = self.client.get(self.url, params)
+            seen.extend(row["id"] for row in res.json())
+            cursor = res.get("X-Next-Cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_invalid_cursor_returns_400(self):
+        res = self.client.get(self.url, {"cursor": "bukan-cursor"})
+        self.assertEqual(res.status_code, 400)
+
+    async def test_feed_di_asgi(self):
+        await sync_to_async(self._create_rumors)(4)
+        await self.async_client.alogin(username="feed_admin", password="12345")
+
+        res = await self.async_client.get(self.url, {"limit": 3})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()), 3)
+        self.assertTrue(all(row["is_admin"] for row in res.json()))
+
+        res = await self.async_client.get(self.url, {"limit": 3, "cursor": res["X-Next-Cursor"]})
+        self.assertEqual(len(res.json()), 1)
+        self.assertNotIn("X-Next-Cursor", res)
+
+
+class RumorViewCounterTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        club_a = Club.objects.create(name="ViewA", country="England")
+        club_b = Club.objects.create(name="ViewB", country="Spain")
+        author = User.objects.create_user(username="view_author", password="12345", is_fan=True)
+        self.rumors = []
+        for i in range(3):
+            player = Player.objects.create(
+                nama_pemain=f"View Player {i}", position="Winger", umur=20,
+                market_value=1000000, negara="England", current_club=club_a,
+            )
+            self.rumors.append(Rumors.objects.create(
+                author=author, pemain=player, club_asal=club_a, club_tujuan=club_b,
+            ))
+        view_counter.flush()
+
+    def test_increment_is_buffered_until_flush(self):
+        counter = ViewCounter(flush_interval=3600)
+        rumor = self.rumors[0]
+        for _ in range(3):
+            counter.record(rumor.pk)
+
+        rumor.refresh_from_db()
+        self.assertEqual(rumor.rumors_views, 0)
+        self.assertEqual(counter.live_count(rumor), 3)
+
+        self.assertEqual(counter.flush(), 3)
+        rumor.refresh_from_db()
+        self.assertEqual(rumor.rumors_views, 3)
+        self.assertEqual(counter.live_count(rumor), 3)
+
+    def test_flush_groups_updates_by_amount(self):
+        counter = ViewCounter(flush_interval=3600)
+        counter.record(self.rumors[0].pk, 2)
+        counter.record(self.rumors[1].pk, 2)
+        counter.record(self.rumors[2].pk, 5)
+
+        # Satu UPDATE untuk n=2 dan satu untuk n=5
+        with self.assertNumQueries(2):
+            counter.flush()
+        self.assertEqual(
+            sorted(Rumors.objects.values_list("rumors_views", flat=True)), [2, 2, 5]
+        )
+
+    def test_increment_views_does_not_rewrite_row(self):
+        rumor = self.rumors[0]
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                rumor.increment_views()
+        self.assertEqual(rumor.live_views, 5)
+
+    def test_flutter_endpoint_returns_live_count(self):
+        url = reverse("rumors:increment_view_flutter", args=[self.rumors[1].pk])
+        self.client.post(url)
+        res = self.client.post(url)
+        self.assertEqual(res.json()["total_views"], 2)
+
+
+class RumorViewCounterLoadTest(TransactionTestCase):
+    """Banyak thread mencatat view bersamaan: tidak boleh ada increment yang hilang."""
+
+    THREADS = 16
+    VIEWS_PER_THREAD = 250
+
+    def test_parallel_views_are_not_lost(self):
+        club_a = Club.objects.create(name="LoadA", country="England")
+        club_b = Club.objects.create(name="LoadB", country="Spain")
+        author = User.objects.create_user(username="load_author", password="12345")
+        player = Player.objects.create(
+            nama_pemain="Load Player", position="Winger", umur=20,
+            market_value=1000000, negara="England", current_club=club_a,
+        )
+        rumor = Rumors.objects.create(
+            author=author, pemain=player, club_asal=club_a, club_tujuan=club_b,
+        )
+
+        # Interval 0: setiap record juga mencoba flush, flush saling bertabrakan
+        counter = ViewCounter(flush_interval=0)
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(self.VIEWS_PER_THREAD):
+                    try:
+                        counter.record(rumor.pk)
+                    except OperationalError:
+                        # SQLite "database is locked": view sudah dikembalikan ke buffer
+                        time.sleep(0.01)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        while True:
+            try:
+                counter.flush()
+                break
+            except OperationalError:
+                time.sleep(0.01)
+
+        self.assertEqual(errors, [])
+        rumor.refresh_from_db()
+        self.assertEqual(rumor.rumors_views, self.THREADS * self.VIEWS_PER_THREAD)
+
+    def test_thread_latar_flush_walau_tidak_ada_view_baru(self):
+        club_a = Club.objects.create(name="IdleA", country="England")
+        club_b = Club.objects.create(name="IdleB", country="Spain")
+        author = User.objects.create_user(username="idle_author", password="12345")
+        player = Player.objects.create(
+            nama_pemain="Idle Player", position="Winger", umur=20,
+            market_value=1000000, negara="England", current_club=club_a,
+        )
+        rumor = Rumors.objects.create(author=author, pemain=player, club_asal=club_a, club_tujuan=club_b)
+
+        counter = ViewCounter(flush_interval=0.1, background=True)
+        counter.record(rumor.pk, 3)
+
+        # Tunggu nilai di database, bukan buffer: buffer sudah kosong
+        # sebelum UPDATE dari thread latar selesai
+        deadline = time.monotonic() + 5
+        rumor.refresh_from_db()
+        while rumor.rumors_views != 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            rumor.refresh_from_db()
+        self.assertEqual(rumor.rumors_views, 3)
+        self.assertEqual(counter.pending(rumor.pk), 0)
+
+
 class RumorsFinalPushTests(TestCase):
     """Final booster to push coverage >80% for rumors app"""
 
@@ -519,3 +775,37 @@ def setUp(self):
     )
 
 
+
+
+class RumorQueryPlanTests(QueryPlanAssertions, TestCase):
+    """EXPLAIN feed rumor (semua dan per klub) pada data seeded."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Club.objects.all().delete()
+        clubs = Club.objects.bulk_create([Club(name=f"Klub QP {i}") for i in range(20)])
+        players = Player.objects.bulk_create([
+            Player(current_club=clubs[i % 20], nama_pemain=f"Pemain {i}", position="CM")
+            for i in range(1000)
+        ])
+        cls.author = User.objects.create_user(username="qp_author", password="12345")
+        Rumors.objects.bulk_create([
+            Rumors(author=cls.author, pemain=players[i % 1000], club_asal=clubs[i % 20],
+                   club_tujuan=clubs[(i + 3) % 20], content="QP")
+            for i in range(4000)
+        ])
+        analyze()
+        cls.club = clubs[4]
+
+    def _page(self, params, cursor=None):
+        rumors = rumor_feed_queryset(self.author, self.club.id, filter_rumors(Rumors.objects.all(), params))
+        return KeysetPaginator(rumors, ("-created_at", "-id"), page_size=20).page_queryset(cursor)
+
+    def test_feed_first_and_next_page(self):
+        self.assertUsesIndex(self._page({}))
+        latest = Rumors.objects.order_by("-created_at", "-id")[100]
+        self.assertUsesIndex(self._page({}, encode_cursor([latest.created_at, latest.id])))
+
+    def test_feed_filtered_by_club(self):
+        self.assertUsesIndex(self._page({"asal": str(self.club.id)}))
+        self.assertUsesIndex(self._page({"tujuan": str(self.club.id)}))
@@ -0,0 +1,142 @@
+# rumors/view_counter.py
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+# Jeda minimum (detik) antar flush ke database
+DEFAULT_FLUSH_INTERVAL = 10
+
+
+def get_flush_interval():
+    return getattr(settings, "RUMOR_VIEW_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+
+
+class ViewCounter:
+    """
+    Buffer write-behind untuk jumlah view rumor.
+
+    Setiap view hanya menambah angka di memori proses (dilindungi lock).
+    Secara berkala buffer ditukar dengan yang kosong lalu ditulis dengan
+    UPDATE ... SET rumors_views = rumors_views + n, dikelompokkan per n
+    sehingga seribu rumor dengan jumlah view yang sama cukup satu query.
+    Karena memakai F(), tidak ada increment yang hilang walaupun beberapa
+    proses flush bersamaan.
+
+    Flush terjadi saat record() melihat interval sudah lewat, dan (jika
+    `background` aktif) oleh thread daemon setiap interval, sehingga worker
+    yang sedang sepi tidak menahan view di memori. View yang belum di-flush
+    tetap hilang bila proses dibunuh paksa (SIGKILL/OOM), paling banyak
+    sebanyak satu interval.
+    """
+
+    def __init__(self, flush_interval=None, background=None):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._flush_interval = flush_interval
+        self._background = background
+        self._thread = None
+        self._last_flush = time.monotonic()
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return get_flush_interval()
+
+    def record(self, rumor_id, n=1):
+        """
+        Catat view; flush otomatis jika interval sudah lewat.
+        Mengembalikan True jika record ini memicu flush.
+        """
+        with self._lock:
+            self._pending[rumor_id] += n
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            self._ensure_background_flush()
+        if due:
+            self.flush()
+        return due
+
+    def _ensure_background_flush(self):
+        # Dipanggil dengan lock. Dimulai saat view pertama (bukan saat import),
+        # sehingga setelah fork worker gunicorn thread dibuat ulang di proses anak.
+        background = self._background
+        if background is None:
+            background = getattr(settings, "RUMOR_VIEW_FLUSH_BACKGROUND", True)
+        if not background or self.flush_interval <= 0:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._flush_periodically, name="rumor-view-flush", daemon=True
+            )
+            self._thread.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # View sudah dikembalikan ke buffer oleh flush(), dicoba lagi berikutnya
+                logger.exception("Flush view rumor gagal")
+            finally:
+                connection.close()
+
+    def pending(self, rumor_id):
+        with self._lock:
+            return self._pending.get(rumor_id, 0)
+
+    def live_count(self, rumor):
+        """Nilai di database ditambah view yang belum di-flush."""
+        return rumor.rumors_views + self.pending(rumor.pk)
+
+    def flush(self):
+        """Tulis semua view yang tertunda. Mengembalikan jumlah view yang ditulis."""
+        from rumors.models import Rumors
+
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        by_amount = defaultdict(list)
+        for rumor_id, n in pending.items():
+            by_amount[n].append(rumor_id)
+
+        written = Counter()
+        try:
+            for n, ids in by_amount.items():
+                # updated_at sengaja tidak diubah: jumlah view bukan perubahan
+                # yang perlu dikirim ulang lewat change feed
+                Rumors.objects.filter(pk__in=ids).update(
+                    rumors_views=F("rumors_views") + n
+                )
+                written.update({rumor_id: n for rumor_id in ids})
+        except DatabaseError:
+            # Kembalikan yang belum tertulis agar dicoba lagi di flush berikutnya
+            with self._lock:
+                self._pending.update(pending - written)
+            raise
+        return sum(written.values())
+
+
+view_counter = ViewCounter()
+
+
+def _flush_at_exit():
+    try:
+        view_counter.flush()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
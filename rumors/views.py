@@ -5,11 +5,16 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from rumors.models import Rumors
 from rumors.forms import RumorsForm
+from search.index import matching_ids
+from rumors.feed import amanaged_club_id_for, filter_rumors, rumor_feed_queryset, serialize_rumor_row
+from main.conditional import roster_condition
+from main.pagination import InvalidCursor, KeysetPaginator, keyset_json_response, parse_page_size
 from main.models import Player, Club
 from accounts.models import Profile
 from django.views.decorators.http import require_GET
 from django.db.models import Q
 from django.views.decorators.csrf import csrf_exempt
+from asgiref.sync import sync_to_async
 import json
 
 @csrf_exempt
@@ -18,7 +23,7 @@ def increment_rumor_view_flutter(request, id):
         try:
             rumor = Rumors.objects.get(pk=id)
             rumor.increment_views()
-            return JsonResponse({"status": "success", "message": "Views incremented", "total_views": rumor.rumors_views})
+            return JsonResponse({"status": "success", "message": "Views incremented", "total_views": rumor.live_views})
         except Rumors.DoesNotExist:
             return JsonResponse({"status": "error", "message": "Rumor not found"}, status=404)
     return JsonResponse({"status": "error", "message": "Invalid method"}, status=405)
@@ -163,73 +168,24 @@ def delete_rumor_flutter(request, id):
             return JsonResponse({"status": "error", "message": "Rumor not found"}, status=404)
     return JsonResponse({"status": "error", "message": "Invalid method"}, status=405)
 
-def get_rumors_json(request):
-    rumors = Rumors.objects.all().order_by('-created_at')
-    nama = request.GET.get("nama", "").strip()
-    club_asal_id = request.GET.get("asal")
-    club_tujuan_id = request.GET.get("tujuan")
-
-    if nama:
-        rumors = rumors.filter(pemain__nama_pemain__icontains=nama)
-    
-    if club_asal_id and club_asal_id != "null" and club_asal_id != "":
-        try:
-            rumors = rumors.filter(club_asal__id=int(club_asal_id))
-        except ValueError:
-            pass
-
-    if club_tujuan_id and club_tujuan_id != "null" and club_tujuan_id != "":
-        try:
-            rumors = rumors.filter(club_tujuan__id=int(club_tujuan_id))
-        except ValueError:
-            pass
-    
-    user_managed_club_id = None
-    if request.user.is_authenticated and request.user.is_club_admin:
-        profile = getattr(request.user, "profile", None)
-        if profile and profile.managed_club:
-            user_managed_club_id = profile.managed_club.id
-
-    data = []
-    for rumor in rumors:
-        is_relevant_admin = False
-        
-        # Cek hanya jika user punya managed club
-        if user_managed_club_id:
-            ids_involved = []
-            if rumor.club_asal: ids_involved.append(rumor.club_asal.id)
-            if rumor.club_tujuan: ids_involved.append(rumor.club_tujuan.id)
-            
-            # Jika club admin ada di salah satu (asal/tujuan), maka True
-            if user_managed_club_id in ids_involved:
-                is_relevant_admin = True
-
-        data.append({
-            "id": str(rumor.id),
-            "title": rumor.title,
-            "content": rumor.content,
-            "author": rumor.author.username,
-            "pemain_nama": rumor.pemain.nama_pemain,
-            "pemain_id": str(rumor.pemain.id),
-            "pemain_thumbnail": rumor.pemain.thumbnail if rumor.pemain.thumbnail else "https://cdn-icons-png.flaticon.com/512/149/149071.png",
-            "pemain_value": rumor.pemain.market_value,
-            "pemain_umur": rumor.pemain.umur,
-            "pemain_posisi": rumor.pemain.position,
-            "pemain_negara": rumor.pemain.negara,
-            "club_asal_nama": rumor.club_asal.name if rumor.club_asal else "-",
-            "club_asal_id": str(rumor.club_asal.id) if rumor.club_asal else None,
-            "club_asal_logo": rumor.club_asal.logo_url if rumor.club_asal and rumor.club_asal.logo_url else "",
-            "club_tujuan_nama": rumor.club_tujuan.name if rumor.club_tujuan else "-",
-            "club_tujuan_id": str(rumor.club_tujuan.id) if rumor.club_tujuan else None,
-            "club_tujuan_logo": rumor.club_tujuan.logo_url if rumor.club_tujuan and rumor.club_tujuan.logo_url else "",
-            "status": rumor.status,
-            "created_at": rumor.created_at.isoformat(),
-            "views": rumor.rumors_views,
-            "is_author": request.user == rumor.author,
-
-            "is_admin": is_relevant_admin 
-        })
-    return JsonResponse(data, safe=False)
+async def get_rumors_json(request):
+    # Satu query JOIN untuk seluruh halaman, flag is_author/is_admin dihitung di SQL.
+    # View async: di ASGI request tidak menahan thread selama menunggu database.
+    user = await request.auser()
+    # Pencarian ?nama= membaca index full-text secara sync
+    rumors = await sync_to_async(filter_rumors)(Rumors.objects.all(), request.GET)
+    rumors = rumor_feed_queryset(user, await amanaged_club_id_for(user), queryset=rumors)
+
+    try:
+        paginator = KeysetPaginator(
+            rumors, ("-created_at", "-id"), parse_page_size(request.GET.get("limit"))
+        )
+        page = await paginator.apage(request.GET.get("cursor"))
+    except InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    data = [serialize_rumor_row(row) for row in page.items]
+    return keyset_json_response(request, page, data)
 
 @csrf_exempt
 def create_rumor_flutter(request):
@@ -278,11 +234,13 @@ def show_rumors_main(request):
     club_tujuan = request.GET.get("tujuan")
 
     # Ambil semua data awal
-    rumors_list = Rumors.objects.all().order_by('-created_at')
+    rumors_list = Rumors.objects.select_related(
+        'author', 'pemain', 'club_asal', 'club_tujuan'
+    ).order_by('-created_at')
 
     # Terapkan filter dinamis
     if nama:
-        rumors_list = rumors_list.filter(pemain__nama_pemain__icontains=nama)
+        rumors_list = rumors_list.filter(pemain_id__in=matching_ids("player", nama, title_only=True))
     if club_asal and club_asal.isdigit():
         rumors_list = rumors_list.filter(club_asal__id=int(club_asal))
     if club_tujuan and club_tujuan.isdigit():
@@ -478,6 +436,7 @@ def delete_rumors(request, id):
 
 
 # ========== AJAX: get pemain berdasarkan club_asal ==========
+@roster_condition
 def get_players_by_club(request):
     club_id = request.GET.get('club_id')
     players = Player.objects.filter(current_club_id=club_id).values('id', 'nama_pemain')
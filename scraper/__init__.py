@@ -0,0 +1,2 @@
+# Scraper Transfermarkt: fetch paralel dengan rate limit per host, cache
+# HTTP di disk (conditional GET) dan checkpoint agar run bisa dilanjutkan.
@@ -0,0 +1,89 @@
+# scraper/benchmark.py
+"""
+Bandingkan throughput backend parser pada halaman skuad fixture.
+
+    python -m scraper.benchmark --rows 500 --repeat 20
+
+Baris pemain di fixture digandakan hingga --rows agar ukurannya mendekati
+halaman skuad besar. "bs4-lama" adalah cara scraping.py sebelumnya
+(html.parser + find_all('td', 'zentriert') tiga kali per baris).
+"""
+
+import argparse
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from .offline import FIXTURE_DIR
+from .parsers import available_backends, get_backend
+from .transfermarkt import parse_squad
+
+ROW = re.compile(r'\s*<tr class="(?:odd|even)">.*?\n      </tr>', re.S)
+
+
+def load_pages(directory=FIXTURE_DIR, rows=None):
+    """Halaman skuad fixture; jika `rows` diisi, baris pemainnya digandakan."""
+    pages = []
+    for path in sorted(directory.glob("*_kader_*.html")):
+        html = path.read_text(encoding="utf-8")
+        found = ROW.findall(html)
+        if rows and found:
+            repeated = "".join(found[i % len(found)] for i in range(rows))
+            start, end = html.index(found[0]), html.index(found[-1]) + len(found[-1])
+            html = html[:start] + repeated + html[end:]
+        pages.append(html)
+    return pages
+
+
+def legacy_parse(html, club_name="Klub"):
+    soup = BeautifulSoup(html, "html.parser")
+    players = []
+    for row in soup.find("table", {"class": "items"}).find("tbody").find_all("tr", {"class": ["odd", "even"]}):
+        player_cell = row.find("td", {"class": "hauptlink"})
+        age = re.search(r"\((\d+)\)", row.find_all("td", {"class": "zentriert"})[0].text.strip())
+        country_cell = row.find_all("td", {"class": "zentriert"})[1]
+        players.append({
+            "nama_pemain": player_cell.text.strip(),
+            "klub": club_name,
+            "umur": age.group(1) if age else "",
+            "negara": country_cell.find("img")["alt"] if country_cell.find("img") else "",
+            "posisi": row.find_all("td", {"class": "zentriert"})[2].text.strip(),
+            "market_value": row.find("td", {"class": "rechts hauptlink"}).text.strip(),
+        })
+    return players
+
+
+def measure(parse, pages, repeat):
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            rows += len(parse(html))
+    elapsed = time.perf_counter() - start
+    return elapsed, len(pages) * repeat / elapsed, rows / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="Jumlah baris pemain per halaman.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--backend", action="append", help="Batasi ke backend tertentu (boleh diulang).")
+    args = parser.parse_args(argv)
+
+    pages = load_pages(rows=args.rows)
+    size = sum(len(html) for html in pages) / len(pages) / 1024
+    print(f"{len(pages)} halaman x {args.rows} baris (~{size:.0f} KB/halaman), {args.repeat} putaran")
+
+    candidates = [("bs4-lama", legacy_parse)]
+    for name in args.backend or available_backends():
+        get_backend(name)
+        candidates.append((name, lambda html, name=name: parse_squad(html, "Klub", backend=name)))
+
+    for name, parse in candidates:
+        elapsed, pages_per_sec, rows_per_sec = measure(parse, pages, args.repeat)
+        print(f"{name:<12} {elapsed:8.2f} s  {pages_per_sec:8.1f} halaman/detik  {rows_per_sec:10,.0f} baris/detik")
+
+
+if __name__ == "__main__":
+    main()
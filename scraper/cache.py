@@ -0,0 +1,100 @@
+# scraper/cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: str
+    etag: str = None
+    last_modified: str = None
+    fetched_at: float = 0.0
+
+    def conditional_headers(self):
+        """Header untuk conditional GET ke server."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Cache respons HTTP di disk: satu file .html (body) dan satu .json
+    (ETag, Last-Modified, waktu fetch) per URL. Entri yang lebih muda dari
+    `max_age` detik dipakai tanpa request; sisanya divalidasi ulang dengan
+    If-None-Match / If-Modified-Since.
+    """
+
+    def __init__(self, directory, max_age=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.html", self.directory / f"{key}.json"
+
+    def get(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(
+            url=url,
+            body=body,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            fetched_at=meta.get("fetched_at", 0.0),
+        )
+
+    def is_fresh(self, entry):
+        return self.max_age is not None and time.time() - entry.fetched_at < self.max_age
+
+    def _write(self, path, text):
+        # Tulis ke file sementara lalu rename agar run yang terputus tidak
+        # meninggalkan file setengah jadi.
+        tmp = path.with_suffix(f"{path.suffix}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def store(self, url, body, headers):
+        body_path, meta_path = self._paths(url)
+        entry = CachedResponse(
+            url=url,
+            body=body,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            fetched_at=time.time(),
+        )
+        with self._lock:
+            self._write(body_path, body)
+            self._write_meta(meta_path, entry)
+        return entry
+
+    def touch(self, entry):
+        """Server menjawab 304: body lama masih berlaku, perbarui waktu fetch."""
+        entry.fetched_at = time.time()
+        with self._lock:
+            self._write_meta(self._paths(entry.url)[1], entry)
+        return entry
+
+    def _write_meta(self, path, entry):
+        self._write(path, json.dumps({
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": entry.fetched_at,
+        }))
@@ -0,0 +1,50 @@
+# scraper/checkpoint.py
+
+import json
+import threading
+from pathlib import Path
+
+
+class Checkpoint:
+    """
+    Catatan pekerjaan yang sudah selesai dalam file JSON Lines
+    ({"key": ..., "result": ...} per baris). Setiap hasil langsung di-append
+    dan di-flush, jadi run yang dihentikan bisa dilanjutkan tanpa mengulang
+    halaman yang sudah diproses. Baris terakhir yang terpotong diabaikan.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.done = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.done[record["key"]] = record["result"]
+
+    def __contains__(self, key):
+        return key in self.done
+
+    def __len__(self):
+        return len(self.done)
+
+    def get(self, key):
+        return self.done.get(key)
+
+    def record(self, key, result):
+        line = json.dumps({"key": key, "result": result}, ensure_ascii=False)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+                handle.flush()
+            self.done[key] = result
+
+    def clear(self):
+        with self._lock:
+            self.done.clear()
+            self.path.unlink(missing_ok=True)
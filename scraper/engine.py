@@ -0,0 +1,168 @@
+# scraper/engine.py
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    # Transfermarkt sering memblokir User-Agent bawaan requests
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    """Satu halaman: `parse(html)` harus mengembalikan data yang bisa di-JSON-kan."""
+    key: str
+    url: str
+    parse: Callable[[str], object]
+
+
+@dataclass
+class EngineStats:
+    pages: int = 0
+    downloaded: int = 0
+    not_modified: int = 0
+    cache_fresh: int = 0
+    resumed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    errors: dict = field(default_factory=dict)
+
+    @property
+    def pages_per_second(self):
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (
+            f"{self.pages} halaman dalam {self.elapsed:.2f} s ({self.pages_per_second:.1f} halaman/detik): "
+            f"{self.downloaded} diunduh, {self.not_modified} 304, {self.cache_fresh} dari cache, "
+            f"{self.resumed} dari checkpoint, {self.failed} gagal"
+        )
+
+
+class Fetcher:
+    """
+    GET dengan rate limit per host dan cache di disk. Session requests dibuat
+    per thread karena Session tidak dijamin thread-safe.
+    """
+
+    def __init__(self, limiter=None, cache=None, session_factory=requests.Session,
+                 headers=None, timeout=30, retries=3, backoff=1.0, sleep=time.sleep):
+        self.limiter = limiter
+        self.cache = cache
+        self.session_factory = session_factory
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._sleep = sleep
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = self.session_factory()
+        return self._local.session
+
+    def fetch(self, url):
+        """Mengembalikan (html, status) dengan status 'fresh', 'not_modified' atau 'downloaded'."""
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            return cached.body, "fresh"
+
+        headers = {**self.headers, **(cached.conditional_headers() if cached else {})}
+        for attempt in range(self.retries + 1):
+            if self.limiter:
+                self.limiter.acquire(url)
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as exc:
+                error = exc
+            else:
+                if response.status_code == 304 and cached:
+                    self.cache.touch(cached)
+                    return cached.body, "not_modified"
+                if response.status_code not in RETRY_STATUS:
+                    try:
+                        response.raise_for_status()
+                    except requests.HTTPError as exc:
+                        raise FetchError(f"{url}: {exc}") from exc
+                    if self.cache:
+                        self.cache.store(url, response.text, response.headers)
+                    return response.text, "downloaded"
+                error = f"HTTP {response.status_code}"
+            if attempt < self.retries:
+                self._sleep(self.backoff * 2 ** attempt)
+        raise FetchError(f"{url}: {error}")
+
+
+class ScrapeEngine:
+    """
+    Jalankan sekumpulan Job dengan pool thread berukuran tetap. Hasil parse
+    dicatat di checkpoint (jika ada) segera setelah tiap halaman selesai;
+    job yang key-nya sudah ada di checkpoint tidak di-fetch ulang.
+    """
+
+    def __init__(self, fetcher, workers=4, checkpoint=None):
+        self.fetcher = fetcher
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.stats = EngineStats()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def _run_job(self, job):
+        html, status = self.fetcher.fetch(job.url)
+        result = job.parse(html)
+        if self.checkpoint is not None:
+            self.checkpoint.record(job.key, result)
+        self._count({"fresh": "cache_fresh"}.get(status, status))
+        return result
+
+    def run(self, jobs):
+        """
+        Mengembalikan dict key -> hasil parse. Job yang gagal dicatat di
+        stats.errors dan tidak masuk checkpoint, jadi run berikutnya mencobanya lagi.
+        """
+        start = time.perf_counter()
+        results = {}
+        pending = []
+        for job in jobs:
+            if self.checkpoint is not None and job.key in self.checkpoint:
+                results[job.key] = self.checkpoint.get(job.key)
+                self.stats.resumed += 1
+                self.stats.pages += 1
+            else:
+                pending.append(job)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._run_job, job): job for job in pending}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    results[job.key] = future.result()
+                    self.stats.pages += 1
+                except Exception as exc:  # satu halaman gagal tidak menghentikan run
+                    logger.warning("Gagal memproses %s: %s", job.url, exc)
+                    self.stats.failed += 1
+                    self.stats.errors[job.key] = str(exc)
+
+        self.stats.elapsed += time.perf_counter() - start
+        return results
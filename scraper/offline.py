@@ -0,0 +1,57 @@
+# scraper/offline.py
+
+import hashlib
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def fixture_name(url):
+    """https://host/a/b/1 -> a_b_1.html"""
+    return urlsplit(url).path.strip("/").replace("/", "_") + ".html"
+
+
+class FixtureResponse:
+    def __init__(self, url, status_code, text="", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} untuk {self.url}", response=self)
+
+
+class FixtureSession:
+    """
+    Pengganti requests.Session yang melayani halaman HTML tersimpan, untuk
+    test dan benchmark tanpa jaringan. Mendukung ETag / If-None-Match dan
+    `latency` (detik) untuk mensimulasikan waktu tunggu server.
+    """
+
+    def __init__(self, directory=FIXTURE_DIR, latency=0.0):
+        self.directory = Path(directory)
+        self.latency = latency
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None):
+        with self._lock:
+            self.requests.append(url)
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = self.directory / fixture_name(url)
+        if not path.exists():
+            return FixtureResponse(url, 404)
+        text = path.read_text(encoding="utf-8")
+        etag = '"%s"' % hashlib.md5(text.encode("utf-8")).hexdigest()
+        if (headers or {}).get("If-None-Match") == etag:
+            return FixtureResponse(url, 304, headers={"ETag": etag})
+        return FixtureResponse(url, 200, text, headers={"ETag": etag})
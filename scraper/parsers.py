@@ -0,0 +1,309 @@
+# scraper/parsers.py
+"""
+Backend parsing halaman Transfermarkt. Semua backend mengembalikan struktur
+yang sama: untuk tiap baris pemain, sel <td> langsung di bawah <tr> diambil
+sekali (kelas, teks, alt gambar pertama) plus nama, link profil dan foto.
+
+- "stdlib": html.parser.HTMLParser berbasis event, tanpa membangun pohon DOM
+- "lxml" / "selectolax": dipakai jika paketnya terpasang
+- "bs4": BeautifulSoup, cara lama (paling lambat, paling toleran)
+"""
+
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+
+@dataclass
+class Cell:
+    classes: frozenset
+    text: str
+    img_alt: str = None
+
+
+@dataclass
+class SquadRow:
+    name: str = ""
+    href: str = ""
+    photo: str = ""
+    cells: list = field(default_factory=list)
+
+
+def _classes(value):
+    return frozenset((value or "").split())
+
+
+def _clean(text):
+    return " ".join(text.split())
+
+
+class BeautifulSoupBackend:
+    name = "bs4"
+
+    def __init__(self, features="html.parser"):
+        from bs4 import BeautifulSoup
+        self._soup = lambda html: BeautifulSoup(html, features)
+
+    def squad_rows(self, html):
+        table = self._soup(html).find("table", {"class": "items"})
+        if table is None:
+            return None
+        rows = []
+        for tr in table.find("tbody").find_all("tr", {"class": ["odd", "even"]}, recursive=False):
+            link = tr.select_one("td.hauptlink a")
+            photo = tr.find("img", {"class": "bilderrahmen-fixed"})
+            cells = []
+            for td in tr.find_all("td", recursive=False):
+                img = td.find("img")
+                cells.append(Cell(_classes(" ".join(td.get("class", []))), _clean(td.get_text(" ")),
+                                  img.get("alt") if img else None))
+            rows.append(SquadRow(
+                name=_clean(link.get_text()) if link else "",
+                href=link.get("href", "") if link else "",
+                photo=(photo.get("data-src") or photo.get("src") or "") if photo else "",
+                cells=cells,
+            ))
+        return rows
+
+    def footer_cells(self, html):
+        footer = self._soup(html).find("tfoot")
+        row = footer.find("tr") if footer else None
+        return [_clean(td.get_text(" ")) for td in row.find_all("td")] if row else []
+
+
+class _SquadEventParser(HTMLParser):
+    """State machine satu lintasan untuk tabel `items`; tabel bersarang dilacak lewat depth."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found = False
+        self.rows = []
+        self._depth = 0          # kedalaman tabel di dalam table.items
+        self._in_body = False
+        self._row = None
+        self._cell = None        # sel langsung (depth 1) yang sedang dibaca
+        self._text = []
+        self._in_name = False
+        self._in_link = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            if self._depth:
+                self._depth += 1
+            elif not self.found and "items" in _classes(dict(attrs).get("class")):
+                self.found = True
+                self._depth = 1
+            return
+        if not self._depth:
+            return
+        if tag == "tbody" and self._depth == 1:
+            self._in_body = True
+        elif tag == "tr" and self._in_body and self._depth == 1:
+            if _classes(dict(attrs).get("class")) & {"odd", "even"}:
+                self._row = SquadRow()
+        elif self._row is None:
+            return
+        elif tag == "td":
+            classes = _classes(dict(attrs).get("class"))
+            if self._depth == 1:
+                self._cell = Cell(classes, "")
+                self._text = []
+            if "hauptlink" in classes and not self._row.href:
+                self._in_name = True
+        elif tag == "a" and self._in_name and not self._row.href:
+            self._row.href = dict(attrs).get("href") or ""
+            self._in_link = True
+        elif tag == "img":
+            attrs = dict(attrs)
+            if "bilderrahmen-fixed" in _classes(attrs.get("class")) and not self._row.photo:
+                self._row.photo = attrs.get("data-src") or attrs.get("src") or ""
+            if self._cell is not None and self._cell.img_alt is None and self._depth == 1:
+                self._cell.img_alt = attrs.get("alt")
+
+    def handle_endtag(self, tag):
+        if not self._depth:
+            return
+        if tag == "table":
+            self._depth -= 1
+        elif tag == "tbody" and self._depth == 1:
+            self._in_body = False
+        elif self._row is None:
+            return
+        elif tag == "a" and self._in_link:
+            self._in_link = False
+            self._in_name = False
+        elif tag == "td":
+            if self._depth == 1 and self._cell is not None:
+                self._cell.text = _clean(" ".join(self._text))
+                self._row.cells.append(self._cell)
+                self._cell = None
+        elif tag == "tr" and self._depth == 1:
+            self._row.name = _clean(self._row.name)
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._row is None:
+            return
+        if self._cell is not None:
+            self._text.append(data)
+        if self._in_link:
+            self._row.name += data
+
+
+class _FooterEventParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cells = []
+        self._in_footer = False
+        self._row_done = False
+        self._text = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tfoot" and not self._row_done:
+            self._in_footer = True
+        elif tag == "td" and self._in_footer:
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if not self._in_footer:
+            return
+        if tag == "td" and self._text is not None:
+            self.cells.append(_clean(" ".join(self._text)))
+            self._text = None
+        elif tag in ("tr", "tfoot"):
+            self._in_footer = False
+            self._row_done = True
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+
+class StdlibBackend:
+    name = "stdlib"
+
+    def squad_rows(self, html):
+        parser = _SquadEventParser()
+        parser.feed(html)
+        parser.close()
+        return parser.rows if parser.found else None
+
+    def footer_cells(self, html):
+        parser = _FooterEventParser()
+        parser.feed(html)
+        parser.close()
+        return parser.cells
+
+
+class LxmlBackend:
+    name = "lxml"
+
+    ROWS = (
+        '//table[contains(concat(" ", normalize-space(@class), " "), " items ")][1]'
+        '/tbody/tr[contains(concat(" ", @class, " "), " odd ") or contains(concat(" ", @class, " "), " even ")]'
+    )
+
+    def __init__(self):
+        import lxml.html
+        self._parse = lxml.html.fromstring
+
+    def squad_rows(self, html):
+        doc = self._parse(html)
+        if not doc.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " items ")]'):
+            return None
+        rows = []
+        for tr in doc.xpath(self.ROWS):
+            link = tr.xpath('.//td[contains(concat(" ", @class, " "), " hauptlink ")]//a')
+            photo = tr.xpath('.//img[contains(concat(" ", @class, " "), " bilderrahmen-fixed ")]')
+            cells = []
+            for td in tr.xpath("./td"):
+                img = td.xpath(".//img")
+                cells.append(Cell(_classes(td.get("class")), _clean(td.text_content()),
+                                  img[0].get("alt") if img else None))
+            rows.append(SquadRow(
+                name=_clean(link[0].text_content()) if link else "",
+                href=link[0].get("href", "") if link else "",
+                photo=(photo[0].get("data-src") or photo[0].get("src") or "") if photo else "",
+                cells=cells,
+            ))
+        return rows
+
+    def footer_cells(self, html):
+        row = self._parse(html).xpath("//tfoot/tr[1]")
+        return [_clean(td.text_content()) for td in row[0].xpath("./td")] if row else []
+
+
+class SelectolaxBackend:
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.parser import HTMLParser as Tree
+        self._parse = Tree
+
+    def squad_rows(self, html):
+        table = self._parse(html).css_first("table.items")
+        if table is None:
+            return None
+        rows = []
+        for tr in table.css("table.items > tbody > tr"):
+            if not _classes(tr.attributes.get("class")) & {"odd", "even"}:
+                continue
+            link = tr.css_first("td.hauptlink a")
+            photo = tr.css_first("img.bilderrahmen-fixed")
+            cells = []
+            for td in tr.iter():
+                if td.tag != "td":
+                    continue
+                img = td.css_first("img")
+                cells.append(Cell(_classes(td.attributes.get("class")), _clean(td.text(separator=" ")),
+                                  img.attributes.get("alt") if img else None))
+            rows.append(SquadRow(
+                name=_clean(link.text()) if link else "",
+                href=link.attributes.get("href") or "" if link else "",
+                photo=(photo.attributes.get("data-src") or photo.attributes.get("src") or "") if photo else "",
+                cells=cells,
+            ))
+        return rows
+
+    def footer_cells(self, html):
+        row = self._parse(html).css_first("tfoot tr")
+        return [_clean(td.text(separator=" ")) for td in row.css("td")] if row else []
+
+
+BACKENDS = {
+    "selectolax": SelectolaxBackend,
+    "lxml": LxmlBackend,
+    "stdlib": StdlibBackend,
+    "bs4": BeautifulSoupBackend,
+}
+
+# Urutan pilihan otomatis: tercepat yang terpasang
+PREFERRED = ("selectolax", "lxml", "stdlib")
+
+_instances = {}
+
+
+def available_backends():
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name=None):
+    """Backend berdasarkan nama, atau yang tercepat yang tersedia jika None."""
+    if name is None:
+        for candidate in PREFERRED:
+            try:
+                return get_backend(candidate)
+            except ImportError:
+                continue
+    if name not in BACKENDS:
+        raise ValueError(f"Backend parser tidak dikenal: {name}")
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
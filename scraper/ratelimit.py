@@ -0,0 +1,60 @@
+# scraper/ratelimit.py
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: rata-rata `rate` request/detik dengan ledakan
+    paling banyak `capacity`. acquire() memesan token lalu tidur di luar lock,
+    jadi worker yang menunggu tidak saling memblokir.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate harus lebih dari 0")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Ambil satu token; mengembalikan lama menunggu (detik)."""
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Satu TokenBucket per host sehingga host berbeda tidak saling menunggu."""
+
+    def __init__(self, rate, capacity=1, **bucket_options):
+        self.rate = rate
+        self.capacity = capacity
+        self._options = bucket_options
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.capacity, **self._options)
+            return self._buckets[host]
+
+    def acquire(self, url):
+        return self.bucket(url).acquire()
@@ -0,0 +1,181 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from scraper.benchmark import legacy_parse, load_pages
+from scraper.cache import ResponseCache
+from scraper.checkpoint import Checkpoint
+from scraper.engine import Fetcher, ScrapeEngine
+from scraper.offline import FixtureResponse, FixtureSession
+from scraper.parsers import available_backends
+from scraper.ratelimit import HostRateLimiter, TokenBucket
+from scraper.transfermarkt import CLUB_URLS, parse_squad, parse_stats, scrape, squad_jobs
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TempDirMixin:
+    def setUp(self):
+        super().setUp()
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+
+class TokenBucketTest(SimpleTestCase):
+    def test_waits_after_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+        waits = [bucket.acquire() for _ in range(4)]
+        self.assertEqual(waits, [0, 0, 0.5, 0.5])
+
+    def test_tokens_refill_over_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        clock.now += 5
+        self.assertEqual(bucket.acquire(), 0)
+
+    def test_buckets_are_per_host(self):
+        clock = FakeClock()
+        limiter = HostRateLimiter(rate=1, clock=clock, sleep=clock.sleep)
+        limiter.acquire("https://a.test/1")
+        self.assertEqual(limiter.acquire("https://b.test/1"), 0)
+        self.assertEqual(limiter.acquire("https://a.test/2"), 1)
+
+
+class FetcherCacheTest(TempDirMixin, SimpleTestCase):
+    url = CLUB_URLS["Chelsea"]
+
+    def _fetcher(self, session, **cache_options):
+        return Fetcher(
+            cache=ResponseCache(self.tmp / "cache", **cache_options),
+            session_factory=lambda: session,
+        )
+
+    def test_conditional_get_reuses_cached_body(self):
+        session = FixtureSession()
+        fetcher = self._fetcher(session)
+        html, status = fetcher.fetch(self.url)
+        self.assertEqual(status, "downloaded")
+
+        again, status = fetcher.fetch(self.url)
+        self.assertEqual(status, "not_modified")
+        self.assertEqual(again, html)
+        self.assertEqual(len(session.requests), 2)
+
+    def test_fresh_entry_skips_network(self):
+        session = FixtureSession()
+        fetcher = self._fetcher(session, max_age=3600)
+        fetcher.fetch(self.url)
+        _, status = fetcher.fetch(self.url)
+        self.assertEqual(status, "fresh")
+        self.assertEqual(len(session.requests), 1)
+
+    def test_retries_server_errors(self):
+        class Flaky(FixtureSession):
+            calls = 0
+
+            def get(self, url, headers=None, timeout=None):
+                Flaky.calls += 1
+                if Flaky.calls < 3:
+                    return FixtureResponse(url, 503)
+                return super().get(url, headers, timeout)
+
+        session = Flaky()
+        fetcher = Fetcher(session_factory=lambda: session, backoff=0)
+        html, status = fetcher.fetch(self.url)
+        self.assertEqual(status, "downloaded")
+        self.assertIn("Cole Palmer", html)
+        self.assertEqual(Flaky.calls, 3)
+
+
+class CheckpointResumeTest(TempDirMixin, SimpleTestCase):
+    def test_interrupted_run_resumes(self):
+        path = self.tmp / "checkpoint.jsonl"
+        broken = FixtureSession(self.tmp / "kosong")  # semua URL 404
+        first = ScrapeEngine(Fetcher(session_factory=lambda: FixtureSession(), retries=0),
+                             checkpoint=Checkpoint(path))
+        first.run(squad_jobs({"Chelsea": CLUB_URLS["Chelsea"]}))
+        failing = ScrapeEngine(Fetcher(session_factory=lambda: broken, retries=0), checkpoint=Checkpoint(path))
+        failing.run(squad_jobs({"Arsenal": CLUB_URLS["Arsenal"]}))
+        self.assertEqual(failing.stats.failed, 1)
+
+        # Run ulang hanya mengambil halaman yang belum selesai
+        session = FixtureSession()
+        engine = ScrapeEngine(Fetcher(session_factory=lambda: session), checkpoint=Checkpoint(path))
+        results = engine.run(squad_jobs({"Chelsea": CLUB_URLS["Chelsea"], "Arsenal": CLUB_URLS["Arsenal"]}))
+        self.assertEqual(session.requests, [CLUB_URLS["Arsenal"]])
+        self.assertEqual(engine.stats.resumed, 1)
+        self.assertEqual(len(results["squad:Chelsea"]), 3)
+
+    def test_truncated_line_is_ignored(self):
+        path = self.tmp / "checkpoint.jsonl"
+        path.write_text(json.dumps({"key": "a", "result": 1}) + "\n" + '{"key": "b", "res', encoding="utf-8")
+        checkpoint = Checkpoint(path)
+        self.assertIn("a", checkpoint)
+        self.assertNotIn("b", checkpoint)
+
+
+class TransfermarktScrapeTest(TempDirMixin, SimpleTestCase):
+    def test_parse_squad_fixture(self):
+        html = FixtureSession().get(CLUB_URLS["Arsenal"]).text
+        saka = parse_squad(html, "Arsenal")[1]
+        self.assertEqual(saka["nama_pemain"], "Bukayo Saka")
+        self.assertEqual((saka["umur"], saka["negara"], saka["posisi"]), ("24", "Inggris", "Sayap Kanan"))
+        self.assertEqual(saka["market_value"], "Rp2.607,24Mlyr.")
+        self.assertIn("/433177-", saka["url profile"])
+
+    def test_scrape_with_stats_concurrently(self):
+        session = FixtureSession(latency=0.05)
+        engine = ScrapeEngine(
+            Fetcher(limiter=HostRateLimiter(rate=1000, capacity=16), session_factory=lambda: session),
+            workers=8,
+        )
+        rows = scrape(engine, with_stats=True)
+
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(engine.stats.pages, 16)
+        palmer = next(row for row in rows if row["nama_pemain"] == "Cole Palmer")
+        self.assertEqual((palmer["jumlah_match"], palmer["jumlah_goal"], palmer["jumlah_asis"]), (45, 25, 12))
+        # 16 halaman x 50 ms berurutan = 0.8 s; dengan 8 worker jauh lebih cepat
+        self.assertLess(engine.stats.elapsed, 0.6)
+
+
+class ParserBackendTest(SimpleTestCase):
+    def test_backends_agree_on_fixtures(self):
+        pages = load_pages(rows=40)
+        stats = FixtureSession().get("https://x/salah/leistungsdaten/spieler/148455").text
+        expected = [parse_squad(html, "Klub", backend="bs4") for html in pages]
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual([parse_squad(html, "Klub", backend=backend) for html in pages], expected)
+                self.assertEqual(parse_stats(stats, backend=backend),
+                                 {"jumlah_match": 47, "jumlah_goal": 34, "jumlah_asis": 23})
+
+    def test_matches_legacy_parser(self):
+        html = load_pages(rows=40)[0]
+        legacy = legacy_parse(html)
+        fast = parse_squad(html, "Klub", backend="stdlib")
+        self.assertEqual(len(fast), 40)
+        for old, new in zip(legacy, fast):
+            self.assertEqual(old, {key: new[key] for key in old})
+
+    def test_missing_table(self):
+        for backend in available_backends():
+            with self.subTest(backend=backend), self.assertRaises(ValueError):
+                parse_squad("<html><body><p>Diblokir</p></body></html>", "Klub", backend=backend)
+        self.assertEqual(parse_stats("<html></html>", backend="stdlib")["jumlah_goal"], 0)
@@ -0,0 +1,100 @@
+# scraper/transfermarkt.py
+
+import re
+from functools import partial
+
+from .engine import Job
+from .parsers import get_backend
+
+BASE_URL = "https://www.transfermarkt.co.id"
+
+CLUB_URLS = {
+    "Chelsea": f"{BASE_URL}/chelsea-fc/kader/verein/631/saison_id/2025/plus/1",
+    "Arsenal": f"{BASE_URL}/arsenal-fc/kader/verein/11/saison_id/2025/plus/1",
+    "Manchester City": f"{BASE_URL}/manchester-city/kader/verein/281/saison_id/2025/plus/1",
+    "Liverpool": f"{BASE_URL}/fc-liverpool/kader/verein/31/saison_id/2025/plus/1",
+}
+
+# Urutan kolom CSV, sama dengan yang dibaca main.player_import
+COLUMNS = [
+    "nama_pemain", "klub", "posisi", "umur", "market_value", "negara",
+    "jumlah_goal", "jumlah_asis", "jumlah_match", "url profile",
+]
+
+AGE = re.compile(r"\((\d+)\)")
+
+
+def _player(row, club_name):
+    # Kolom 'zentriert': tgl lahir (umur), negara (alt gambar), posisi
+    centered = [cell for cell in row.cells if "zentriert" in cell.classes]
+    value = next((cell for cell in row.cells if {"rechts", "hauptlink"} <= cell.classes), None)
+    age_match = AGE.search(centered[0].text) if centered else None
+    return {
+        "nama_pemain": row.name,
+        "klub": club_name,
+        "posisi": centered[2].text if len(centered) > 2 else "",
+        "umur": age_match.group(1) if age_match else "",
+        "market_value": value.text if value else "",
+        "negara": (centered[1].img_alt or "") if len(centered) > 1 else "",
+        "url profile": row.photo,
+        "profile_url": BASE_URL + row.href if row.href else "",
+    }
+
+
+def parse_squad(html, club_name, backend=None):
+    """Baris pemain dari halaman skuad (tabel `items`)."""
+    rows = get_backend(backend).squad_rows(html)
+    if rows is None:
+        raise ValueError(f"Tabel pemain {club_name} tidak ditemukan")
+    return [_player(row, club_name) for row in rows]
+
+
+def stats_url(profile_url):
+    """/nama/profil/spieler/123 -> /nama/leistungsdaten/spieler/123"""
+    return profile_url.replace("/profil/spieler/", "/leistungsdaten/spieler/")
+
+
+def _stat(cells, index):
+    if len(cells) <= index:
+        return 0
+    text = cells[index].replace(".", "")
+    return int(text) if text.isdigit() else 0
+
+
+def parse_stats(html, backend=None):
+    """Total match, goal dan assist dari baris tfoot halaman statistik."""
+    cells = get_backend(backend).footer_cells(html)
+    return {"jumlah_match": _stat(cells, 2), "jumlah_goal": _stat(cells, 5), "jumlah_asis": _stat(cells, 6)}
+
+
+def squad_jobs(clubs, backend=None):
+    return [
+        Job(key=f"squad:{name}", url=url, parse=partial(parse_squad, club_name=name, backend=backend))
+        for name, url in clubs.items()
+    ]
+
+
+def stats_jobs(players, backend=None):
+    return [
+        Job(key=f"stats:{player['profile_url']}", url=stats_url(player["profile_url"]),
+            parse=partial(parse_stats, backend=backend))
+        for player in players if player["profile_url"]
+    ]
+
+
+def scrape(engine, clubs=None, with_stats=False, backend=None):
+    """
+    Ambil semua skuad (dan statistik per pemain bila `with_stats`) lewat
+    `engine`. Mengembalikan list dict dengan kolom COLUMNS.
+    """
+    clubs = clubs or CLUB_URLS
+    squads = engine.run(squad_jobs(clubs, backend))
+    players = [player for name in clubs for player in squads.get(f"squad:{name}", [])]
+
+    stats = engine.run(stats_jobs(players, backend)) if with_stats else {}
+    rows = []
+    for player in players:
+        row = {column: player.get(column, "") for column in COLUMNS}
+        row.update(stats.get(f"stats:{player['profile_url']}", {}))
+        rows.append(row)
+    return rows
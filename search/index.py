@@ -0,0 +1,218 @@
+# search/index.py
+
+import re
+import unicodedata
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Q
+
+from .models import SearchEntry
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Batas id dari matching_ids(). Dibatasi karena id dikirim sebagai daftar
+# parameter IN (SQLite membatasi jumlah parameter per query); object_id
+# berupa teks sehingga tidak bisa langsung dipakai sebagai subquery untuk
+# kolom UUID. Query yang cocok dengan lebih banyak objek dari ini terlalu
+# umum untuk dipakai sebagai filter, dan hanya id paling relevan yang dipakai.
+MATCHING_IDS_LIMIT = 5000
+
+# Huruf yang tidak terurai oleh NFKD (ø bukan o + diakritik)
+_SPECIAL_FOLDS = str.maketrans({
+    "ø": "o", "æ": "ae", "œ": "oe", "ß": "ss", "đ": "d", "ð": "d",
+    "ł": "l", "ı": "i", "þ": "th",
+})
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold(text):
+    """Huruf kecil dan tanpa aksen: "Jørgensen Müller" -> "jorgensen muller"."""
+    text = (text or "").lower().translate(_SPECIAL_FOLDS)
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(query):
+    return _TOKEN_RE.findall(fold(query))
+
+
+# ========== Dokumen per jenis objek ==========
+
+def _player_document(player):
+    return player.nama_pemain, player.nama_pemain, f"{player.negara} {player.position}"
+
+
+def _rumor_document(rumor):
+    title = rumor.title or ""
+    return title, title, rumor.content
+
+
+def _post_document(post):
+    return post.title, post.title, post.description
+
+
+# kind -> (model label, fungsi yang mengembalikan (judul tampilan, judul, isi))
+DOCUMENTS = {
+    "player": ("main.Player", _player_document),
+    "rumor": ("rumors.Rumors", _rumor_document),
+    "post": ("community.Post", _post_document),
+}
+
+
+def kind_for_model(model):
+    label = model._meta.label
+    for kind, (model_label, _) in DOCUMENTS.items():
+        if model_label == label:
+            return kind
+    return None
+
+
+def index_instance(kind, instance):
+    _, builder = DOCUMENTS[kind]
+    display, title, body = builder(instance)
+    SearchEntry.objects.update_or_create(
+        kind=kind,
+        object_id=str(instance.pk),
+        defaults={
+            "title": (display or "")[:255],
+            "document_title": fold(title),
+            "document_body": fold(body),
+        },
+    )
+
+
+def remove_instance(kind, pk):
+    SearchEntry.objects.filter(kind=kind, object_id=str(pk)).delete()
+
+
+def rebuild(kinds=None, batch_size=1000):
+    """Bangun ulang index dari nol. Mengembalikan jumlah dokumen per kind."""
+    counts = {}
+    for kind in kinds or DOCUMENTS:
+        model_label, builder = DOCUMENTS[kind]
+        model = apps.get_model(model_label)
+        SearchEntry.objects.filter(kind=kind).delete()
+
+        batch = []
+        counts[kind] = 0
+        for instance in model.objects.all().iterator(chunk_size=batch_size):
+            display, title, body = builder(instance)
+            batch.append(SearchEntry(
+                kind=kind,
+                object_id=str(instance.pk),
+                title=(display or "")[:255],
+                document_title=fold(title),
+                document_body=fold(body),
+            ))
+            if len(batch) >= batch_size:
+                SearchEntry.objects.bulk_create(batch)
+                counts[kind] += len(batch)
+                batch = []
+        if batch:
+            SearchEntry.objects.bulk_create(batch)
+            counts[kind] += len(batch)
+    return counts
+
+
+# ========== Query ==========
+
+def _kind_clause(kinds, params):
+    if not kinds:
+        return ""
+    params.extend(kinds)
+    return " AND e.kind IN (%s)" % ", ".join(["%s"] * len(kinds))
+
+
+def _search_sqlite(tokens, kinds, limit, title_only=False):
+    # Prefix match per token, semua token wajib ada (AND implisit FTS5);
+    # "document_title :" membatasi token ke kolom judul
+    column = "document_title : " if title_only else ""
+    match = " ".join(f'{column}"{token}"*' for token in tokens)
+    params = [match]
+    kind_clause = _kind_clause(kinds, params)
+    params.append(limit)
+    sql = (
+        "SELECT e.kind, e.object_id, e.title, -bm25(search_fts, 10.0, 1.0) AS score "
+        "FROM search_fts JOIN search_searchentry e ON e.id = search_fts.rowid "
+        "WHERE search_fts MATCH %s" + kind_clause +
+        " ORDER BY score DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+# Harus sama persis dengan ekspresi index GIN di migration 0002_fulltext_index
+PG_VECTOR = (
+    "(setweight(to_tsvector('simple', e.document_title), 'A') || "
+    "setweight(to_tsvector('simple', e.document_body), 'B'))"
+)
+
+
+def _search_postgresql(tokens, kinds, limit, title_only=False):
+    # Bobot A = document_title, jadi index GIN yang sama tetap terpakai
+    weight = "A" if title_only else ""
+    tsquery = " & ".join(f"{token}:*{weight}" for token in tokens)
+    params = [tsquery, tsquery]
+    kind_clause = _kind_clause(kinds, params)
+    params.append(limit)
+    sql = (
+        f"SELECT e.kind, e.object_id, e.title, "
+        f"ts_rank_cd({PG_VECTOR}, to_tsquery('simple', %s)) AS score "
+        f"FROM search_searchentry e "
+        f"WHERE {PG_VECTOR} @@ to_tsquery('simple', %s)" + kind_clause +
+        " ORDER BY score DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _search_fallback(tokens, kinds, limit, title_only=False):
+    entries = SearchEntry.objects.all()
+    for token in tokens:
+        match = Q(document_title__contains=token)
+        if not title_only:
+            match |= Q(document_body__contains=token)
+        entries = entries.filter(match)
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    rows = entries.values_list("kind", "object_id", "title")[:limit]
+    return [(kind, object_id, title, 1.0) for kind, object_id, title in rows]
+
+
+def _run(query, kinds, limit, title_only=False):
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    kinds = list(kinds or [])
+    if connection.vendor == "sqlite":
+        return _search_sqlite(tokens, kinds, limit, title_only)
+    if connection.vendor == "postgresql":
+        return _search_postgresql(tokens, kinds, limit, title_only)
+    return _search_fallback(tokens, kinds, limit, title_only)
+
+
+def search(query, kinds=None, limit=DEFAULT_LIMIT):
+    """
+    Cari di semua dokumen, hasil diurutkan berdasarkan relevansi
+    (judul lebih berbobot dari isi). Mengembalikan list dict
+    {"type", "id", "title", "score"}.
+    """
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    return [
+        {"type": kind, "id": object_id, "title": title, "score": round(float(score), 4)}
+        for kind, object_id, title, score in _run(query, kinds, limit)
+    ]
+
+
+def matching_ids(kind, query, limit=MATCHING_IDS_LIMIT, title_only=False):
+    """
+    ID objek `kind` yang cocok dengan query, untuk filter pk__in di queryset
+    lain. Dengan `title_only` hanya judul dokumen yang dicocokkan (untuk
+    pemain: nama, bukan negara/posisi). Paling banyak `limit` id, diurutkan
+    dari yang paling relevan; sisanya tidak ikut.
+    """
+    return [object_id for _, object_id, _, _ in _run(query, [kind], limit, title_only)]
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from search.index import DOCUMENTS, rebuild
+
+
+class Command(BaseCommand):
+    help = "Bangun ulang index pencarian untuk pemain, rumor, dan post community."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind", action="append", choices=sorted(DOCUMENTS),
+            help="Hanya bangun ulang jenis ini (boleh diulang).",
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild(options["kind"])
+        for kind, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f"{kind}: {count} dokumen di-index"))
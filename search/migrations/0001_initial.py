@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('player', 'Player'), ('rumor', 'Rumor'), ('post', 'Post')], max_length=10)),
+                ('object_id', models.CharField(max_length=64)),
+                ('title', models.CharField(max_length=255)),
+                ('document_title', models.TextField()),
+                ('document_body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_entry_unique_object')],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Index full-text untuk SearchEntry, berbeda per vendor database.
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    # Tabel FTS5 "external content": isi teks tetap di search_searchentry,
+    # FTS5 hanya menyimpan index-nya. Trigger menjaga keduanya tetap sinkron.
+    """
+    CREATE VIRTUAL TABLE search_fts USING fts5(
+        document_title, document_body,
+        content='search_searchentry', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2"
+    )
+    """,
+    """
+    CREATE TRIGGER search_fts_ai AFTER INSERT ON search_searchentry BEGIN
+        INSERT INTO search_fts(rowid, document_title, document_body)
+        VALUES (new.id, new.document_title, new.document_body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_fts_ad AFTER DELETE ON search_searchentry BEGIN
+        INSERT INTO search_fts(search_fts, rowid, document_title, document_body)
+        VALUES ('delete', old.id, old.document_title, old.document_body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_fts_au AFTER UPDATE ON search_searchentry BEGIN
+        INSERT INTO search_fts(search_fts, rowid, document_title, document_body)
+        VALUES ('delete', old.id, old.document_title, old.document_body);
+        INSERT INTO search_fts(rowid, document_title, document_body)
+        VALUES (new.id, new.document_title, new.document_body);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS search_fts_au",
+    "DROP TRIGGER IF EXISTS search_fts_ad",
+    "DROP TRIGGER IF EXISTS search_fts_ai",
+    "DROP TABLE IF EXISTS search_fts",
+]
+
+# Ekspresi harus sama persis dengan search.index.PG_VECTOR agar index terpakai
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX search_entry_vector_idx ON search_searchentry USING GIN (
+        (setweight(to_tsvector('simple', document_title), 'A') ||
+         setweight(to_tsvector('simple', document_body), 'B'))
+    )
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS search_entry_vector_idx",
+]
+
+STATEMENTS = {
+    "sqlite": (SQLITE_FORWARD, SQLITE_BACKWARD),
+    "postgresql": (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+}
+
+
+def create_fulltext_index(apps, schema_editor):
+    forward, _ = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for statement in forward:
+        schema_editor.execute(statement)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    _, backward = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for statement in backward:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,64 @@
+# Isi index pencarian untuk data yang sudah ada sebelum app search dipasang.
+#
+# Fungsi fold dan daftar field disalin dari search/index.py saat migration
+# ini dibuat (bukan di-import) agar perubahan index di kemudian hari tidak
+# mengubah hasil migration lama.
+
+import unicodedata
+
+from django.db import migrations
+
+_SPECIAL_FOLDS = str.maketrans({
+    "ø": "o", "æ": "ae", "œ": "oe", "ß": "ss", "đ": "d", "ð": "d",
+    "ł": "l", "ı": "i", "þ": "th",
+})
+
+
+def fold(text):
+    text = (text or "").lower().translate(_SPECIAL_FOLDS)
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+# kind -> (app, model, field judul, field-field isi)
+DOCUMENTS = {
+    "player": ("main", "Player", "nama_pemain", ("negara", "position")),
+    "rumor": ("rumors", "Rumors", "title", ("content",)),
+    "post": ("community", "Post", "title", ("description",)),
+}
+
+BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    for kind, (app_label, model_name, title_field, body_fields) in DOCUMENTS.items():
+        model = apps.get_model(app_label, model_name)
+        rows = model.objects.values_list('pk', title_field, *body_fields)
+        entries = []
+        for pk, title, *body in rows.iterator(chunk_size=BATCH_SIZE):
+            entries.append(SearchEntry(
+                kind=kind,
+                object_id=str(pk),
+                title=(title or '')[:255],
+                document_title=fold(title),
+                document_body=fold(" ".join(str(value) for value in body)),
+            ))
+            if len(entries) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(entries, ignore_conflicts=True)
+                entries = []
+        SearchEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_fulltext_index'),
+        ('main', '0005_player_market_indexes'),
+        ('rumors', '0002_remove_rumors_is_verified_rumors_status'),
+        ('community', '0005_alter_reply_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# search/models.py
+
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    Satu dokumen di index pencarian (pemain, rumor, atau post community).
+
+    Kolom document_* sudah di-fold (huruf kecil, tanpa aksen) sehingga
+    "Jørgensen" dan "jorgensen" menjadi token yang sama di semua database.
+    Index full-text-nya dibuat di migration sesuai vendor: tabel FTS5
+    `search_fts` di SQLite dan index GIN tsvector di PostgreSQL.
+    """
+
+    KIND_CHOICES = [
+        ('player', 'Player'),
+        ('rumor', 'Rumor'),
+        ('post', 'Post'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.CharField(max_length=64)
+    title = models.CharField(max_length=255)
+    document_title = models.TextField()
+    document_body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_unique_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
@@ -0,0 +1,27 @@
+# search/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from community.models import Post
+from main.models import Player
+from rumors.models import Rumors
+
+from .index import index_instance, kind_for_model, remove_instance
+
+
+@receiver(post_save, sender=Player)
+@receiver(post_save, sender=Rumors)
+@receiver(post_save, sender=Post)
+def update_search_entry(sender, instance, raw=False, **kwargs):
+    """Index pencarian selalu mengikuti data terbaru."""
+    if raw:
+        return
+    index_instance(kind_for_model(sender), instance)
+
+
+@receiver(post_delete, sender=Player)
+@receiver(post_delete, sender=Rumors)
+@receiver(post_delete, sender=Post)
+def delete_search_entry(sender, instance, **kwargs):
+    remove_instance(kind_for_model(sender), instance.pk)
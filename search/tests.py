@@ -0,0 +1,161 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from community.models import Post
+from main.models import Club, Player
+from rumors.models import Rumors
+from search.index import fold, matching_ids, search
+from search.models import SearchEntry
+
+User = get_user_model()
+
+
+class FoldTests(TestCase):
+    def test_fold_removes_accents_and_special_letters(self):
+        self.assertEqual(fold("Jørgensen"), "jorgensen")
+        self.assertEqual(fold("Martin Ødegaard"), "martin odegaard")
+        self.assertEqual(fold("Müller Çalhanoğlu"), "muller calhanoglu")
+        self.assertEqual(fold("Łukasz Straße"), "lukasz strasse")
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        SearchEntry.objects.all().delete()
+        self.arsenal = Club.objects.create(name="Arsenal FC", country="England")
+        self.chelsea = Club.objects.create(name="Chelsea FC", country="England")
+        self.user = User.objects.create_user(username="search_user", password="12345")
+
+        self.jorgensen = Player.objects.create(
+            nama_pemain="Filip Jørgensen", position="Goalkeeper", umur=22,
+            market_value=20000000, negara="Denmark", current_club=self.chelsea,
+        )
+        self.odegaard = Player.objects.create(
+            nama_pemain="Martin Ødegaard", position="Midfielder", umur=25,
+            market_value=90000000, negara="Norway", current_club=self.arsenal,
+        )
+
+    def _ids(self, results):
+        return [r["id"] for r in results]
+
+    def test_signals_index_new_objects(self):
+        self.assertEqual(
+            SearchEntry.objects.filter(kind="player", object_id=str(self.jorgensen.pk)).count(), 1
+        )
+        rumor = Rumors.objects.create(
+            author=self.user, pemain=self.odegaard,
+            club_asal=self.arsenal, club_tujuan=self.chelsea, content="Tawaran besar",
+        )
+        post = Post.objects.create(author=self.user, title="Taktik Arteta", description="Pressing tinggi")
+
+        self.assertIn(str(rumor.pk), self._ids(search("odegaard", ["rumor"])))
+        self.assertIn(str(post.pk), self._ids(search("arteta")))
+
+    def test_accent_insensitive_both_directions(self):
+        for query in ["Jorgensen", "jørgensen", "JØRG", "jorg"]:
+            results = search(query, ["player"])
+            self.assertEqual(self._ids(results), [str(self.jorgensen.pk)], query)
+
+    def test_all_tokens_must_match(self):
+        self.assertEqual(search("martin jorgensen"), [])
+        self.assertEqual(self._ids(search("martin ode")), [str(self.odegaard.pk)])
+
+    def test_update_and_delete_keep_index_in_sync(self):
+        self.jorgensen.nama_pemain = "Filip Nielsen"
+        self.jorgensen.save()
+        self.assertEqual(search("jorgensen"), [])
+        self.assertEqual(self._ids(search("nielsen")), [str(self.jorgensen.pk)])
+
+        self.jorgensen.delete()
+        self.assertEqual(search("nielsen"), [])
+        self.assertFalse(SearchEntry.objects.filter(object_id=str(self.jorgensen.pk)).exists())
+
+    def test_title_match_ranks_above_body_match(self):
+        in_body = Post.objects.create(
+            author=self.user, title="Review pekan ini", description="Derby london seru sekali",
+        )
+        in_title = Post.objects.create(
+            author=self.user, title="Derby London", description="Arsenal menang",
+        )
+        self.assertEqual(self._ids(search("derby", ["post"])), [str(in_title.pk), str(in_body.pk)])
+
+    def test_matching_ids_filters_rumor_feed_without_accents(self):
+        Rumors.objects.create(
+            author=self.user, pemain=self.odegaard,
+            club_asal=self.arsenal, club_tujuan=self.chelsea, content="Rumor",
+        )
+        self.assertEqual(matching_ids("player", "odegaard"), [str(self.odegaard.pk)])
+
+        res = self.client.get(reverse("rumors:get_rumors_json"), {"nama": "odegaard"})
+        self.assertEqual([r["pemain_nama"] for r in res.json()], ["Martin Ødegaard"])
+
+    def test_filter_nama_hanya_mencocokkan_nama_pemain(self):
+        Rumors.objects.create(
+            author=self.user, pemain=self.odegaard,
+            club_asal=self.arsenal, club_tujuan=self.chelsea, content="Rumor",
+        )
+        # Negara dan posisi ada di dokumen pemain, tetapi bukan nama
+        self.assertEqual(self._ids(search("norway", ["player"])), [str(self.odegaard.pk)])
+        self.assertEqual(matching_ids("player", "norway", title_only=True), [])
+        self.assertEqual(matching_ids("player", "martin", title_only=True), [str(self.odegaard.pk)])
+
+        for nama in ("norway", "midfielder"):
+            res = self.client.get(reverse("rumors:get_rumors_json"), {"nama": nama})
+            self.assertEqual(res.json(), [], nama)
+            res = self.client.get(reverse("rumors:show_rumors_main"), {"nama": nama})
+            self.assertEqual(list(res.context["rumors_list"]), [], nama)
+
+    def test_rebuild_command_restores_index(self):
+        SearchEntry.objects.all().delete()
+        self.assertEqual(search("jorgensen"), [])
+
+        call_command("rebuild_search_index", stdout=open("/dev/null", "w"))
+        self.assertEqual(self._ids(search("jorgensen")), [str(self.jorgensen.pk)])
+
+    def test_search_is_fast_on_large_index(self):
+        SearchEntry.objects.bulk_create(
+            SearchEntry(
+                kind="post", object_id=f"bulk-{i}", title=f"Post {i}",
+                document_title=f"post nomor {i}", document_body="isi diskusi transfer pemain",
+            )
+            for i in range(5000)
+        )
+        start = time.perf_counter()
+        results = search("jorgensen")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(self._ids(results), [str(self.jorgensen.pk)])
+        self.assertLess(elapsed, 0.5)
+
+
+class SearchApiTests(TestCase):
+    def setUp(self):
+        Club.objects.all().delete()
+        SearchEntry.objects.all().delete()
+        club = Club.objects.create(name="Api FC", country="England")
+        self.player = Player.objects.create(
+            nama_pemain="Rasmus Højlund", position="Forward", umur=21,
+            market_value=60000000, negara="Denmark", current_club=club,
+        )
+        self.url = reverse("search:search_json")
+
+    def test_search_returns_ranked_results(self):
+        res = self.client.get(self.url, {"q": "hojlund"})
+        self.assertEqual(res.status_code, 200)
+        data = res.json()
+        self.assertEqual(data["query"], "hojlund")
+        self.assertEqual(data["results"][0]["id"], str(self.player.pk))
+        self.assertEqual(data["results"][0]["title"], "Rasmus Højlund")
+        self.assertEqual(data["results"][0]["type"], "player")
+
+    def test_type_filter_and_empty_query(self):
+        self.assertEqual(self.client.get(self.url, {"q": "hojlund", "type": "post"}).json()["results"], [])
+        self.assertEqual(self.client.get(self.url, {"q": "  "}).json()["results"], [])
+
+    def test_invalid_params_return_400(self):
+        self.assertEqual(self.client.get(self.url, {"q": "x", "type": "klub"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"q": "x", "limit": "abc"}).status_code, 400)
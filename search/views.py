@@ -0,0 +1,27 @@
+# search/views.py
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from .index import DEFAULT_LIMIT, DOCUMENTS, search
+
+
+@require_GET
+def search_json(request):
+    """
+    Pencarian gabungan: /search/api/?q=jorgensen&type=player,rumor&limit=20
+    Hasil diurutkan berdasarkan relevansi.
+    """
+    query = request.GET.get("q", "").strip()
+    kinds = [k for k in request.GET.get("type", "").split(",") if k]
+
+    unknown = [k for k in kinds if k not in DOCUMENTS]
+    if unknown:
+        return JsonResponse({"error": f"Tipe tidak dikenal: {', '.join(unknown)}"}, status=400)
+
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({"error": "Parameter limit harus berupa angka."}, status=400)
+
+    return JsonResponse({"query": query, "results": search(query, kinds, limit)})